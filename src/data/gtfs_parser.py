@@ -6,6 +6,7 @@ and loads them into Python data structures.
 """
 
 import csv
+import sys
 from pathlib import Path
 from typing import Dict, List, Optional
 import logging
@@ -81,7 +82,14 @@ class GTFSParser:
         logger.debug(f"Loaded {len(self.agencies)} agencies")
 
     def load_stops(self) -> None:
-        """Load stops.txt file."""
+        """
+        Load stops.txt file.
+
+        ID columns here and in the other loaders are interned with
+        ``sys.intern`` so the many repeated IDs in stop_times.txt share one
+        string object and equality checks on them can short-circuit on
+        identity.
+        """
         file_path = self.gtfs_dir / "stops.txt"
 
         if not file_path.exists():
@@ -92,7 +100,7 @@ class GTFSParser:
             for row in reader:
                 # Handle optional fields
                 stop_data = {
-                    'stop_id': row['stop_id'],
+                    'stop_id': sys.intern(row['stop_id']),
                     'stop_name': row['stop_name'],
                     'stop_lat': row['stop_lat'],
                     'stop_lon': row['stop_lon'],
@@ -119,7 +127,7 @@ class GTFSParser:
             reader = csv.DictReader(f)
             for row in reader:
                 route_data = {
-                    'route_id': row['route_id'],
+                    'route_id': sys.intern(row['route_id']),
                     'route_short_name': row.get('route_short_name', ''),
                     'route_long_name': row.get('route_long_name', ''),
                     'route_type': row['route_type'],
@@ -145,8 +153,8 @@ class GTFSParser:
             reader = csv.DictReader(f)
             for row in reader:
                 trip_data = {
-                    'trip_id': row['trip_id'],
-                    'route_id': row['route_id'],
+                    'trip_id': sys.intern(row['trip_id']),
+                    'route_id': sys.intern(row['route_id']),
                     'service_id': row['service_id'],
                     'trip_headsign': row.get('trip_headsign', ''),
                     'trip_short_name': row.get('trip_short_name', ''),
@@ -172,8 +180,8 @@ class GTFSParser:
             reader = csv.DictReader(f)
             for row in reader:
                 stop_time_data = {
-                    'trip_id': row['trip_id'],
-                    'stop_id': row['stop_id'],
+                    'trip_id': sys.intern(row['trip_id']),
+                    'stop_id': sys.intern(row['stop_id']),
                     'stop_sequence': row['stop_sequence'],
                     'arrival_time': row['arrival_time'],
                     'departure_time': row['departure_time'],
@@ -4,8 +4,10 @@ Stop Index for fast station lookups.
 Provides fuzzy name matching and spatial queries for GTFS stops.
 """
 
+from bisect import bisect_left
+from functools import lru_cache
 from typing import List, Optional, Tuple
-from fuzzywuzzy import fuzz, process
+from rapidfuzz import fuzz, process, utils
 import logging
 
 from .models import Stop
@@ -27,13 +29,26 @@ class StopIndex:
         self.parser = parser
         self.stops = parser.stops
 
-        # Build name index
+        # Build name index (first stop wins for duplicate names), plus the
+        # fuzzy matching corpus with names normalized once, in stop order
         self._name_index = {}
-        for stop_id, stop in self.stops.items():
-            name_lower = stop.stop_name.lower()
-            if name_lower not in self._name_index:
-                self._name_index[name_lower] = []
-            self._name_index[name_lower].append(stop_id)
+        self._stops_list = []
+        self._normalized_names = []
+        for stop in self.stops.values():
+            self._name_index.setdefault(stop.stop_name.lower(), stop)
+            self._stops_list.append(stop)
+            self._normalized_names.append(utils.default_process(stop.stop_name))
+
+        # Normalized names in sorted order, so all names sharing a prefix form
+        # one contiguous run that can be found by binary search
+        prefix_order = sorted(range(len(self._normalized_names)),
+                              key=self._normalized_names.__getitem__)
+        self._sorted_names = [self._normalized_names[i] for i in prefix_order]
+        self._sorted_stops = [self._stops_list[i] for i in prefix_order]
+
+        # Interactive callers repeat the same queries; memoize the fuzzy
+        # fallback per index so repeated misses skip the corpus scan
+        self._best_fuzzy_match = lru_cache(maxsize=1024)(self._best_fuzzy_match)
 
         logger.debug(f"Indexed {len(self.stops)} stops")
 
@@ -47,13 +62,33 @@ class StopIndex:
         Returns:
             Stop object if found, None otherwise
         """
-        name_lower = stop_name.lower()
-        stop_ids = self._name_index.get(name_lower, [])
+        return self._name_index.get(stop_name.lower())
 
-        if stop_ids:
-            return self.stops[stop_ids[0]]
+    def find_stop_prefix(self, prefix: str, limit: int = 10) -> List[Stop]:
+        """
+        Find stops whose name starts with a prefix, e.g. while the user types.
 
-        return None
+        Matching ignores case and punctuation, as fuzzy matching does.
+
+        Args:
+            prefix: Start of a station name
+            limit: Maximum number of results
+
+        Returns:
+            List of matching Stop objects, in name order
+        """
+        prefix = utils.default_process(prefix)
+        if not prefix:
+            return []
+
+        results = []
+        i = bisect_left(self._sorted_names, prefix)
+        while (len(results) < limit and i < len(self._sorted_names)
+               and self._sorted_names[i].startswith(prefix)):
+            results.append(self._sorted_stops[i])
+            i += 1
+
+        return results
 
     def find_stop_fuzzy(
         self,
@@ -72,26 +107,30 @@ class StopIndex:
         Returns:
             List of (Stop, score) tuples, sorted by score descending
         """
-        if not self.stops:
+        if not self._stops_list:
             return []
 
-        # Get all stop names for fuzzy matching
-        stop_names = {stop_id: stop.stop_name for stop_id, stop in self.stops.items()}
-
-        # Use fuzzywuzzy to find best matches
+        # RapidFuzz keeps only the best `limit` matches in a bounded heap
+        # rather than sorting every stop. Its scores are floats; the cutoff
+        # admits anything that rounds up to min_score, matching the integer
+        # scores returned. The corpus is already normalized, so only the
+        # query is processed.
         matches = process.extract(
-            stop_name,
-            stop_names,
+            utils.default_process(stop_name),
+            self._normalized_names,
             scorer=fuzz.token_sort_ratio,
-            limit=limit
+            processor=None,
+            limit=limit,
+            score_cutoff=max(min_score - 0.5, 0)
         )
 
-        # Filter by minimum score and convert to Stop objects
+        # Matches arrive best-first, so stop at the first one below min_score
         results = []
-        for match_name, score, stop_id in matches:
-            if score >= min_score:
-                stop = self.stops[stop_id]
-                results.append((stop, score))
+        for match_name, score, position in matches:
+            score = round(score)
+            if score < min_score:
+                break
+            results.append((self._stops_list[position], score))
 
         return results
 
@@ -101,11 +140,12 @@ class StopIndex:
         fuzzy: bool = True
     ) -> Optional[Stop]:
         """
-        Find a stop by name (exact or fuzzy).
+        Find a stop by name (exact, unique prefix or fuzzy).
 
         Args:
             stop_name: Station name to search for
-            fuzzy: If True, use fuzzy matching if exact match fails
+            fuzzy: If True, try a prefix that only one stop name starts
+                with, then fuzzy matching, if exact match fails
 
         Returns:
             Stop object if found, None otherwise
@@ -115,14 +155,23 @@ class StopIndex:
         if stop:
             return stop
 
-        # Try fuzzy match
         if fuzzy:
-            matches = self.find_stop_fuzzy(stop_name, limit=1)
-            if matches:
-                return matches[0][0]
+            # A shortened name such as "Tarneit" scores poorly against
+            # "Tarneit Railway Station", so take an unambiguous prefix first
+            prefixed = self.find_stop_prefix(stop_name, limit=2)
+            if len(prefixed) == 1:
+                return prefixed[0]
+
+            # Try fuzzy match
+            return self._best_fuzzy_match(stop_name)
 
         return None
 
+    def _best_fuzzy_match(self, stop_name: str) -> Optional[Stop]:
+        """Return the best fuzzy match for a name, or None if nothing scores."""
+        matches = self.find_stop_fuzzy(stop_name, limit=1)
+        return matches[0][0] if matches else None
+
     def find_stops_by_ids(self, stop_ids: List[str]) -> List[Stop]:
         """
         Find multiple stops by their IDs.
@@ -131,15 +180,10 @@ class StopIndex:
             stop_ids: List of stop IDs
 
         Returns:
-            List of Stop objects
+            List of Stop objects, in the order of stop_ids, skipping unknown IDs
         """
-        stops = []
-        for stop_id in stop_ids:
-            stop = self.stops.get(stop_id)
-            if stop:
-                stops.append(stop)
-
-        return stops
+        get = self.stops.get
+        return [stop for stop in map(get, stop_ids) if stop is not None]
 
     def get_all_stops(self) -> List[Stop]:
         """
@@ -6,16 +6,39 @@ where nodes are stops and edges are connections between stops on the
 same trip with travel time weights.
 """
 
-from typing import Dict, List, Optional, Tuple, Set
-from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple, Set, Union
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+import gc
+import hashlib
+import logging
 import networkx as nx
+import numpy as np
 from datetime import datetime, timedelta
 
 from ..data.models import Stop, Trip, StopTime
 from ..data.gtfs_parser import GTFSParser
+from ..realtime.time_utils import hhmmss_to_seconds, hhmmss_to_seconds_batch
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+# Bump when the snapshot array layout changes so stale files are rebuilt
+SNAPSHOT_VERSION = 1
+
+# GTFS route_type to display name
+_MODE_MAP = {
+    0: "Tram",
+    1: "Metro",
+    2: "Regional Train",
+    3: "Bus",
+    4: "Ferry",
+    700: "Bus",  # PTV uses 700 for buses
+    900: "Tram"   # PTV uses 900 for trams
+}
+
+
+@dataclass(slots=True)
 class Connection:
     """Represents a connection between two stops."""
     from_stop_id: str
@@ -28,26 +51,107 @@ class Connection:
     route_type: Optional[int] = None  # GTFS route_type (0=tram, 1=metro, 2=rail, 3=bus, etc.)
     is_transfer: bool = False  # True if this is a walking transfer
 
+    # Departure/arrival as seconds since midnight. Parsed from the time
+    # strings unless the caller already has them.
+    departure_sec: Optional[int] = field(default=None, repr=False, compare=False)
+    arrival_sec: Optional[int] = field(default=None, repr=False, compare=False)
+
     def __post_init__(self):
         """Validate and convert types."""
-        self.travel_time_seconds = int(self.travel_time_seconds)
-        if self.route_type is not None:
+        # Graph builds pass ints already; only convert values that are not
+        if type(self.travel_time_seconds) is not int:
+            self.travel_time_seconds = int(self.travel_time_seconds)
+        if self.route_type is not None and type(self.route_type) is not int:
             self.route_type = int(self.route_type)
+        if self.departure_sec is None:
+            self.departure_sec = hhmmss_to_seconds(self.departure_time)
+        if self.arrival_sec is None:
+            self.arrival_sec = hhmmss_to_seconds(self.arrival_time)
 
     def get_mode_name(self) -> str:
         """Get human-readable mode name."""
-        if self.is_transfer:
-            return "Walking"
-        mode_map = {
-            0: "Tram",
-            1: "Metro",
-            2: "Regional Train",
-            3: "Bus",
-            4: "Ferry",
-            700: "Bus",  # PTV uses 700 for buses
-            900: "Tram"   # PTV uses 900 for trams
-        }
-        return mode_map.get(self.route_type, "Unknown")
+        return "Walking" if self.is_transfer else _MODE_MAP.get(self.route_type, "Unknown")
+
+
+@dataclass(slots=True, frozen=True)
+class CSRAdjacency:
+    """
+    Compressed sparse row (CSR) view of the graph's edges.
+
+    Stop i's outgoing edges are positions indptr[i]:indptr[i + 1] of
+    ``neighbors`` (target stop indices, ascending) and ``travel_time``
+    (minimum travel time in seconds). Traversals can walk these int32
+    slices instead of NetworkX's nested per-edge dicts.
+    """
+    stop_ids: List[str]
+    stop_idx: Dict[str, int]
+    indptr: np.ndarray
+    neighbors: np.ndarray
+    travel_time: np.ndarray
+
+    def edges_from(self, index: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the outgoing edges of a stop.
+
+        Args:
+            index: Stop index (position in stop_ids)
+
+        Returns:
+            Tuple of (neighbor stop indices, travel times in seconds)
+        """
+        start, end = self.indptr[index], self.indptr[index + 1]
+        return self.neighbors[start:end], self.travel_time[start:end]
+
+    def edge_travel_time(self, from_index: int, to_index: int) -> Optional[int]:
+        """
+        Look up the travel time of a single edge by binary search.
+
+        Args:
+            from_index: Source stop index
+            to_index: Destination stop index
+
+        Returns:
+            Travel time in seconds, or None if there is no such edge
+        """
+        start, end = self.indptr[from_index], self.indptr[from_index + 1]
+        pos = start + int(np.searchsorted(self.neighbors[start:end], to_index))
+        if pos < end and self.neighbors[pos] == to_index:
+            return int(self.travel_time[pos])
+        return None
+
+
+@dataclass(slots=True, frozen=True)
+class ConnectionCodes:
+    """
+    Connections as parallel int32 columns with string IDs stored once.
+
+    Column i describes graph.connections[i]; each *_ids list decodes the
+    codes in the matching column (e.g. stop_ids[from_stop[i]]).
+    """
+    stop_ids: List[str]
+    trip_ids: List[str]
+    route_ids: List[str]
+    from_stop: np.ndarray
+    to_stop: np.ndarray
+    trip: np.ndarray
+    route: np.ndarray
+    departure_sec: np.ndarray
+    arrival_sec: np.ndarray
+
+
+@dataclass(slots=True, frozen=True)
+class StopCoordinates:
+    """
+    Stop positions as contiguous float64 columns in graph node order.
+
+    lat[i] and lon[i] belong to stop_ids[i]; stops added without
+    coordinates (e.g. only as an edge endpoint) hold NaN. Spatial queries
+    can work on whole columns instead of per-node attribute dicts.
+    """
+    stop_ids: List[str]
+    stop_idx: Dict[str, int]
+    lat: np.ndarray
+    lon: np.ndarray
 
 
 class TransitGraph:
@@ -73,6 +177,22 @@ class TransitGraph:
         self.parser = gtfs_parser
         self.connections: List[Connection] = []
 
+        # CSR view of self.graph, built on demand by adjacency()
+        self._csr: Optional[CSRAdjacency] = None
+
+        # Node and edge counts for get_stats and the stop coordinate columns,
+        # dropped together with _csr
+        self._stats: Optional[Dict] = None
+        self._coords: Optional[StopCoordinates] = None
+
+        # Positions in self.connections by from-stop and by (from, to) pair,
+        # built on demand and keyed on the identity and length of the list
+        self._conn_index_key: Optional[Tuple[int, int]] = None
+        self._conns_by_stop: Dict[str, List[int]] = {}
+        self._conns_by_edge: Dict[Tuple[str, str], List[int]] = {}
+        self._codes: Optional[ConnectionCodes] = None
+        self._codes_key: Optional[Tuple[int, int, int]] = None
+
         if gtfs_parser:
             self.build_from_parser(gtfs_parser)
 
@@ -87,9 +207,10 @@ class TransitGraph:
             Self for method chaining
         """
         self.parser = parser
-        self._add_stop_nodes()
-        self._add_trip_connections()
-        self._add_transfer_edges()
+        with _gc_paused():
+            self._add_stop_nodes()
+            self._add_trip_connections()
+            self._add_transfer_edges()
         return self
 
     def _add_stop_nodes(self):
@@ -97,6 +218,8 @@ class TransitGraph:
         if not self.parser:
             return
 
+        self._csr = self._stats = self._coords = None
+
         for stop_id, stop in self.parser.stops.items():
             self.graph.add_node(
                 stop_id,
@@ -112,49 +235,90 @@ class TransitGraph:
         if not self.parser:
             return
 
+        # First pass: collect consecutive stop pairs with their trip info
+        pairs: List[Tuple[StopTime, StopTime, str, str, Optional[int]]] = []
         for trip_id, stop_times in self.parser.stop_times.items():
+            # Get trip and route info
+            trip = self.parser.trips.get(trip_id)
+            route_id = trip.route_id if trip else ""
+
+            # Get route type for multi-modal support
+            route_type = None
+            if route_id:
+                route = self.parser.routes.get(route_id)
+                route_type = route.route_type if route else None
+
             # Stop times are already sorted by stop_sequence
-            for i in range(len(stop_times) - 1):
-                current_stop = stop_times[i]
-                next_stop = stop_times[i + 1]
-
-                # Calculate travel time
-                travel_time = self._calculate_travel_time(
-                    current_stop.departure_time,
-                    next_stop.arrival_time
-                )
+            for current_stop, next_stop in zip(stop_times, stop_times[1:]):
+                pairs.append((current_stop, next_stop, trip_id, route_id, route_type))
+
+        # Parse every departure and arrival in two array passes
+        departures = hhmmss_to_seconds_batch([current.departure_time for current, *_ in pairs])
+        arrivals = hhmmss_to_seconds_batch([nxt.arrival_time for _, nxt, *_ in pairs])
+        travel_times = (arrivals - departures).tolist()
+
+        new_connections = [
+            Connection(
+                from_stop_id=current_stop.stop_id,
+                to_stop_id=next_stop.stop_id,
+                trip_id=trip_id,
+                departure_time=current_stop.departure_time,
+                arrival_time=next_stop.arrival_time,
+                travel_time_seconds=travel_time,
+                route_id=route_id,
+                route_type=route_type,
+                is_transfer=False,
+                departure_sec=departure_sec,
+                arrival_sec=arrival_sec
+            )
+            for (current_stop, next_stop, trip_id, route_id, route_type),
+                departure_sec, arrival_sec, travel_time
+            in zip(pairs, departures.tolist(), arrivals.tolist(), travel_times)
+        ]
 
-                # Get trip and route info
-                trip = self.parser.trips.get(trip_id)
-                route_id = trip.route_id if trip else ""
-
-                # Get route type for multi-modal support
-                route_type = None
-                if route_id:
-                    route = self.parser.routes.get(route_id)
-                    route_type = route.route_type if route else None
-
-                # Create connection
-                connection = Connection(
-                    from_stop_id=current_stop.stop_id,
-                    to_stop_id=next_stop.stop_id,
-                    trip_id=trip_id,
-                    departure_time=current_stop.departure_time,
-                    arrival_time=next_stop.arrival_time,
-                    travel_time_seconds=travel_time,
-                    route_id=route_id,
-                    route_type=route_type,
-                    is_transfer=False
-                )
-                self.connections.append(connection)
-
-                # Add edge to graph (or update with minimum travel time)
-                self._add_or_update_edge(
-                    current_stop.stop_id,
-                    next_stop.stop_id,
-                    travel_time,
-                    route_id,
-                    trip_id
+        self.connections.extend(new_connections)
+        self._add_connection_edges(new_connections)
+
+    def _add_connection_edges(self, connections: List[Connection]):
+        """
+        Add graph edges for a batch of connections.
+
+        Connections are first reduced to one entry per (from, to) stop pair
+        holding the minimum travel time and the serving routes and trips, so
+        the graph is touched once per edge rather than once per connection.
+
+        Args:
+            connections: Connections to add edges for
+        """
+        edges: Dict[Tuple[str, str], list] = {}
+        for conn in connections:
+            key = (conn.from_stop_id, conn.to_stop_id)
+            slot = edges.get(key)
+            if slot is None:
+                edges[key] = [conn.travel_time_seconds, {conn.route_id}, {conn.trip_id}]
+            else:
+                if conn.travel_time_seconds < slot[0]:
+                    slot[0] = conn.travel_time_seconds
+                slot[1].add(conn.route_id)
+                slot[2].add(conn.trip_id)
+
+        self._csr = self._stats = self._coords = None
+        for (from_stop, to_stop), (travel_time, routes, trips) in edges.items():
+            data = self.graph.get_edge_data(from_stop, to_stop)
+            if data is not None:
+                if travel_time < data['weight']:
+                    data['weight'] = travel_time
+                    data['min_travel_time'] = travel_time
+                data.setdefault('routes', set()).update(routes)
+                data.setdefault('trips', set()).update(trips)
+            else:
+                self.graph.add_edge(
+                    from_stop,
+                    to_stop,
+                    weight=travel_time,
+                    min_travel_time=travel_time,
+                    routes=routes,
+                    trips=trips
                 )
 
     def _calculate_travel_time(self, departure_time: str, arrival_time: str) -> int:
@@ -170,81 +334,98 @@ class TransitGraph:
         Returns:
             Travel time in seconds
         """
-        def parse_gtfs_time(time_str: str) -> int:
-            """Convert GTFS time string to seconds since midnight."""
-            parts = time_str.split(':')
-            hours = int(parts[0])
-            minutes = int(parts[1])
-            seconds = int(parts[2])
-            return hours * 3600 + minutes * 60 + seconds
+        return hhmmss_to_seconds(arrival_time) - hhmmss_to_seconds(departure_time)
 
-        dep_seconds = parse_gtfs_time(departure_time)
-        arr_seconds = parse_gtfs_time(arrival_time)
+    def _add_transfer_edges(self):
+        """Add edges for transfers between stops."""
+        if not self.parser or not self.parser.transfers:
+            return
+
+        for transfer in self.parser.transfers:
+            # Add transfer edge with min_transfer_time as weight
+            # Default to 120 seconds (2 minutes) if not specified
+            transfer_time = int(transfer.min_transfer_time) if transfer.min_transfer_time else 120
 
-        return arr_seconds - dep_seconds
+            self._add_transfer_edge(
+                transfer.from_stop_id,
+                transfer.to_stop_id,
+                transfer_time,
+                transfer.transfer_type
+            )
 
-    def _add_or_update_edge(
+    def _add_transfer_edge(
         self,
         from_stop: str,
         to_stop: str,
-        travel_time: int,
-        route_id: str,
-        trip_id: str
+        transfer_time: int,
+        transfer_type: str
     ):
         """
-        Add edge or update existing edge with minimum travel time.
+        Add a transfer edge, merging it into an existing trip edge if present.
+
+        The edge weight stays the minimum of the trip and transfer times, and
+        the transfer's own time is kept under 'transfer_time'. A merged trip
+        edge keeps is_transfer unset and is marked 'is_transfer_also', so it
+        is not mistaken for a walking transfer.
 
         Args:
             from_stop: Source stop ID
             to_stop: Destination stop ID
-            travel_time: Travel time in seconds
-            route_id: Route ID
-            trip_id: Trip ID
-        """
-        if self.graph.has_edge(from_stop, to_stop):
-            # Update with minimum travel time
-            current_time = self.graph[from_stop][to_stop]['weight']
-            if travel_time < current_time:
-                self.graph[from_stop][to_stop]['weight'] = travel_time
-                self.graph[from_stop][to_stop]['min_travel_time'] = travel_time
-
-            # Add route and trip to lists
-            routes = self.graph[from_stop][to_stop].get('routes', set())
-            routes.add(route_id)
-            self.graph[from_stop][to_stop]['routes'] = routes
-
-            trips = self.graph[from_stop][to_stop].get('trips', set())
-            trips.add(trip_id)
-            self.graph[from_stop][to_stop]['trips'] = trips
+            transfer_time: Minimum transfer time in seconds
+            transfer_type: GTFS transfer_type
+        """
+        self._csr = self._stats = self._coords = None
+        data = self.graph.get_edge_data(from_stop, to_stop)
+        if data is not None:
+            if transfer_time < data['weight']:
+                data['weight'] = transfer_time
+                data['min_travel_time'] = transfer_time
+            data['is_transfer_also'] = True
+            data['transfer_time'] = transfer_time
+            data['transfer_type'] = transfer_type
         else:
-            # Add new edge
             self.graph.add_edge(
                 from_stop,
                 to_stop,
-                weight=travel_time,
-                min_travel_time=travel_time,
-                routes={route_id},
-                trips={trip_id}
+                weight=transfer_time,
+                min_travel_time=transfer_time,
+                is_transfer=True,
+                transfer_time=transfer_time,
+                transfer_type=transfer_type
             )
 
-    def _add_transfer_edges(self):
-        """Add edges for transfers between stops."""
-        if not self.parser or not self.parser.transfers:
-            return
+    def adjacency(self) -> CSRAdjacency:
+        """
+        Get a CSR view of the graph's edges and minimum travel times.
 
-        for transfer in self.parser.transfers:
-            # Add transfer edge with min_transfer_time as weight
-            # Default to 120 seconds (2 minutes) if not specified
-            transfer_time = int(transfer.min_transfer_time) if transfer.min_transfer_time else 120
+        The arrays are built on first use and cached until the graph is
+        next modified through this class.
 
-            self.graph.add_edge(
-                transfer.from_stop_id,
-                transfer.to_stop_id,
-                weight=transfer_time,
-                min_travel_time=transfer_time,
-                is_transfer=True,
-                transfer_type=transfer.transfer_type
+        Returns:
+            CSRAdjacency over all stops in node order
+        """
+        if self._csr is None:
+            stop_ids = list(self.graph.nodes)
+            stop_idx = {stop_id: i for i, stop_id in enumerate(stop_ids)}
+            indptr = np.zeros(len(stop_ids) + 1, dtype=np.int64)
+            neighbors: List[int] = []
+            travel_times: List[int] = []
+
+            for i, stop_id in enumerate(stop_ids):
+                row = sorted((stop_idx[v], data['weight'])
+                             for v, data in self.graph.adj[stop_id].items())
+                neighbors.extend(v for v, _ in row)
+                travel_times.extend(t for _, t in row)
+                indptr[i + 1] = len(neighbors)
+
+            self._csr = CSRAdjacency(
+                stop_ids=stop_ids,
+                stop_idx=stop_idx,
+                indptr=indptr,
+                neighbors=np.array(neighbors, dtype=np.int32),
+                travel_time=np.array(travel_times, dtype=np.int32)
             )
+        return self._csr
 
     def get_neighbors(self, stop_id: str) -> List[str]:
         """
@@ -272,10 +453,9 @@ class TransitGraph:
         Returns:
             Travel time in seconds, or None if no direct connection
         """
-        if not self.graph.has_edge(from_stop_id, to_stop_id):
-            return None
-
-        return self.graph[from_stop_id][to_stop_id]['weight']
+        # A single edge-dict probe; graph[u][v] would build two view objects
+        data = self.graph.get_edge_data(from_stop_id, to_stop_id)
+        return None if data is None else data['weight']
 
     def get_routes_between(self, from_stop_id: str, to_stop_id: str) -> Set[str]:
         """
@@ -288,10 +468,8 @@ class TransitGraph:
         Returns:
             Set of route IDs, or empty set if no direct connection
         """
-        if not self.graph.has_edge(from_stop_id, to_stop_id):
-            return set()
-
-        return self.graph[from_stop_id][to_stop_id].get('routes', set())
+        data = self.graph.get_edge_data(from_stop_id, to_stop_id)
+        return set() if data is None else data.get('routes', set())
 
     def get_stop_info(self, stop_id: str) -> Optional[Dict]:
         """
@@ -308,6 +486,45 @@ class TransitGraph:
 
         return dict(self.graph.nodes[stop_id])
 
+    def stop_coordinates(self) -> StopCoordinates:
+        """
+        Get every stop's latitude and longitude as NumPy columns.
+
+        The arrays are built on first use and cached until the graph is
+        next modified through this class.
+
+        Returns:
+            StopCoordinates over all stops in node order
+        """
+        if self._coords is None:
+            stop_ids = list(self.graph.nodes)
+            nodes = self.graph.nodes
+            self._coords = StopCoordinates(
+                stop_ids=stop_ids,
+                stop_idx={stop_id: i for i, stop_id in enumerate(stop_ids)},
+                lat=np.fromiter((nodes[s].get('lat', np.nan) for s in stop_ids),
+                                dtype=np.float64, count=len(stop_ids)),
+                lon=np.fromiter((nodes[s].get('lon', np.nan) for s in stop_ids),
+                                dtype=np.float64, count=len(stop_ids))
+            )
+        return self._coords
+
+    def _refresh_connection_index(self):
+        """Rebuild the connection position indices if self.connections changed."""
+        key = (id(self.connections), len(self.connections))
+        if key == self._conn_index_key:
+            return
+
+        by_stop: Dict[str, List[int]] = {}
+        by_edge: Dict[Tuple[str, str], List[int]] = {}
+        for i, conn in enumerate(self.connections):
+            by_stop.setdefault(conn.from_stop_id, []).append(i)
+            by_edge.setdefault((conn.from_stop_id, conn.to_stop_id), []).append(i)
+
+        self._conns_by_stop = by_stop
+        self._conns_by_edge = by_edge
+        self._conn_index_key = key
+
     def get_connections_from(self, stop_id: str) -> List[Connection]:
         """
         Get all connections departing from a stop.
@@ -318,7 +535,26 @@ class TransitGraph:
         Returns:
             List of Connection objects
         """
-        return [conn for conn in self.connections if conn.from_stop_id == stop_id]
+        self._refresh_connection_index()
+        connections = self.connections
+        return [connections[i] for i in self._conns_by_stop.get(stop_id, ())]
+
+    def iter_connections_from(self, stop_id: str) -> Iterator[Connection]:
+        """
+        Iterate over connections departing from a stop without building a list.
+
+        Useful when the caller may stop early, e.g. at the first usable
+        departure.
+
+        Args:
+            stop_id: Stop ID to query
+
+        Returns:
+            Iterator of Connection objects, in the same order as
+            get_connections_from
+        """
+        self._refresh_connection_index()
+        return map(self.connections.__getitem__, self._conns_by_stop.get(stop_id, ()))
 
     def get_connections_between(self, from_stop_id: str, to_stop_id: str) -> List[Connection]:
         """
@@ -331,24 +567,75 @@ class TransitGraph:
         Returns:
             List of Connection objects
         """
-        return [
-            conn for conn in self.connections
-            if conn.from_stop_id == from_stop_id and conn.to_stop_id == to_stop_id
-        ]
+        self._refresh_connection_index()
+        connections = self.connections
+        return [connections[i] for i in self._conns_by_edge.get((from_stop_id, to_stop_id), ())]
+
+    def connection_codes(self) -> ConnectionCodes:
+        """
+        Get the connections as int32 code columns.
+
+        Stop codes follow graph node order; trip and route codes follow
+        first appearance in self.connections. The result is cached until
+        the connections list is replaced, changes length, or stops are
+        added.
+
+        Returns:
+            ConnectionCodes parallel to self.connections
+        """
+        connections = self.connections
+        key = (id(connections), len(connections), self.graph.number_of_nodes())
+        if self._codes is None or self._codes_key != key:
+            stop_idx = {stop_id: i for i, stop_id in enumerate(self.graph.nodes)}
+            trip_idx: Dict[str, int] = {}
+            route_idx: Dict[str, int] = {}
+            n = len(connections)
+            columns = [np.empty(n, dtype=np.int32) for _ in range(6)]
+            from_stop, to_stop, trip, route, departure, arrival = columns
+
+            for i, conn in enumerate(connections):
+                from_stop[i] = stop_idx.setdefault(conn.from_stop_id, len(stop_idx))
+                to_stop[i] = stop_idx.setdefault(conn.to_stop_id, len(stop_idx))
+                trip[i] = trip_idx.setdefault(conn.trip_id, len(trip_idx))
+                route[i] = route_idx.setdefault(conn.route_id, len(route_idx))
+                departure[i] = conn.departure_sec
+                arrival[i] = conn.arrival_sec
+
+            self._codes = ConnectionCodes(
+                stop_ids=list(stop_idx),
+                trip_ids=list(trip_idx),
+                route_ids=list(route_idx),
+                from_stop=from_stop,
+                to_stop=to_stop,
+                trip=trip,
+                route=route,
+                departure_sec=departure,
+                arrival_sec=arrival
+            )
+            self._codes_key = key
+        return self._codes
 
     def get_stats(self) -> Dict:
         """
         Get graph statistics.
 
+        The node and edge counts are cached until the graph is next modified
+        through this class.
+
         Returns:
             Dictionary with node count, edge count, and other stats
         """
-        return {
-            'num_stops': self.graph.number_of_nodes(),
-            'num_connections': self.graph.number_of_edges(),
-            'num_total_connections': len(self.connections),
-            'avg_degree': sum(dict(self.graph.degree()).values()) / max(self.graph.number_of_nodes(), 1)
-        }
+        if self._stats is None:
+            num_stops = self.graph.number_of_nodes()
+            num_edges = self.graph.number_of_edges()
+            self._stats = {
+                'num_stops': num_stops,
+                'num_connections': num_edges,
+                # Every directed edge adds one to an out- and an in-degree
+                'avg_degree': 2 * num_edges / max(num_stops, 1)
+            }
+
+        return {**self._stats, 'num_total_connections': len(self.connections)}
 
     def has_stop(self, stop_id: str) -> bool:
         """Check if stop exists in graph."""
@@ -357,3 +644,216 @@ class TransitGraph:
     def has_connection(self, from_stop_id: str, to_stop_id: str) -> bool:
         """Check if direct connection exists between stops."""
         return self.graph.has_edge(from_stop_id, to_stop_id)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Save the graph to a binary snapshot file.
+
+        Stops, connections and transfer edges are written as flat NumPy
+        arrays (with string IDs stored once in lookup tables) so the graph
+        can be restored without walking every trip's stop times again.
+
+        Args:
+            path: Destination file path (written as an uncompressed .npz archive)
+        """
+        codes = self.connection_codes()
+        stop_ids = codes.stop_ids
+        stop_idx = {stop_id: i for i, stop_id in enumerate(stop_ids)}
+        nodes = self.graph.nodes
+
+        transfers = [
+            (u, v, data) for u, v, data in self.graph.edges(data=True)
+            if data.get('is_transfer') or data.get('is_transfer_also')
+        ]
+
+        fingerprint = ""
+        if self.parser is not None:
+            fingerprint = _gtfs_fingerprint(self.parser.gtfs_dir)
+
+        arrays = {
+            'version': np.array(SNAPSHOT_VERSION),
+            'fingerprint': np.array(fingerprint),
+            'stop_ids': np.array(stop_ids, dtype=str),
+            'stop_has_attrs': np.array([bool(nodes[s]) for s in stop_ids], dtype=bool),
+            'stop_names': np.array([nodes[s].get('stop_name', '') for s in stop_ids], dtype=str),
+            'stop_lat': np.array([nodes[s].get('lat', 0.0) for s in stop_ids], dtype=np.float64),
+            'stop_lon': np.array([nodes[s].get('lon', 0.0) for s in stop_ids], dtype=np.float64),
+            'stop_location_type': np.array(
+                [nodes[s].get('location_type', '') for s in stop_ids], dtype=str
+            ),
+            'stop_parent_station': np.array(
+                [nodes[s].get('parent_station', '') for s in stop_ids], dtype=str
+            ),
+            'trip_ids': np.array(codes.trip_ids, dtype=str),
+            'route_ids': np.array(codes.route_ids, dtype=str),
+            'conn_from': codes.from_stop,
+            'conn_to': codes.to_stop,
+            'conn_trip': codes.trip,
+            'conn_route': codes.route,
+            'conn_departure': np.array([c.departure_time for c in self.connections], dtype=str),
+            'conn_arrival': np.array([c.arrival_time for c in self.connections], dtype=str),
+            'conn_travel_time': np.array(
+                [c.travel_time_seconds for c in self.connections], dtype=np.int32
+            ),
+            'conn_route_type': np.array(
+                [-1 if c.route_type is None else c.route_type for c in self.connections],
+                dtype=np.int32
+            ),
+            'conn_is_transfer': np.array([c.is_transfer for c in self.connections], dtype=bool),
+            'transfer_from': np.array([stop_idx[u] for u, _, _ in transfers], dtype=np.int32),
+            'transfer_to': np.array([stop_idx[v] for _, v, _ in transfers], dtype=np.int32),
+            'transfer_time': np.array([d['transfer_time'] for _, _, d in transfers], dtype=np.int32),
+            'transfer_type': np.array([d.get('transfer_type', '') for _, _, d in transfers], dtype=str),
+        }
+
+        with open(path, 'wb') as f:
+            np.savez(f, **arrays)
+
+        logger.info(f"Saved graph snapshot with {len(self.connections)} connections to {path}")
+
+    @classmethod
+    def load(
+        cls,
+        path: Union[str, Path],
+        gtfs_parser: Optional[GTFSParser] = None
+    ) -> 'TransitGraph':
+        """
+        Load a graph from a snapshot written by save().
+
+        If a parser is given, the snapshot is only used when it was built from
+        the same GTFS files (compared by name, size and modification time).
+        Otherwise the graph is rebuilt from the parser and the snapshot is
+        rewritten.
+
+        Args:
+            path: Snapshot file path
+            gtfs_parser: Optional GTFSParser the snapshot must match
+
+        Returns:
+            TransitGraph instance
+        """
+        path = Path(path)
+
+        if gtfs_parser is not None:
+            expected = _gtfs_fingerprint(gtfs_parser.gtfs_dir)
+            if not path.exists() or _read_snapshot_fingerprint(path) != expected:
+                logger.info(f"Graph snapshot {path} missing or stale, rebuilding")
+                graph = cls(gtfs_parser)
+                graph.save(path)
+                return graph
+
+        graph = cls()
+        graph.parser = gtfs_parser
+
+        with np.load(path, allow_pickle=False) as data, _gc_paused():
+            if int(data['version']) != SNAPSHOT_VERSION:
+                raise ValueError(
+                    f"Unsupported graph snapshot version {int(data['version'])} in {path}"
+                )
+
+            stop_ids = data['stop_ids'].tolist()
+            for i, stop_id in enumerate(stop_ids):
+                if data['stop_has_attrs'][i]:
+                    graph.graph.add_node(
+                        stop_id,
+                        stop_name=str(data['stop_names'][i]),
+                        lat=float(data['stop_lat'][i]),
+                        lon=float(data['stop_lon'][i]),
+                        location_type=str(data['stop_location_type'][i]),
+                        parent_station=str(data['stop_parent_station'][i])
+                    )
+                else:
+                    graph.graph.add_node(stop_id)
+
+            trip_ids = data['trip_ids'].tolist()
+            route_ids = data['route_ids'].tolist()
+            graph.connections = [
+                Connection(
+                    from_stop_id=stop_ids[from_idx],
+                    to_stop_id=stop_ids[to_idx],
+                    trip_id=trip_ids[trip],
+                    departure_time=departure,
+                    arrival_time=arrival,
+                    travel_time_seconds=travel_time,
+                    route_id=route_ids[route],
+                    route_type=None if route_type < 0 else route_type,
+                    is_transfer=is_transfer
+                )
+                for from_idx, to_idx, trip, route, departure, arrival,
+                    travel_time, route_type, is_transfer in zip(
+                    data['conn_from'].tolist(),
+                    data['conn_to'].tolist(),
+                    data['conn_trip'].tolist(),
+                    data['conn_route'].tolist(),
+                    data['conn_departure'].tolist(),
+                    data['conn_arrival'].tolist(),
+                    data['conn_travel_time'].tolist(),
+                    data['conn_route_type'].tolist(),
+                    data['conn_is_transfer'].tolist()
+                )
+            ]
+            graph._add_connection_edges(graph.connections)
+
+            for from_idx, to_idx, transfer_time, transfer_type in zip(
+                data['transfer_from'].tolist(),
+                data['transfer_to'].tolist(),
+                data['transfer_time'].tolist(),
+                data['transfer_type'].tolist()
+            ):
+                graph._add_transfer_edge(
+                    stop_ids[from_idx],
+                    stop_ids[to_idx],
+                    transfer_time,
+                    transfer_type
+                )
+
+        logger.info(f"Loaded graph snapshot with {len(graph.connections)} connections from {path}")
+        return graph
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """
+    Pause the cyclic garbage collector for a bulk build.
+
+    Building a graph allocates hundreds of thousands of connections, sets
+    and edge dicts that all stay alive. Each allocation burst triggers
+    collector passes that rescan them to no effect, and that takes most
+    of the build time. Reference counting still frees garbage while the
+    collector is paused.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def _gtfs_fingerprint(gtfs_dir: Union[str, Path]) -> str:
+    """
+    Fingerprint GTFS source files by name, size and modification time.
+
+    Args:
+        gtfs_dir: Directory containing GTFS .txt files
+
+    Returns:
+        Hex digest identifying the current state of the files
+    """
+    digest = hashlib.sha1()
+    for file_path in sorted(Path(gtfs_dir).glob('*.txt')):
+        stat = file_path.stat()
+        digest.update(f"{file_path.name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def _read_snapshot_fingerprint(path: Path) -> Optional[str]:
+    """Read the GTFS fingerprint stored in a snapshot, or None if unreadable."""
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            if int(data['version']) != SNAPSHOT_VERSION:
+                return None
+            return str(data['fingerprint'])
+    except (OSError, ValueError, KeyError):
+        return None
@@ -9,8 +9,9 @@ License: Creative Commons Attribution 4.0
 """
 
 import requests
+from google.protobuf.message import DecodeError
 from google.transit import gtfs_realtime_pb2
-from typing import Optional
+from typing import Dict, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -33,6 +34,13 @@ class GTFSRealtimeFetcher:
         }
     }
 
+    # (mode, feed_type) -> URL, so each fetch resolves its URL in one probe
+    _FLAT_URLS = {
+        (mode, feed_type): url
+        for mode, feeds in FEED_URLS.items()
+        for feed_type, url in feeds.items()
+    }
+
     def __init__(self, api_key: str, timeout: int = 30):
         """
         Initialize the GTFS Realtime fetcher.
@@ -46,33 +54,81 @@ class GTFSRealtimeFetcher:
 
         self.api_key = api_key
         self.timeout = timeout
+        # Reused across fetches so the TLS connection to the API stays alive
+        self._session = requests.Session()
+        # url -> (conditional request headers, last feed body), for feeds
+        # whose server sent an ETag or Last-Modified validator
+        self._feed_cache: Dict[str, Tuple[Dict[str, str], bytes]] = {}
 
     def fetch_feed(self, url: str) -> gtfs_realtime_pb2.FeedMessage:
         """
         Fetch and parse a GTFS Realtime feed from the given URL.
 
+        If the server tagged the previous response with an ETag or
+        Last-Modified header, the request is made conditional; on a
+        304 Not Modified reply the previously downloaded body is parsed
+        instead of downloading the feed again.
+
         Args:
             url: The URL of the GTFS Realtime feed
 
         Returns:
-            Parsed FeedMessage protobuf object
+            Parsed FeedMessage protobuf object, a new one on every call so
+            callers may modify it
 
         Raises:
-            requests.exceptions.RequestException: If the HTTP request fails
+            requests.exceptions.RequestException: If the HTTP request fails,
+                including a 304 reply for a feed with no cached body
             ValueError: If the response cannot be parsed as protobuf
         """
         try:
             headers = {
                 'KeyID': self.api_key
             }
+            cached = self._feed_cache.get(url)
+            if cached is not None:
+                headers.update(cached[0])
 
             logger.debug(f"Fetching GTFS Realtime feed from: {url}")
-            response = requests.get(url, headers=headers, timeout=self.timeout)
-            response.raise_for_status()
-
-            # Parse the protobuf feed
-            feed = gtfs_realtime_pb2.FeedMessage()
-            feed.ParseFromString(response.content)
+            # Streamed so a 304 reply skips the body; the with block hands
+            # the connection back to the pool even if reading fails
+            with self._session.get(url, headers=headers, timeout=self.timeout,
+                                   stream=True) as response:
+                if not response.ok:
+                    # Read the error body while the stream is still open,
+                    # so the handler below can log it
+                    response.content
+                response.raise_for_status()
+
+                if response.status_code == 304:
+                    if cached is None:
+                        # Nothing was asked to be revalidated, so there is
+                        # no body to fall back on
+                        raise requests.exceptions.HTTPError(
+                            f"304 Not Modified without a cached feed for url: {url}",
+                            response=response
+                        )
+                    logger.debug(f"Feed not modified since last fetch: {url}")
+                    # Parsed afresh rather than sharing one mutable message
+                    # between callers
+                    return gtfs_realtime_pb2.FeedMessage.FromString(memoryview(cached[1]))
+
+                # Read through requests so broken streams, read timeouts and
+                # bad gzip surface as RequestExceptions, not urllib3 errors
+                raw = response.content
+
+            # Parse the protobuf feed; the buffer is passed without copying
+            feed = gtfs_realtime_pb2.FeedMessage.FromString(memoryview(raw))
+
+            validators = {}
+            if etag := response.headers.get('ETag'):
+                validators['If-None-Match'] = etag
+            if last_modified := response.headers.get('Last-Modified'):
+                validators['If-Modified-Since'] = last_modified
+            if validators:
+                self._feed_cache[url] = (validators, raw)
+            else:
+                self._feed_cache.pop(url, None)
 
             logger.info(f"Successfully fetched feed with {len(feed.entity)} entities")
             return feed
@@ -84,7 +140,7 @@ class GTFSRealtimeFetcher:
                 logger.error(f"Response: {e.response.text[:200]}")
             raise
 
-        except Exception as e:
+        except DecodeError as e:
             logger.error(f"Failed to parse protobuf: {e}")
             raise ValueError(f"Invalid protobuf data: {e}") from e
 
@@ -98,11 +154,7 @@ class GTFSRealtimeFetcher:
         Returns:
             FeedMessage containing trip updates
         """
-        if mode not in self.FEED_URLS:
-            raise ValueError(f"Unknown mode: {mode}. Must be one of {list(self.FEED_URLS.keys())}")
-
-        url = self.FEED_URLS[mode]['trip_updates']
-        return self.fetch_feed(url)
+        return self.fetch_feed(self._feed_url(mode, 'trip_updates'))
 
     def fetch_vehicle_positions(self, mode: str = 'metro') -> gtfs_realtime_pb2.FeedMessage:
         """
@@ -114,11 +166,7 @@ class GTFSRealtimeFetcher:
         Returns:
             FeedMessage containing vehicle positions
         """
-        if mode not in self.FEED_URLS:
-            raise ValueError(f"Unknown mode: {mode}. Must be one of {list(self.FEED_URLS.keys())}")
-
-        url = self.FEED_URLS[mode]['vehicle_positions']
-        return self.fetch_feed(url)
+        return self.fetch_feed(self._feed_url(mode, 'vehicle_positions'))
 
     def fetch_service_alerts(self, mode: str = 'metro') -> gtfs_realtime_pb2.FeedMessage:
         """
@@ -130,8 +178,23 @@ class GTFSRealtimeFetcher:
         Returns:
             FeedMessage containing service alerts
         """
-        if mode not in self.FEED_URLS:
-            raise ValueError(f"Unknown mode: {mode}. Must be one of {list(self.FEED_URLS.keys())}")
+        return self.fetch_feed(self._feed_url(mode, 'service_alerts'))
 
-        url = self.FEED_URLS[mode]['service_alerts']
-        return self.fetch_feed(url)
+    def _feed_url(self, mode: str, feed_type: str) -> str:
+        """
+        Look up the feed URL for a transport mode and feed type.
+
+        Args:
+            mode: Transport mode ('metro' or 'vline')
+            feed_type: 'trip_updates', 'vehicle_positions' or 'service_alerts'
+
+        Returns:
+            Feed URL
+
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        url = self._FLAT_URLS.get((mode, feed_type))
+        if url is None:
+            raise ValueError(f"Unknown mode: {mode}. Must be one of {list(self.FEED_URLS.keys())}")
+        return url
@@ -6,17 +6,23 @@ Handles delays, cancellations, platform information, and transfer validation.
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from itertools import pairwise
+from typing import Dict, List, Optional, Set, Tuple
 import logging
 
+from google.transit import gtfs_realtime_pb2
+
 from .feed_fetcher import GTFSRealtimeFetcher
-from .time_utils import add_delay_to_time, time_diff_seconds
+from .time_utils import hhmmss_to_seconds, seconds_to_hhmmss
 from ..routing.models import Journey, Leg
 
 logger = logging.getLogger(__name__)
 
+_DAY = 24 * 3600
+_HALF_DAY = _DAY // 2
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StopUpdate:
     """
     Realtime information for a specific stop on a trip.
@@ -30,7 +36,7 @@ class StopUpdate:
     platform_name: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class TripUpdateInfo:
     """
     Structured realtime data for a single trip.
@@ -45,6 +51,27 @@ class TripUpdateInfo:
     alerts: List[str] = field(default_factory=list)
 
 
+def _on_scheduled_day(actual_time: Optional[str], scheduled_sec: int) -> int:
+    """
+    Place a wall-clock realtime time on its scheduled time's service day.
+
+    Realtime strings wrap at midnight (00:00:00-23:59:59) while scheduled
+    GTFS seconds run past 86400, so the string is read as the nearest
+    offset (within half a day) from the scheduled time.
+
+    Args:
+        actual_time: Realtime time in HH:MM:SS format, or None
+        scheduled_sec: Scheduled time in seconds since service-day midnight
+
+    Returns:
+        Realtime seconds since service-day midnight (scheduled if no string)
+    """
+    if not actual_time:
+        return scheduled_sec
+    offset = (hhmmss_to_seconds(actual_time) - scheduled_sec + _HALF_DAY) % _DAY - _HALF_DAY
+    return scheduled_sec + offset
+
+
 class RealtimeIntegrator:
     """
     Integrates real-time GTFS feed data with scheduled journeys.
@@ -100,21 +127,86 @@ class RealtimeIntegrator:
             logger.warning(f"Failed to fetch realtime data: {e}. Using scheduled times.")
             return journey  # Return unchanged journey
 
+        return self._apply_trip_updates(journey, trip_updates, min_transfer_time_seconds)
+
+    def apply_realtime_to_journeys(
+        self,
+        journeys: List[Journey],
+        mode: str = 'vline',
+        min_transfer_time_seconds: int = 120
+    ) -> List[Journey]:
+        """
+        Apply realtime updates to several journeys from a single feed fetch.
+
+        The feed is fetched and parsed once, keeping only trips used by
+        the given journeys, then applied to each journey in turn.
+
+        Args:
+            journeys: Scheduled journeys from JourneyPlanner
+            mode: Transport mode ('metro' or 'vline')
+            min_transfer_time_seconds: Minimum time needed for transfers (default: 2 min)
+
+        Returns:
+            The same journeys with realtime fields populated
+        """
+        if not journeys:
+            return journeys
+
+        if not self.fetcher:
+            logger.warning("No fetcher provided. Using scheduled times.")
+            return journeys
+
+        wanted_trip_ids = {leg.trip_id for journey in journeys for leg in journey.legs}
+
+        try:
+            feed = self.fetcher.fetch_trip_updates(mode=mode)
+            trip_updates = self._parse_trip_updates(feed, wanted_trip_ids)
+            logger.info(f"Parsed {len(trip_updates)} relevant trip updates from realtime feed")
+        except Exception as e:
+            logger.warning(f"Failed to fetch realtime data: {e}. Using scheduled times.")
+            return journeys
+
+        for journey in journeys:
+            self._apply_trip_updates(journey, trip_updates, min_transfer_time_seconds)
+
+        return journeys
+
+    def _apply_trip_updates(
+        self,
+        journey: Journey,
+        trip_updates: Dict[str, TripUpdateInfo],
+        min_transfer_time_seconds: int
+    ) -> Journey:
+        """
+        Apply already-parsed trip updates to a journey.
+
+        Args:
+            journey: Scheduled journey to update (modified in place)
+            trip_updates: Mapping of trip_id to TripUpdateInfo
+            min_transfer_time_seconds: Minimum time needed for transfers
+
+        Returns:
+            The updated journey
+        """
         # Apply delays to each leg
         total_delay = 0
         any_cancelled = False
         has_any_realtime_data = False
 
         for leg in journey.legs:
-            if leg.trip_id in trip_updates:
-                trip_info = trip_updates[leg.trip_id]
+            trip_info = trip_updates.get(leg.trip_id)
+            if trip_info is None:
+                continue
+            has_any_realtime_data = True
+
+            # Feeds are sparse: skip trips with nothing to apply
+            if trip_info.is_cancelled or trip_info.stop_updates:
                 self._apply_delays_to_leg(leg, trip_info)
-                has_any_realtime_data = True
 
-                if leg.is_cancelled:
-                    any_cancelled = True
+            if leg.is_cancelled:
+                any_cancelled = True
 
-                total_delay += leg.departure_delay_seconds
+            total_delay += leg.departure_delay_seconds
 
         # Update journey-level realtime fields
         journey.has_realtime_data = has_any_realtime_data
@@ -147,70 +239,55 @@ class RealtimeIntegrator:
         logger.info(f"Realtime integration complete. Delay: {total_delay}s, Valid: {journey.is_realtime_valid}")
         return journey
 
-    def _parse_trip_updates(self, feed) -> Dict[str, TripUpdateInfo]:
+    def _parse_trip_updates(
+        self,
+        feed,
+        trip_ids: Optional[Set[str]] = None
+    ) -> Dict[str, TripUpdateInfo]:
         """
         Parse GTFS Realtime feed into structured trip updates.
 
         Args:
             feed: FeedMessage from GTFS Realtime protobuf
+            trip_ids: Optional set of trip IDs to keep; other trips are skipped
 
         Returns:
             Dictionary mapping trip_id to TripUpdateInfo
         """
+        canceled = gtfs_realtime_pb2.TripDescriptor.CANCELED
         trip_updates = {}
 
+        # Unset proto2 fields read back as their defaults ("", 0, SCHEDULED,
+        # and empty delay messages), which are exactly the values used when a
+        # field is absent, so no HasField probes are needed per stop
         for entity in feed.entity:
             if not entity.HasField('trip_update'):
                 continue
 
             trip_update = entity.trip_update
-            trip_id = trip_update.trip.trip_id
-            route_id = trip_update.trip.route_id if trip_update.trip.HasField('route_id') else ""
-
-            # Check for cancellation
-            is_cancelled = False
-            if trip_update.trip.HasField('schedule_relationship'):
-                from google.transit import gtfs_realtime_pb2
-                if trip_update.trip.schedule_relationship == gtfs_realtime_pb2.TripDescriptor.CANCELED:
-                    is_cancelled = True
-
-            # Parse stop time updates
-            stop_updates = {}
-            for stu in trip_update.stop_time_update:
-                stop_id = stu.stop_id
-                stop_sequence = stu.stop_sequence if stu.HasField('stop_sequence') else 0
-
-                # Extract delays
-                dep_delay = 0
-                arr_delay = 0
-
-                if stu.HasField('departure') and stu.departure.HasField('delay'):
-                    dep_delay = stu.departure.delay
-
-                if stu.HasField('arrival') and stu.arrival.HasField('delay'):
-                    arr_delay = stu.arrival.delay
-
-                # Extract platform (if available)
-                platform = None
-                # Note: Platform info might be in different fields depending on the feed
-                # PTV may not provide this in trip updates
-
-                stop_update = StopUpdate(
-                    stop_id=stop_id,
-                    stop_sequence=stop_sequence,
-                    departure_delay_seconds=dep_delay,
-                    arrival_delay_seconds=arr_delay,
-                    platform_name=platform
+            trip = trip_update.trip
+            trip_id = trip.trip_id
+            if trip_ids is not None and trip_id not in trip_ids:
+                continue
+
+            # Platform info might be in different fields depending on the
+            # feed; PTV may not provide this in trip updates
+            stop_updates = {
+                stu.stop_id: StopUpdate(
+                    stu.stop_id,
+                    stu.stop_sequence,
+                    stu.departure.delay,
+                    stu.arrival.delay
                 )
-                stop_updates[stop_id] = stop_update
+                for stu in trip_update.stop_time_update
+            }
 
-            trip_info = TripUpdateInfo(
+            trip_updates[trip_id] = TripUpdateInfo(
                 trip_id=trip_id,
-                route_id=route_id,
-                is_cancelled=is_cancelled,
+                route_id=trip.route_id,
+                is_cancelled=trip.schedule_relationship == canceled,
                 stop_updates=stop_updates
             )
-            trip_updates[trip_id] = trip_info
 
         return trip_updates
 
@@ -232,24 +309,26 @@ class RealtimeIntegrator:
             return
 
         # Find stop updates for this leg's from/to stops
-        from_update = trip_info.stop_updates.get(leg.from_stop_id)
-        to_update = trip_info.stop_updates.get(leg.to_stop_id)
+        stop_updates = trip_info.stop_updates
+        from_update = stop_updates.get(leg.from_stop_id)
+        to_update = stop_updates.get(leg.to_stop_id)
 
-        if not from_update and not to_update:
+        if from_update is None and to_update is None:
             # No realtime data for this leg
             return
 
-        # Store original times as scheduled
+        # Store original times as scheduled. Delays are applied to the
+        # leg's integer seconds and only formatted back for display.
         leg.scheduled_departure_time = leg.departure_time
         leg.scheduled_arrival_time = leg.arrival_time
+        departure_sec = leg._dep_sec
+        arrival_sec = leg._arr_sec
 
         # Apply departure delay
         if from_update and from_update.departure_delay_seconds != 0:
             leg.departure_delay_seconds = from_update.departure_delay_seconds
-            leg.actual_departure_time = add_delay_to_time(
-                leg.departure_time,
-                from_update.departure_delay_seconds
-            )
+            departure_sec += from_update.departure_delay_seconds
+            leg.actual_departure_time = seconds_to_hhmmss(departure_sec)
             if from_update.platform_name:
                 leg.platform_name = from_update.platform_name
         else:
@@ -258,15 +337,15 @@ class RealtimeIntegrator:
         # Apply arrival delay
         if to_update and to_update.arrival_delay_seconds != 0:
             leg.arrival_delay_seconds = to_update.arrival_delay_seconds
-            leg.actual_arrival_time = add_delay_to_time(
-                leg.arrival_time,
-                to_update.arrival_delay_seconds
-            )
+            arrival_sec += to_update.arrival_delay_seconds
+            leg.actual_arrival_time = seconds_to_hhmmss(arrival_sec)
             if to_update.platform_name:
                 leg.platform_name = to_update.platform_name
         else:
             leg.actual_arrival_time = leg.arrival_time
 
+        leg._actual_departure_sec = departure_sec
+        leg._actual_arrival_sec = arrival_sec
         leg.has_realtime_data = True
 
     def _validate_transfers(
@@ -284,16 +363,22 @@ class RealtimeIntegrator:
         Returns:
             Tuple of (is_valid, reason_if_invalid)
         """
-        for i in range(len(journey.legs) - 1):
-            current_leg = journey.legs[i]
-            next_leg = journey.legs[i + 1]
-
-            # Get actual times (or scheduled if no realtime data)
-            actual_arrival = current_leg.actual_arrival_time or current_leg.arrival_time
-            actual_departure = next_leg.actual_departure_time or next_leg.departure_time
+        # _apply_delays_to_leg stores each leg's realtime times as seconds,
+        # so normally no time string is parsed here
+        for current_leg, next_leg in pairwise(journey.legs):
+            # Get actual times (or scheduled if no realtime data), all on
+            # the scheduled times' unwrapped service-day base
+            actual_arrival = current_leg._actual_arrival_sec
+            if actual_arrival is None:
+                actual_arrival = _on_scheduled_day(current_leg.actual_arrival_time,
+                                                   current_leg._arr_sec)
+            actual_departure = next_leg._actual_departure_sec
+            if actual_departure is None:
+                actual_departure = _on_scheduled_day(next_leg.actual_departure_time,
+                                                     next_leg._dep_sec)
 
             # Calculate transfer window
-            transfer_window = time_diff_seconds(actual_arrival, actual_departure)
+            transfer_window = actual_departure - actual_arrival
 
             if transfer_window < min_transfer_time_seconds:
                 transfer_mins = transfer_window // 60
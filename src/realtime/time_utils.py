@@ -4,8 +4,22 @@ Time utility functions for realtime integration.
 Handles conversions between Unix timestamps, HH:MM:SS format, and seconds since midnight.
 """
 
-from datetime import datetime, timedelta
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy parser is used instead
+    njit = None
+
+# Values of two-digit time fields ("00" to "99"), for parsing without int()
+_TWO_DIGITS = {f"{i:02d}": i for i in range(100)}
+
+# Zero-padded two-digit strings indexed by value, for formatting without
+# running the "02d" format spec on every field
+_PADDED_LIST = list(_TWO_DIGITS)
 
 
 def unix_to_hhmmss(unix_timestamp: int, timezone_offset: int = 11) -> str:
@@ -21,18 +35,18 @@ def unix_to_hhmmss(unix_timestamp: int, timezone_offset: int = 11) -> str:
 
     Example:
         >>> unix_to_hhmmss(1705201234)
-        "14:27:14"
+        "14:00:34"
     """
-    # Convert to datetime
-    dt = datetime.utcfromtimestamp(unix_timestamp)
-
-    # Apply timezone offset (Melbourne is UTC+10 or UTC+11 depending on DST)
-    dt = dt + timedelta(hours=timezone_offset)
-
-    # Format as HH:MM:SS
-    return dt.strftime("%H:%M:%S")
+    # Melbourne is UTC+10 or UTC+11 depending on DST; only the time of
+    # day is needed, and seconds_to_hhmmss takes the local seconds modulo
+    # one day
+    return seconds_to_hhmmss(unix_timestamp + timezone_offset * 3600)
 
 
+# Feeds, graphs and journeys reuse a small set of distinct HH:MM:SS strings
+# (at most ~100k including GTFS times past midnight), so one shared cache
+# turns repeated parses into a dict hit
+@lru_cache(maxsize=100_000)
 def hhmmss_to_seconds(time_str: str) -> int:
     """
     Convert HH:MM:SS to seconds since midnight.
@@ -47,8 +61,19 @@ def hhmmss_to_seconds(time_str: str) -> int:
         >>> hhmmss_to_seconds("14:30:00")
         52200
     """
+    # Fast path for the usual zero-padded "HH:MM:SS"
+    if len(time_str) == 8 and time_str[2] == ':' and time_str[5] == ':':
+        try:
+            return (_TWO_DIGITS[time_str[0:2]] * 3600
+                    + _TWO_DIGITS[time_str[3:5]] * 60
+                    + _TWO_DIGITS[time_str[6:8]])
+        except KeyError:
+            pass  # Not all digits; let the general parser below reject it
+
+    # General path, e.g. unpadded "8:05:00"; int() alone would also accept
+    # signs, spaces, underscores and non-ASCII digits
     parts = time_str.split(':')
-    if len(parts) != 3:
+    if len(parts) != 3 or not all(p.isdigit() and p.isascii() for p in parts):
         raise ValueError(f"Invalid time format: {time_str}. Expected HH:MM:SS")
 
     hours = int(parts[0])
@@ -58,6 +83,96 @@ def hhmmss_to_seconds(time_str: str) -> int:
     return hours * 3600 + minutes * 60 + seconds
 
 
+# Place values of the six digit columns in a fixed-width "HH:MM:SS" string
+_DIGIT_COLUMNS = [0, 1, 3, 4, 6, 7]
+_DIGIT_WEIGHTS = np.array([36000, 3600, 600, 60, 10, 1], dtype=np.int64)
+
+# Value the record parsers return for records that are not "HH:MM:SS"
+_INVALID_RECORD = -1
+
+
+def _parse_records_loop(buf: np.ndarray) -> np.ndarray:
+    """
+    Parse 8-byte "HH:MM:SS" records one at a time (compiled with numba).
+
+    Args:
+        buf: uint8 array of shape (n, 8) holding ASCII time records
+
+    Returns:
+        int64 seconds since midnight, _INVALID_RECORD for malformed records
+    """
+    n = buf.shape[0]
+    out = np.empty(n, dtype=np.int64)
+    for i in range(n):
+        h1 = int(buf[i, 0]) - 48  # '0'
+        h2 = int(buf[i, 1]) - 48
+        m1 = int(buf[i, 3]) - 48
+        m2 = int(buf[i, 4]) - 48
+        s1 = int(buf[i, 6]) - 48
+        s2 = int(buf[i, 7]) - 48
+        if (buf[i, 2] != 58 or buf[i, 5] != 58  # ':'
+                or not (0 <= h1 <= 9 and 0 <= h2 <= 9 and 0 <= m1 <= 9
+                        and 0 <= m2 <= 9 and 0 <= s1 <= 9 and 0 <= s2 <= 9)):
+            out[i] = _INVALID_RECORD
+        else:
+            out[i] = (h1 * 10 + h2) * 3600 + (m1 * 10 + m2) * 60 + s1 * 10 + s2
+    return out
+
+
+def _parse_records_numpy(buf: np.ndarray) -> np.ndarray:
+    """Vectorized NumPy equivalent of _parse_records_loop."""
+    digits = buf[:, _DIGIT_COLUMNS].astype(np.int64) - ord('0')
+    valid = ((buf[:, 2] == ord(':')) & (buf[:, 5] == ord(':'))
+             & ((digits >= 0) & (digits <= 9)).all(axis=1))
+    return np.where(valid, digits @ _DIGIT_WEIGHTS, _INVALID_RECORD)
+
+
+_parse_records = (njit(cache=True)(_parse_records_loop) if njit is not None
+                  else _parse_records_numpy)
+
+
+def hhmmss_to_seconds_batch(times: Union[Sequence[str], np.ndarray]) -> np.ndarray:
+    """
+    Convert many HH:MM:SS strings to seconds since midnight at once.
+
+    Vectorized equivalent of ``hhmmss_to_seconds``. Zero-padded 8-character
+    times are parsed with byte arithmetic on the ASCII buffer (digit minus
+    ``'0'``, weighted by place value), compiled with numba when it is
+    installed; any other lengths fall back to the scalar parser.
+
+    Args:
+        times: Times in HH:MM:SS format (hours may exceed 23)
+
+    Returns:
+        int64 array of seconds since midnight, same length as ``times``
+
+    Raises:
+        ValueError: If any time is not in HH:MM:SS format
+
+    Example:
+        >>> hhmmss_to_seconds_batch(["14:30:00", "25:00:00"]).tolist()
+        [52200, 90000]
+    """
+    strs = np.asarray(times, dtype=np.str_).ravel()
+    result = np.empty(len(strs), dtype=np.int64)
+
+    fixed = np.char.str_len(strs) == 8
+    try:
+        buf = strs[fixed].astype('S8').view(np.uint8).reshape(-1, 8)
+    except UnicodeEncodeError:
+        raise ValueError("Invalid time format: non-ASCII characters. Expected HH:MM:SS")
+
+    parsed = _parse_records(buf)
+    invalid = parsed == _INVALID_RECORD
+    if invalid.any():
+        bad = strs[fixed][np.argmax(invalid)]
+        raise ValueError(f"Invalid time format: {bad}. Expected HH:MM:SS")
+
+    result[fixed] = parsed
+    result[~fixed] = [hhmmss_to_seconds(t) for t in strs[~fixed]]
+    return result
+
+
 def seconds_to_hhmmss(seconds: int) -> str:
     """
     Convert seconds since midnight to HH:MM:SS format.
@@ -73,13 +188,10 @@ def seconds_to_hhmmss(seconds: int) -> str:
         "14:30:00"
     """
     # Handle times past midnight (next day)
-    seconds = seconds % (24 * 3600)
+    hours, remainder = divmod(seconds % (24 * 3600), 3600)
+    minutes, secs = divmod(remainder, 60)
 
-    hours = seconds // 3600
-    minutes = (seconds % 3600) // 60
-    secs = seconds % 60
-
-    return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+    return f"{_PADDED_LIST[hours]}:{_PADDED_LIST[minutes]}:{_PADDED_LIST[secs]}"
 
 
 def add_delay_to_time(time_str: str, delay_seconds: int) -> str:
@@ -99,18 +211,13 @@ def add_delay_to_time(time_str: str, delay_seconds: int) -> str:
         >>> add_delay_to_time("14:30:00", -120)  # Subtract 2 minutes
         "14:28:00"
     """
-    # Convert to seconds
-    original_seconds = hhmmss_to_seconds(time_str)
-
-    # Add delay
-    new_seconds = original_seconds + delay_seconds
+    # seconds_to_hhmmss wraps modulo one day, which also handles delays that
+    # roll back before midnight (Python's % is never negative here)
+    return seconds_to_hhmmss(hhmmss_to_seconds(time_str) + delay_seconds)
 
-    # Handle negative times (wrap to previous day)
-    if new_seconds < 0:
-        new_seconds = (24 * 3600) + new_seconds
 
-    # Convert back to HH:MM:SS
-    return seconds_to_hhmmss(new_seconds)
+# format_delay wording, keyed by whether the service is late
+_DELAY_SUFFIX = {True: "min delay", False: "min early"}
 
 
 def format_delay(delay_seconds: int) -> str:
@@ -131,18 +238,12 @@ def format_delay(delay_seconds: int) -> str:
         >>> format_delay(0)
         "On time"
     """
-    if delay_seconds == 0:
-        return "On time"
-
+    # Anything under a minute either way (including zero) is on time
     delay_mins = abs(delay_seconds) // 60
     if delay_mins == 0:
-        # Less than a minute
         return "On time"
 
-    if delay_seconds > 0:
-        return f"{delay_mins} min delay"
-    else:
-        return f"{delay_mins} min early"
+    return f"{delay_mins} {_DELAY_SUFFIX[delay_seconds > 0]}"
 
 
 def time_diff_seconds(time1: str, time2: str) -> int:
@@ -160,6 +261,4 @@ def time_diff_seconds(time1: str, time2: str) -> int:
         >>> time_diff_seconds("14:30:00", "14:35:00")
         300
     """
-    seconds1 = hhmmss_to_seconds(time1)
-    seconds2 = hhmmss_to_seconds(time2)
-    return seconds2 - seconds1
+    return hhmmss_to_seconds(time2) - hhmmss_to_seconds(time1)
@@ -6,17 +6,220 @@ journeys in transit networks. CSA is particularly efficient for GTFS data
 as it processes timetabled connections directly.
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 from dataclasses import dataclass
-import sys
+from itertools import pairwise
+import bisect
+import heapq
+import threading
+
+import numpy as np
 
 from ..data.gtfs_parser import GTFSParser
 from ..data.models import StopTime
 from ..graph.transit_graph import TransitGraph, Connection
+from ..realtime.time_utils import hhmmss_to_seconds
 from .models import Journey, Leg
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the scan falls back to pure Python
+    njit = None
+
+# "Unreached" marker for int32 earliest-arrival arrays
+_UNREACHED = int(np.iinfo(np.int32).max)
+
+# Transfer cap passed to the single-label scans; the real cap is checked on
+# the journey they find, since one label per stop can't enforce it exactly
+_NO_TRANSFER_LIMIT = _UNREACHED
+
+# (earliest, exit_conn, prev_conn, conn_legs) as returned by _scan_by_transfers
+_LegLabels = Tuple[List[List[int]], List[List[int]], Dict[int, int], Dict[int, int]]
+
+# Maximum number of (origin, destination, time, transfers) results cached
+_JOURNEY_CACHE_SIZE = 10000
+
+# Connections along one journey, in travel order
+_JourneyPath = Tuple[Connection, ...]
+
+# Below this many connections per stop a timetable counts as sparse, and
+# searching outward from reached stops beats scanning every connection
+_SPARSE_CONNECTIONS_PER_STOP = 4
+
+
+def _scan_connections(dep, arr, frm, to, trip, earliest, in_trip, enter_idx,
+                      transfers, max_transfers, start, target):
+    """
+    Core CSA loop over departure-sorted connection columns.
+
+    Works on either Python lists or NumPy int arrays and updates
+    ``earliest``, ``in_trip``, ``enter_idx`` and ``transfers`` (indexed by
+    stop) in place. Changing trips counts as a transfer, and connections
+    that would exceed ``max_transfers`` are skipped. Scanning begins at
+    connection index ``start`` and stops once connections depart after the
+    earliest arrival at stop ``target``, since no later connection can
+    improve it. Pass -1 to scan everything. Kept free of Python objects so
+    it can be compiled with numba.
+    """
+    for i in range(start, len(dep)):
+        if target >= 0 and dep[i] > earliest[target]:
+            break
+
+        # Skip connections that depart before we can reach the departure stop
+        f = frm[i]
+        if dep[i] < earliest[f]:
+            continue
+
+        # Check if this connection improves arrival time
+        t = to[i]
+        if arr[i] < earliest[t]:
+            # Boarding at the origin is free; switching trips is a transfer
+            n = transfers[f]
+            if in_trip[f] >= 0 and in_trip[f] != trip[i]:
+                n += 1
+                if n > max_transfers:
+                    continue
+            earliest[t] = arr[i]
+            enter_idx[t] = i
+            in_trip[t] = trip[i]
+            transfers[t] = n
+
+
+_scan_connections_jit = njit(cache=True)(_scan_connections) if njit is not None else None
+
+
+def _scan_from_stops(out_conns, out_deps, arr, to, trip, earliest, in_trip, enter_idx,
+                     transfers, max_transfers, origin, target):
+    """
+    Earliest-arrival search that only looks at connections leaving reached stops.
+
+    Settles stops in arrival order using a heap (time-dependent Dijkstra)
+    and, for each, jumps via binary search to its first outgoing connection
+    departing no earlier than its arrival. Fills the same per-stop arrays
+    as ``_scan_connections``, with ``enter_idx`` pointing into the sorted
+    connection order, so journeys are reconstructed the same way.
+
+    Args:
+        out_conns: Per stop, indices of its outgoing connections in departure order
+        out_deps: Per stop, departure seconds parallel to ``out_conns``
+        arr, to, trip: Arrival, to-stop and trip columns of the sorted connections
+        earliest, in_trip, enter_idx, transfers: Per-stop state, updated in place
+        max_transfers: Maximum number of trip changes allowed
+        origin: Origin stop index (``earliest[origin]`` must already be set)
+        target: Stop index at which to stop searching, or -1 for none
+    """
+    heap = [(earliest[origin], origin)]
+    while heap:
+        time, stop = heapq.heappop(heap)
+        if time > earliest[stop]:
+            continue  # Stale entry; stop was improved after this was pushed
+        if stop == target:
+            break
+
+        current_trip = in_trip[stop]
+        stop_transfers = transfers[stop]
+        conns = out_conns[stop]
+        for k in range(bisect.bisect_left(out_deps[stop], time), len(conns)):
+            i = conns[k]
+            t = to[i]
+            if arr[i] < earliest[t]:
+                n = stop_transfers
+                if current_trip >= 0 and current_trip != trip[i]:
+                    n += 1
+                    if n > max_transfers:
+                        continue
+                earliest[t] = arr[i]
+                enter_idx[t] = i
+                in_trip[t] = trip[i]
+                transfers[t] = n
+                heapq.heappush(heap, (arr[i], t))
+
+
+def _scan_by_transfers(dep, arr, frm, to, trip, n_stops, n_trips, origin, dep_seconds,
+                       max_legs, start, target):
+    """
+    Multi-criteria CSA: earliest arrival per stop for each number of legs.
+
+    ``earliest[k][stop]`` is the earliest arrival at ``stop`` using at most
+    ``k`` trips (``k - 1`` transfers). Each trip remembers the fewest legs
+    with which it has been boarded so far, so one pass over the sorted
+    connections covers every transfer count.
+
+    Args:
+        dep, arr, frm, to, trip: Columns of the departure-sorted connections
+        n_stops: Number of distinct stop indices
+        n_trips: Number of distinct trip indices
+        origin: Origin stop index
+        dep_seconds: Earliest departure from the origin
+        max_legs: Maximum number of trips per journey (max_transfers + 1)
+        start: First connection index worth scanning
+        target: Stop index at which to stop scanning once settled, or -1
+
+    Returns:
+        Tuple of (earliest, exit_conn, prev_conn, conn_legs): ``exit_conn[k][stop]``
+        is the connection index that set ``earliest[k][stop]``; ``prev_conn``
+        maps a connection index to the previous connection on the same ride
+        (-1 where the trip was boarded), and ``conn_legs`` maps it to the
+        number of legs used up to and including that ride.
+    """
+    earliest = [[_UNREACHED] * n_stops for _ in range(max_legs + 1)]
+    exit_conn = [[-1] * n_stops for _ in range(max_legs + 1)]
+    for k in range(max_legs + 1):
+        earliest[k][origin] = dep_seconds
+
+    trip_legs = [max_legs + 1] * n_trips  # Fewest legs the trip is boarded with
+    trip_last = [-1] * n_trips  # Last connection index ridden on the trip
+    prev_conn: Dict[int, int] = {}
+    conn_legs: Dict[int, int] = {}
+    # The 1-leg label is the last to settle: a later connection can still
+    # improve it after more legs have already reached the target
+    slowest_target = earliest[1]
+
+    for i in range(start, len(dep)):
+        if target >= 0 and dep[i] > slowest_target[target]:
+            break
+
+        # Legs needed if we board here: one more than the fewest legs
+        # with which we can be waiting at the departure stop in time
+        f = frm[i]
+        board_legs = max_legs + 1
+        for k in range(max_legs):
+            if earliest[k][f] <= dep[i]:
+                board_legs = k + 1
+                break
+
+        tr = trip[i]
+        if trip_legs[tr] <= board_legs:
+            legs = trip_legs[tr]  # Stay on the trip we're already riding
+            if legs > max_legs:
+                continue
+            prev_conn[i] = trip_last[tr]
+        else:
+            legs = board_legs  # Board (or re-board with fewer legs) here
+            prev_conn[i] = -1
+            trip_legs[tr] = legs
+        trip_last[tr] = i
+        conn_legs[i] = legs
+
+        # Improve this and every higher leg count; earliest[k] never
+        # increases with k, so stop at the first count not improved
+        t = to[i]
+        a = arr[i]
+        for k in range(legs, max_legs + 1):
+            if a >= earliest[k][t]:
+                break
+            earliest[k][t] = a
+            exit_conn[k][t] = i
 
-@dataclass
+    return earliest, exit_conn, prev_conn, conn_legs
+
+
+def _num_transfers(path: _JourneyPath) -> int:
+    """Count the changes between trips along a path (Journey.num_transfers)."""
+    return sum(a.trip_id != b.trip_id for a, b in pairwise(path))
+
+
+@dataclass(slots=True)
 class ConnectionWithMeta:
     """Connection with additional metadata for CSA."""
     connection: Connection
@@ -43,6 +246,173 @@ class JourneyPlanner:
         self.parser = gtfs_parser
         self.graph = transit_graph or TransitGraph(gtfs_parser)
 
+        # Connections sorted by departure, built lazily on the first scan.
+        # The _conn_* arrays are parallel to _sorted_connections; stops and
+        # trips are referred to by dense int indices into _stop_ids/_trip_ids.
+        self._sorted_connections: Optional[List[Connection]] = None
+        self._sorted_source: Optional[Tuple[int, int]] = None
+        self._conn_dep: Optional[np.ndarray] = None
+        self._conn_arr: Optional[np.ndarray] = None
+        self._conn_from: Optional[np.ndarray] = None
+        self._conn_to: Optional[np.ndarray] = None
+        self._conn_trip: Optional[np.ndarray] = None
+        self._conn_columns: Tuple[List[int], ...] = ()
+        self._out_conns: List[List[int]] = []
+        self._out_deps: List[List[int]] = []
+        self._stop_ids: List[str] = []
+        self._stop_idx: Dict[str, int] = {}
+        self._trip_ids: List[str] = []
+        self._trip_idx: Dict[str, int] = {}
+
+        # Connection paths found by previous queries (None if unreachable);
+        # cleared by invalidate_cache()
+        self._journey_cache: Dict[Tuple[str, str, str, int], Optional[_JourneyPath]] = {}
+
+        # Per-thread scan state arrays, reused across queries
+        self._buffers = threading.local()
+
+        # Display names used when building legs
+        self._stop_names: Dict[str, str] = {}
+        self._route_names: Dict[str, Optional[str]] = {}
+        self._build_name_caches()
+
+    def _build_name_caches(self) -> None:
+        """Precompute stop and route display names from the parser."""
+        self._stop_names = {sid: stop.stop_name for sid, stop in self.parser.stops.items()}
+        self._route_names = {rid: route.route_long_name for rid, route in self.parser.routes.items()}
+
+    def invalidate_cache(self) -> None:
+        """
+        Drop cached journeys and the sorted connection index.
+
+        Call this after the GTFS data or graph connections change. Replacing
+        ``graph.connections`` or changing its length is detected on the next
+        query, but an in-place edit that keeps the length (e.g. retiming a
+        connection) is not, and needs this call.
+        """
+        self._journey_cache.clear()
+        self._sorted_connections = None
+        self._sorted_source = None
+        self._build_name_caches()
+
+    def _get_sorted_connections(self) -> List[Connection]:
+        """
+        Get connections sorted by departure time, with their int columns.
+
+        The sort happens once; ``self._conn_dep`` and
+        ``self._conn_arr`` hold int32 seconds and ``self._conn_from``,
+        ``self._conn_to`` and ``self._conn_trip`` hold stop/trip indices,
+        all parallel to the returned list. The cache is rebuilt only if
+        ``self.graph.connections`` is replaced or changes length; same-length
+        in-place edits need ``invalidate_cache()``.
+
+        Returns:
+            Connections in stable departure-time order
+        """
+        connections = self.graph.connections
+        source = (id(connections), len(connections))
+        if self._sorted_connections is None or self._sorted_source != source:
+            self._journey_cache.clear()
+            self._build_indices(connections)
+            n = len(connections)
+            stop_idx = self._stop_idx
+            trip_idx = self._trip_idx
+            dep = np.fromiter((c.departure_sec for c in connections),
+                              dtype=np.int32, count=n)
+            arr = np.fromiter((c.arrival_sec for c in connections),
+                              dtype=np.int32, count=n)
+            frm = np.fromiter((stop_idx[c.from_stop_id] for c in connections),
+                              dtype=np.int32, count=n)
+            to = np.fromiter((stop_idx[c.to_stop_id] for c in connections),
+                             dtype=np.int32, count=n)
+            trip = np.fromiter((trip_idx[c.trip_id] for c in connections),
+                               dtype=np.int32, count=n)
+
+            # Stable, so connections departing together keep graph order
+            order = np.argsort(dep, kind='stable')
+            self._sorted_connections = [connections[i] for i in order.tolist()]
+            self._conn_dep = dep[order]
+            self._conn_arr = arr[order]
+            self._conn_from = frm[order]
+            self._conn_to = to[order]
+            self._conn_trip = trip[order]
+            # Plain-list copies for the interpreted scan loop, where list
+            # indexing is much cheaper than indexing NumPy scalars
+            self._conn_columns = tuple(
+                a.tolist() for a in (self._conn_dep, self._conn_arr, self._conn_from,
+                                     self._conn_to, self._conn_trip)
+            )
+            # Outgoing connections per stop, already in departure order
+            out_conns: List[List[int]] = [[] for _ in self._stop_ids]
+            out_deps: List[List[int]] = [[] for _ in self._stop_ids]
+            dep_list = self._conn_columns[0]
+            for i, from_idx in enumerate(self._conn_columns[2]):
+                out_conns[from_idx].append(i)
+                out_deps[from_idx].append(dep_list[i])
+            self._out_conns = out_conns
+            self._out_deps = out_deps
+            self._sorted_source = source
+        return self._sorted_connections
+
+    def _scan_buffers(self, n_stops: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get reset per-stop state arrays for a compiled scan.
+
+        The arrays are allocated once per thread (and again only if the
+        number of stops changes), then refilled in place for each query.
+
+        Args:
+            n_stops: Number of indexed stops
+
+        Returns:
+            Tuple of (earliest, in_trip, enter_idx, transfers) int32 arrays
+        """
+        buffers = getattr(self._buffers, 'arrays', None)
+        if buffers is None or len(buffers[0]) != n_stops:
+            buffers = tuple(np.empty(n_stops, dtype=np.int32) for _ in range(4))
+            self._buffers.arrays = buffers
+        earliest, in_trip, enter_idx, transfers = buffers
+        earliest.fill(_UNREACHED)
+        in_trip.fill(-1)
+        enter_idx.fill(-1)
+        transfers.fill(0)
+        return buffers
+
+    def _use_stop_search(self) -> bool:
+        """
+        Decide whether to search outward from reached stops instead of a full scan.
+
+        The compiled CSA scan is used whenever numba is available; otherwise
+        the per-stop search is used for sparse timetables.
+
+        Returns:
+            True to use ``_scan_from_stops``
+        """
+        if _scan_connections_jit is not None:
+            return False
+        n_stops = len(self._stop_ids)
+        return n_stops > 0 and len(self._sorted_connections) < _SPARSE_CONNECTIONS_PER_STOP * n_stops
+
+    def _build_indices(self, connections: List[Connection]) -> None:
+        """
+        Assign dense int indices to stop and trip IDs.
+
+        Stops come from the parser, plus any stop only seen in connections.
+
+        Args:
+            connections: Connections that will be scanned
+        """
+        stop_idx: Dict[str, int] = {sid: i for i, sid in enumerate(self.parser.stops)}
+        trip_idx: Dict[str, int] = {}
+        for conn in connections:
+            stop_idx.setdefault(conn.from_stop_id, len(stop_idx))
+            stop_idx.setdefault(conn.to_stop_id, len(stop_idx))
+            trip_idx.setdefault(conn.trip_id, len(trip_idx))
+        self._stop_idx = stop_idx
+        self._stop_ids = list(stop_idx)
+        self._trip_idx = trip_idx
+        self._trip_ids = list(trip_idx)
+
     def find_journey(
         self,
         origin_stop_id: str,
@@ -72,13 +442,92 @@ class JourneyPlanner:
         if origin_stop_id == destination_stop_id:
             return None
 
-        # Run Connection Scan Algorithm
-        return self._connection_scan(
-            origin_stop_id,
-            destination_stop_id,
-            departure_time,
-            max_transfers
-        )
+        # Refreshes the connection index (and drops stale cached journeys)
+        # if the graph's connections have changed
+        self._get_sorted_connections()
+
+        key = (origin_stop_id, destination_stop_id, departure_time, max_transfers)
+        if key in self._journey_cache:
+            path = self._journey_cache[key]
+        else:
+            # Run Connection Scan Algorithm
+            path = self._connection_scan(
+                origin_stop_id,
+                destination_stop_id,
+                departure_time,
+                max_transfers
+            )
+            if len(self._journey_cache) >= _JOURNEY_CACHE_SIZE:
+                # Evict the oldest entry
+                del self._journey_cache[next(iter(self._journey_cache))]
+            self._journey_cache[key] = path
+
+        # Journeys are mutable (realtime updates are applied in place), so
+        # only the path is cached and each caller gets a freshly built Journey
+        if path is None:
+            return None
+        return self._build_journey(origin_stop_id, destination_stop_id, path)
+
+    def find_journeys_from(
+        self,
+        origin_stop_id: str,
+        departure_time: str,
+        destination_stop_ids: Optional[Sequence[str]] = None,
+        max_transfers: int = 3
+    ) -> Dict[str, Journey]:
+        """
+        Find earliest arrival journeys from one origin to many destinations.
+
+        A single scan from the origin reaches every stop, so this answers
+        many destinations for the cost of one query instead of calling
+        ``find_journey`` once per destination.
+
+        Args:
+            origin_stop_id: Origin stop ID
+            departure_time: Earliest departure time in HH:MM:SS format
+            destination_stop_ids: Destinations to build journeys for
+                (defaults to every reachable stop)
+            max_transfers: Maximum number of transfers allowed
+
+        Returns:
+            Dict mapping each reachable destination stop ID to its Journey;
+            unreachable destinations and the origin itself are omitted
+
+        Raises:
+            ValueError: If the origin or a destination stop doesn't exist
+        """
+        if not self.graph.has_stop(origin_stop_id):
+            raise ValueError(f"Origin stop {origin_stop_id} not found")
+        if destination_stop_ids is not None:
+            for stop_id in destination_stop_ids:
+                if not self.graph.has_stop(stop_id):
+                    raise ValueError(f"Destination stop {stop_id} not found")
+
+        self._get_sorted_connections()
+        origin = self._stop_idx.get(origin_stop_id)
+        if origin is None:
+            return {}  # Origin has no connections at all
+
+        dep_seconds = self._time_to_seconds(departure_time)
+        enter_idx = self._scan_from_origin(origin, dep_seconds, -1)
+
+        if destination_stop_ids is None:
+            destination_stop_ids = self._stop_ids
+        journeys: Dict[str, Journey] = {}
+        labels = None
+        for stop_id in destination_stop_ids:
+            destination = self._stop_idx.get(stop_id)
+            if destination is None or destination == origin or stop_id in journeys:
+                continue
+            path = self._finish_scan(origin, destination, enter_idx)
+            if path is not None and _num_transfers(path) > max_transfers:
+                # Scan per leg count once, for every destination over the cap
+                if labels is None:
+                    labels = self._scan_leg_labels(origin, dep_seconds, max_transfers + 1, -1)
+                path = self._capped_path(destination, labels)
+            if path is not None:
+                journeys[stop_id] = self._build_journey(origin_stop_id, stop_id, path)
+        return journeys
 
     def _connection_scan(
         self,
@@ -86,7 +535,7 @@ class JourneyPlanner:
         destination_stop_id: str,
         departure_time: str,
         max_transfers: int
-    ) -> Optional[Journey]:
+    ) -> Optional[_JourneyPath]:
         """
         Connection Scan Algorithm implementation.
 
@@ -95,7 +544,7 @@ class JourneyPlanner:
         2. Set origin earliest arrival to departure time
         3. Process all connections in chronological order
         4. For each connection, check if it improves arrival time at destination stop
-        5. Reconstruct journey from tracked connections
+        5. Reconstruct the journey's path from tracked connections
 
         Args:
             origin_stop_id: Origin stop ID
@@ -104,98 +553,248 @@ class JourneyPlanner:
             max_transfers: Maximum transfers
 
         Returns:
-            Journey if found, None otherwise
+            Connections along the journey in travel order if found, None otherwise
         """
         # Convert time to seconds for comparison
         dep_seconds = self._time_to_seconds(departure_time)
 
-        # Initialize earliest arrival times (in seconds since midnight)
-        earliest_arrival = {stop_id: sys.maxsize for stop_id in self.parser.stops.keys()}
-        earliest_arrival[origin_stop_id] = dep_seconds
+        # Connections in departure order (sorted once and cached)
+        self._get_sorted_connections()
+        origin = self._stop_idx.get(origin_stop_id)
+        destination = self._stop_idx.get(destination_stop_id)
+        if origin is None or destination is None:
+            return None  # Stop has no connections at all
+
+        enter_idx = self._scan_from_origin(origin, dep_seconds, destination)
+        path = self._finish_scan(origin, destination, enter_idx)
+        if path is None or _num_transfers(path) <= max_transfers:
+            return path
+
+        # The earliest arrival needs too many transfers; take the earliest
+        # arrival within the cap from the per-leg-count labels instead
+        labels = self._scan_leg_labels(origin, dep_seconds, max_transfers + 1, destination)
+        return self._capped_path(destination, labels)
+
+    def _scan_from_origin(
+        self,
+        origin: int,
+        dep_seconds: int,
+        target: int
+    ) -> Sequence[int]:
+        """
+        Run an earliest-arrival scan from one origin stop, ignoring transfers.
+
+        Uses the compiled CSA scan when numba is available, otherwise the
+        per-stop search for sparse timetables or the interpreted CSA scan.
+        The connection index must already be built. Callers check the
+        transfer cap on the journeys found (see ``_capped_path``).
+
+        Args:
+            origin: Origin stop index
+            dep_seconds: Earliest departure in seconds since midnight
+            target: Stop index at which the scan may stop early, or -1 to
+                reach every stop
+
+        Returns:
+            Per stop index, the sorted connection used to reach it (-1 if
+            unreached). The compiled scan returns a reused per-thread
+            buffer, so read it before the next scan.
+        """
+        n_stops = len(self._stop_ids)
+
+        if _scan_connections_jit is not None:
+            # Nothing departing before the requested time can be used, so
+            # jump straight to the first connection at or after it
+            start = int(np.searchsorted(self._conn_dep, dep_seconds, side='left'))
+            earliest, in_trip, enter_idx, transfers = self._scan_buffers(n_stops)
+            earliest[origin] = dep_seconds
+            _scan_connections_jit(
+                self._conn_dep, self._conn_arr, self._conn_from,
+                self._conn_to, self._conn_trip, earliest, in_trip, enter_idx,
+                transfers, _NO_TRANSFER_LIMIT, start, target
+            )
+            return enter_idx
+
+        # Earliest arrival, trip, entering connection and transfers per stop
+        earliest = [_UNREACHED] * n_stops
+        in_trip = [-1] * n_stops
+        enter_idx = [-1] * n_stops
+        transfers = [0] * n_stops
+        earliest[origin] = dep_seconds
+
+        if self._use_stop_search():
+            _, arr_secs, _, conn_to, conn_trip = self._conn_columns
+            _scan_from_stops(self._out_conns, self._out_deps, arr_secs, conn_to, conn_trip,
+                             earliest, in_trip, enter_idx, transfers, _NO_TRANSFER_LIMIT,
+                             origin, target)
+        else:
+            start = bisect.bisect_left(self._conn_columns[0], dep_seconds)
+            _scan_connections(*self._conn_columns, earliest, in_trip, enter_idx,
+                              transfers, _NO_TRANSFER_LIMIT, start, target)
+
+        return enter_idx
+
+    def _scan_leg_labels(
+        self,
+        origin: int,
+        dep_seconds: int,
+        max_legs: int,
+        target: int
+    ) -> _LegLabels:
+        """
+        Run the per-leg-count scan (``_scan_by_transfers``) from one origin stop.
 
-        # Track the connection used to reach each stop (for reconstruction)
-        enter_connection: Dict[str, Connection] = {}
+        The connection index must already be built.
 
-        # Track which trip we're currently on at each stop
-        in_trip: Dict[str, Optional[str]] = {stop_id: None for stop_id in self.parser.stops.keys()}
+        Args:
+            origin: Origin stop index
+            dep_seconds: Earliest departure in seconds since midnight
+            max_legs: Maximum number of trips per journey
+            target: Stop index at which the scan may stop early, or -1
 
-        # Sort connections by departure time
-        all_connections = sorted(
-            self.graph.connections,
-            key=lambda c: self._time_to_seconds(c.departure_time)
+        Returns:
+            The (earliest, exit_conn, prev_conn, conn_legs) labels
+        """
+        dep_secs, arr_secs, conn_from, conn_to, conn_trip = self._conn_columns
+        return _scan_by_transfers(
+            dep_secs, arr_secs, conn_from, conn_to, conn_trip,
+            len(self._stop_ids), len(self._trip_ids), origin, dep_seconds, max_legs,
+            bisect.bisect_left(dep_secs, dep_seconds), target
         )
 
-        # Scan all connections
-        for conn in all_connections:
-            dep_time = self._time_to_seconds(conn.departure_time)
-            arr_time = self._time_to_seconds(conn.arrival_time)
+    def _capped_path(
+        self,
+        destination: int,
+        labels: _LegLabels
+    ) -> Optional[_JourneyPath]:
+        """
+        Get the earliest arrival path within the labels' leg limit.
 
-            # Skip connections that depart before we can reach the departure stop
-            if dep_time < earliest_arrival[conn.from_stop_id]:
-                continue
+        Args:
+            destination: Destination stop index
+            labels: Result of ``_scan_leg_labels``
 
-            # Check if this connection improves arrival time
-            if arr_time < earliest_arrival[conn.to_stop_id]:
-                # Update earliest arrival
-                earliest_arrival[conn.to_stop_id] = arr_time
+        Returns:
+            Connections in travel order if the destination is reachable
+            within the limit, None otherwise
+        """
+        earliest = labels[0]
+        max_legs = len(earliest) - 1
+        if earliest[max_legs][destination] == _UNREACHED:
+            return None
+        return self._path_from_labels(destination, labels, max_legs)
 
-                # Track the connection
-                enter_connection[conn.to_stop_id] = conn
+    def _path_from_labels(
+        self,
+        destination: int,
+        labels: _LegLabels,
+        legs: int
+    ) -> _JourneyPath:
+        """
+        Reconstruct the path behind ``earliest[legs][destination]``.
 
-                # Update trip tracking
-                # If we're on the same trip, no transfer needed
-                if in_trip[conn.from_stop_id] == conn.trip_id:
-                    in_trip[conn.to_stop_id] = conn.trip_id
-                else:
-                    # Transfer or initial boarding
-                    in_trip[conn.to_stop_id] = conn.trip_id
+        Args:
+            destination: Destination stop index
+            labels: Result of ``_scan_leg_labels``; the destination must be
+                reached with at most ``legs`` legs
+            legs: Leg count whose label to follow
 
+        Returns:
+            Connections in travel order
+        """
+        _, exit_conn, prev_conn, conn_legs = labels
+        conn_from = self._conn_columns[2]
+        path_indices: List[int] = []
+        stop, k = destination, legs
+        while k > 0:
+            # Walk one ride back from its exit to where it was boarded
+            i = exit_conn[k][stop]
+            ride = [i]
+            while prev_conn[i] >= 0:
+                i = prev_conn[i]
+                ride.append(i)
+            path_indices.extend(ride)
+            k = conn_legs[i] - 1
+            stop = conn_from[i]
+
+        sorted_connections = self._sorted_connections
+        return tuple(sorted_connections[i] for i in reversed(path_indices))
+
+    def _finish_scan(
+        self,
+        origin: int,
+        destination: int,
+        enter_idx: Sequence[int]
+    ) -> Optional[_JourneyPath]:
+        """
+        Get the path found by a scan, if the destination was reached.
+
+        Args:
+            origin: Origin stop index
+            destination: Destination stop index
+            enter_idx: Per stop index, the sorted connection used to reach it
+
+        Returns:
+            Connections in travel order if found, None otherwise
+        """
         # Check if destination is reachable
-        if destination_stop_id not in enter_connection:
+        if enter_idx[destination] < 0:
             return None
 
-        # Reconstruct journey
-        return self._reconstruct_journey(
-            origin_stop_id,
-            destination_stop_id,
-            enter_connection,
-            earliest_arrival
-        )
+        # Reconstruct journey path
+        return self._reconstruct_path(origin, destination, enter_idx)
 
-    def _reconstruct_journey(
+    def _reconstruct_path(
+        self,
+        origin: int,
+        destination: int,
+        enter_idx: Sequence[int]
+    ) -> Optional[_JourneyPath]:
+        """
+        Reconstruct a journey's path from tracked connections.
+
+        Args:
+            origin: Origin stop index
+            destination: Destination stop index
+            enter_idx: Per stop index, the index of the sorted connection used
+                to reach it (-1 if unreached)
+
+        Returns:
+            Connections in travel order, None if the trail is broken
+        """
+        # Backtrack from destination to origin by connection index
+        conn_from = self._conn_columns[2]
+        current = destination
+        path_indices: List[int] = []
+
+        while current != origin:
+            i = int(enter_idx[current])
+            if i < 0:
+                return None  # No path found
+            path_indices.append(i)
+            current = conn_from[i]
+
+        # Materialize connections in origin -> destination order
+        sorted_connections = self._sorted_connections
+        return tuple(sorted_connections[i] for i in reversed(path_indices))
+
+    def _build_journey(
         self,
         origin_stop_id: str,
         destination_stop_id: str,
-        enter_connection: Dict[str, Connection],
-        earliest_arrival: Dict[str, int]
-    ) -> Optional[Journey]:
+        path_connections: Sequence[Connection]
+    ) -> Journey:
         """
-        Reconstruct journey from tracked connections.
+        Build a Journey from the connections along its path.
 
         Args:
             origin_stop_id: Origin stop ID
             destination_stop_id: Destination stop ID
-            enter_connection: Map of stop_id to connection used to reach it
-            earliest_arrival: Map of stop_id to earliest arrival time
+            path_connections: Connections in travel order
 
         Returns:
             Journey object
         """
-        # Backtrack from destination to origin
-        path_connections: List[Connection] = []
-        current_stop = destination_stop_id
-
-        while current_stop != origin_stop_id:
-            if current_stop not in enter_connection:
-                return None  # No path found
-
-            conn = enter_connection[current_stop]
-            path_connections.append(conn)
-            current_stop = conn.from_stop_id
-
-        # Reverse to get origin -> destination order
-        path_connections.reverse()
-
         # Group consecutive connections on same trip into legs
         legs: List[Leg] = []
         current_leg_start = 0
@@ -207,22 +806,19 @@ class JourneyPlanner:
 
             if is_last or is_transfer:
                 # Create leg from current_leg_start to i (inclusive)
-                leg = self._create_leg(
-                    path_connections[current_leg_start:i + 1]
-                )
+                leg = self._create_leg(path_connections, current_leg_start, i)
                 legs.append(leg)
                 current_leg_start = i + 1
 
         # Get stop names
-        origin_stop = self.parser.get_stop(origin_stop_id)
-        dest_stop = self.parser.get_stop(destination_stop_id)
+        stop_names = self._stop_names
 
         # Create journey
         journey = Journey(
             origin_stop_id=origin_stop_id,
-            origin_stop_name=origin_stop.stop_name if origin_stop else origin_stop_id,
+            origin_stop_name=stop_names.get(origin_stop_id, origin_stop_id),
             destination_stop_id=destination_stop_id,
-            destination_stop_name=dest_stop.stop_name if dest_stop else destination_stop_id,
+            destination_stop_name=stop_names.get(destination_stop_id, destination_stop_id),
             departure_time=path_connections[0].departure_time,
             arrival_time=path_connections[-1].arrival_time,
             legs=legs
@@ -230,38 +826,44 @@ class JourneyPlanner:
 
         return journey
 
-    def _create_leg(self, connections: List[Connection]) -> Leg:
+    def _create_leg(
+        self,
+        path: List[Connection],
+        start: int = 0,
+        end: Optional[int] = None
+    ) -> Leg:
         """
-        Create a Leg from a list of consecutive connections on the same trip.
+        Create a Leg from consecutive connections on the same trip.
 
         Args:
-            connections: List of connections on the same trip
+            path: List of connections containing the leg
+            start: Index of the leg's first connection in ``path``
+            end: Index of the leg's last connection (inclusive; defaults to
+                the last connection in ``path``)
 
         Returns:
             Leg object
         """
-        first_conn = connections[0]
-        last_conn = connections[-1]
+        if end is None:
+            end = len(path) - 1
+        first_conn = path[start]
+        last_conn = path[end]
 
-        from_stop = self.parser.get_stop(first_conn.from_stop_id)
-        to_stop = self.parser.get_stop(last_conn.to_stop_id)
-
-        trip = self.parser.get_trip(first_conn.trip_id)
-        route = self.parser.get_route(first_conn.route_id) if first_conn.route_id else None
+        stop_names = self._stop_names
 
         return Leg(
             from_stop_id=first_conn.from_stop_id,
-            from_stop_name=from_stop.stop_name if from_stop else first_conn.from_stop_id,
+            from_stop_name=stop_names.get(first_conn.from_stop_id, first_conn.from_stop_id),
             to_stop_id=last_conn.to_stop_id,
-            to_stop_name=to_stop.stop_name if to_stop else last_conn.to_stop_id,
+            to_stop_name=stop_names.get(last_conn.to_stop_id, last_conn.to_stop_id),
             departure_time=first_conn.departure_time,
             arrival_time=last_conn.arrival_time,
             trip_id=first_conn.trip_id,
             route_id=first_conn.route_id,
-            route_name=route.route_long_name if route else None,
+            route_name=self._route_names.get(first_conn.route_id),
             route_type=first_conn.route_type,
             is_transfer=first_conn.is_transfer,
-            num_stops=len(connections) + 1  # Number of stops including first and last
+            num_stops=end - start + 2  # Number of stops including first and last
         )
 
     def _time_to_seconds(self, time_str: str) -> int:
@@ -276,11 +878,7 @@ class JourneyPlanner:
         Returns:
             Seconds since midnight
         """
-        parts = time_str.split(':')
-        hours = int(parts[0])
-        minutes = int(parts[1])
-        seconds = int(parts[2])
-        return hours * 3600 + minutes * 60 + seconds
+        return hhmmss_to_seconds(time_str)
 
     def find_multiple_journeys(
         self,
@@ -291,26 +889,51 @@ class JourneyPlanner:
         max_transfers: int = 3
     ) -> List[Journey]:
         """
-        Find multiple journey options.
+        Find multiple journey options trading off arrival time and transfers.
 
-        Note: Current implementation returns only the earliest arrival journey.
-        Future enhancement could return multiple alternatives.
+        Runs a single multi-criteria scan that tracks the earliest arrival
+        for each number of transfers, then returns the Pareto-optimal
+        journeys: each one arrives later than the previous but needs fewer
+        transfers.
 
         Args:
             origin_stop_id: Origin stop ID
             destination_stop_id: Destination stop ID
             departure_time: Earliest departure time
-            max_results: Maximum number of results (currently unused)
+            max_results: Maximum number of results
             max_transfers: Maximum transfers allowed
 
         Returns:
-            List of Journey objects (currently 0 or 1 journey)
+            List of Journey objects, earliest arrival first
         """
-        journey = self.find_journey(
-            origin_stop_id,
-            destination_stop_id,
-            departure_time,
-            max_transfers
-        )
+        if not self.graph.has_stop(origin_stop_id):
+            raise ValueError(f"Origin stop {origin_stop_id} not found")
+        if not self.graph.has_stop(destination_stop_id):
+            raise ValueError(f"Destination stop {destination_stop_id} not found")
+        if origin_stop_id == destination_stop_id or max_results <= 0:
+            return []
 
-        return [journey] if journey else []
+        self._get_sorted_connections()
+        origin = self._stop_idx.get(origin_stop_id)
+        destination = self._stop_idx.get(destination_stop_id)
+        if origin is None or destination is None:
+            return []
+
+        dep_seconds = self._time_to_seconds(departure_time)
+        max_legs = max_transfers + 1
+        labels = self._scan_leg_labels(origin, dep_seconds, max_legs, destination)
+        earliest = labels[0]
+
+        # Pareto front at the destination: leg counts that arrive strictly
+        # earlier than with one leg fewer
+        options = [k for k in range(1, max_legs + 1)
+                   if earliest[k][destination] < earliest[k - 1][destination]]
+
+        journeys: List[Journey] = []
+        for legs in reversed(options):
+            path = self._path_from_labels(destination, labels, legs)
+            journeys.append(self._build_journey(origin_stop_id, destination_stop_id, path))
+            if len(journeys) >= max_results:
+                break
+
+        return journeys
@@ -6,11 +6,53 @@ individual journey legs and complete journey itineraries.
 """
 
 from dataclasses import dataclass, field
-from typing import List, Optional
-from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import pairwise
+from typing import List, Optional, Tuple
 
+from ..realtime.time_utils import hhmmss_to_seconds
 
-@dataclass
+# GTFS route_type to display name
+_MODE_MAP = {
+    0: "Tram",
+    1: "Metro",
+    2: "Regional Train",
+    3: "Bus",
+    4: "Ferry",
+    700: "Bus",  # PTV uses 700 for buses
+    900: "Tram"   # PTV uses 900 for trams
+}
+
+# Fixed part of each leg in Journey.format_summary
+_LEG_TEMPLATE = (
+    "Leg {index}:\n"
+    "  {from_name} → {to_name}\n"
+    "  Mode: {mode}\n"
+    "  {times}\n"
+    "  Duration: {duration}"
+)
+
+
+class EmptyJourneyError(ValueError):
+    """Raised when a Journey is created without any legs."""
+
+
+class DiscontinuousJourneyError(ValueError):
+    """Raised when a Journey leg does not start where the previous one ended."""
+
+
+# Journeys are formatted repeatedly when rendered, and durations take few
+# distinct values, so formatted strings are memoized
+@lru_cache(maxsize=4096)
+def _format_minutes(minutes: int) -> str:
+    """Format a duration in minutes as "45m", "1h 30m" or "2h"."""
+    if minutes < 60:
+        return f"{minutes}m"
+    hours, mins = divmod(minutes, 60)
+    return f"{hours}h {mins}m" if mins > 0 else f"{hours}h"
+
+
+@dataclass(slots=True)
 class Leg:
     """
     Represents one segment of a journey (e.g., one trip on a route).
@@ -48,40 +90,43 @@ class Leg:
     platform_name: Optional[str] = None  # "Platform 5", "Track 1"
     has_realtime_data: bool = False  # Whether realtime info is available
 
+    # Actual times as seconds since midnight, set when realtime is applied.
+    # Not wrapped at midnight, so they compare directly with GTFS times >24:00.
+    _actual_departure_sec: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    _actual_arrival_sec: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+
+    # Scheduled times as seconds since midnight, parsed once in __post_init__
+    _dep_sec: int = field(default=0, init=False, repr=False, compare=False)
+    _arr_sec: int = field(default=0, init=False, repr=False, compare=False)
+
     def __post_init__(self):
         """Validate and convert types."""
-        self.num_stops = int(self.num_stops)
-        if self.route_type is not None:
+        # The planner already passes ints; only convert values that are not
+        if type(self.num_stops) is not int:
+            self.num_stops = int(self.num_stops)
+        if self.route_type is not None and type(self.route_type) is not int:
             self.route_type = int(self.route_type)
+        self._dep_sec = hhmmss_to_seconds(self.departure_time)
+        self._arr_sec = hhmmss_to_seconds(self.arrival_time)
 
     def get_mode_name(self) -> str:
         """Get human-readable mode name."""
-        if self.is_transfer:
-            return "Walking"
-        mode_map = {
-            0: "Tram",
-            1: "Metro",
-            2: "Regional Train",
-            3: "Bus",
-            4: "Ferry",
-            700: "Bus",  # PTV uses 700 for buses
-            900: "Tram"   # PTV uses 900 for trams
-        }
-        return mode_map.get(self.route_type, "Unknown")
+        return "Walking" if self.is_transfer else _MODE_MAP.get(self.route_type, "Unknown")
+
+    @property
+    def departure_sec(self) -> int:
+        """Scheduled departure as seconds since midnight (may exceed 86400)."""
+        return self._dep_sec
+
+    @property
+    def arrival_sec(self) -> int:
+        """Scheduled arrival as seconds since midnight (may exceed 86400)."""
+        return self._arr_sec
 
     @property
     def duration_seconds(self) -> int:
         """Calculate leg duration in seconds."""
-        def time_to_seconds(time_str: str) -> int:
-            parts = time_str.split(':')
-            hours = int(parts[0])
-            minutes = int(parts[1])
-            seconds = int(parts[2])
-            return hours * 3600 + minutes * 60 + seconds
-
-        dep = time_to_seconds(self.departure_time)
-        arr = time_to_seconds(self.arrival_time)
-        return arr - dep
+        return self._arr_sec - self._dep_sec
 
     @property
     def duration_minutes(self) -> int:
@@ -90,15 +135,59 @@ class Leg:
 
     def format_duration(self) -> str:
         """Format duration as human-readable string."""
-        minutes = self.duration_minutes
-        if minutes < 60:
-            return f"{minutes}m"
-        hours = minutes // 60
-        mins = minutes % 60
-        return f"{hours}h {mins}m" if mins > 0 else f"{hours}h"
+        return _format_minutes(self.duration_minutes)
+
+
+def _scheduled_leg_times(leg: Leg) -> str:
+    """Format a leg's departure/arrival line from its scheduled times."""
+    return f"Depart: {leg.departure_time}  Arrive: {leg.arrival_time}"
+
+
+def _realtime_leg_times(leg: Leg) -> str:
+    """Format a leg's departure/arrival line, with realtime times and delay if known."""
+    if not (leg.has_realtime_data and leg.actual_departure_time and leg.actual_arrival_time):
+        return _scheduled_leg_times(leg)
+
+    times = (f"Depart: {leg.departure_time} → {leg.actual_departure_time}  "
+             f"Arrive: {leg.arrival_time} → {leg.actual_arrival_time}")
+    if leg.departure_delay_seconds != 0:
+        delay_mins = abs(leg.departure_delay_seconds) // 60
+        status = "delay" if leg.departure_delay_seconds > 0 else "early"
+        times += f"\n  ⚠️  {delay_mins} min {status}"
+    return times
+
+
+def _format_leg(index: int, leg: Leg, times: str, wait_seconds: Optional[int]) -> str:
+    """
+    Format one leg of Journey.format_summary.
 
+    Args:
+        index: 1-based leg number
+        leg: Leg to format
+        times: Pre-formatted departure/arrival line (without indent)
+        wait_seconds: Transfer wait after this leg, or None for the last leg
 
-@dataclass
+    Returns:
+        The leg's lines joined with newlines
+    """
+    return "\n".join(filter(None, (
+        _LEG_TEMPLATE.format(
+            index=index,
+            from_name=leg.from_stop_name,
+            to_name=leg.to_stop_name,
+            mode=leg.get_mode_name(),
+            times=times,
+            duration=leg.format_duration(),
+        ),
+        leg.route_name and f"  Route: {leg.route_name}",
+        leg.platform_name and f"  Platform: {leg.platform_name}",
+        leg.is_cancelled and "  ❌ CANCELLED",
+        not leg.is_transfer and f"  Stops: {leg.num_stops}",
+        wait_seconds is not None and f"  Transfer wait: {wait_seconds // 60}m",
+    )))
+
+
+@dataclass(slots=True)
 class Journey:
     """
     Represents a complete journey from origin to destination.
@@ -123,19 +212,29 @@ class Journey:
     has_realtime_data: bool = False  # Any leg has realtime info
     is_realtime_valid: bool = True  # Is journey still feasible?
     invalidity_reason: Optional[str] = None  # Why journey is no longer valid
-    journey_alerts: List[str] = field(default_factory=list)  # Service alerts
+    journey_alerts: Tuple[str, ...] = ()  # Service alerts, set once by the producer
+
+    # Scheduled times as seconds since midnight, parsed once in __post_init__
+    _dep_sec: int = field(default=0, init=False, repr=False, compare=False)
+    _arr_sec: int = field(default=0, init=False, repr=False, compare=False)
+
+    # Unique non-walking modes, filled on the first get_modes_used() call
+    _modes_cache: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         """Validate journey data."""
         if not self.legs:
-            raise ValueError("Journey must have at least one leg")
+            raise EmptyJourneyError("Journey must have at least one leg")
+
+        self._dep_sec = hhmmss_to_seconds(self.departure_time)
+        self._arr_sec = hhmmss_to_seconds(self.arrival_time)
 
         # Validate leg continuity
-        for i in range(len(self.legs) - 1):
-            if self.legs[i].to_stop_id != self.legs[i + 1].from_stop_id:
-                raise ValueError(
-                    f"Discontinuous journey: leg {i} ends at {self.legs[i].to_stop_id} "
-                    f"but leg {i+1} starts at {self.legs[i + 1].from_stop_id}"
+        for i, (prev, nxt) in enumerate(pairwise(self.legs)):
+            if prev.to_stop_id != nxt.from_stop_id:
+                raise DiscontinuousJourneyError(
+                    f"Discontinuous journey: leg {i} ends at {prev.to_stop_id} "
+                    f"but leg {i+1} starts at {nxt.from_stop_id}"
                 )
 
     @property
@@ -143,19 +242,20 @@ class Journey:
         """Number of transfers (changes between vehicles)."""
         return len(self.legs) - 1
 
+    @property
+    def departure_sec(self) -> int:
+        """Scheduled departure as seconds since midnight (may exceed 86400)."""
+        return self._dep_sec
+
+    @property
+    def arrival_sec(self) -> int:
+        """Scheduled arrival as seconds since midnight (may exceed 86400)."""
+        return self._arr_sec
+
     @property
     def duration_seconds(self) -> int:
         """Calculate total journey duration in seconds."""
-        def time_to_seconds(time_str: str) -> int:
-            parts = time_str.split(':')
-            hours = int(parts[0])
-            minutes = int(parts[1])
-            seconds = int(parts[2])
-            return hours * 3600 + minutes * 60 + seconds
-
-        dep = time_to_seconds(self.departure_time)
-        arr = time_to_seconds(self.arrival_time)
-        return arr - dep
+        return self._arr_sec - self._dep_sec
 
     @property
     def duration_minutes(self) -> int:
@@ -164,12 +264,7 @@ class Journey:
 
     def format_duration(self) -> str:
         """Format duration as human-readable string."""
-        minutes = self.duration_minutes
-        if minutes < 60:
-            return f"{minutes}m"
-        hours = minutes // 60
-        mins = minutes % 60
-        return f"{hours}h {mins}m" if mins > 0 else f"{hours}h"
+        return _format_minutes(self.duration_minutes)
 
     def get_modes_used(self) -> List[str]:
         """
@@ -178,14 +273,16 @@ class Journey:
         Returns:
             List of unique mode names (e.g., ["Regional Train", "Bus"])
         """
-        modes = []
-        seen = set()
-        for leg in self.legs:
-            mode = leg.get_mode_name()
-            if mode not in seen and mode != "Walking":
-                modes.append(mode)
-                seen.add(mode)
-        return modes
+        return list(self._modes())
+
+    def _modes(self) -> tuple:
+        """Return the cached tuple of unique modes, computing it on first use."""
+        if self._modes_cache is None:
+            # dict.fromkeys dedupes while keeping first-seen order
+            self._modes_cache = tuple(dict.fromkeys(
+                mode for mode in map(Leg.get_mode_name, self.legs) if mode != "Walking"
+            ))
+        return self._modes_cache
 
     def is_multi_modal(self) -> bool:
         """
@@ -194,7 +291,7 @@ class Journey:
         Returns:
             True if journey uses more than one mode (excluding walking transfers)
         """
-        return len(self.get_modes_used()) > 1
+        return len(self._modes()) > 1
 
     def get_transfer_wait_times(self) -> List[int]:
         """
@@ -203,24 +300,13 @@ class Journey:
         Returns:
             List of wait times in seconds (empty if no transfers)
         """
-        if self.num_transfers == 0:
-            return []
-
-        wait_times = []
-        for i in range(len(self.legs) - 1):
-            # Time between arrival of current leg and departure of next leg
-            def time_to_seconds(time_str: str) -> int:
-                parts = time_str.split(':')
-                hours = int(parts[0])
-                minutes = int(parts[1])
-                seconds = int(parts[2])
-                return hours * 3600 + minutes * 60 + seconds
+        # Time between arrival of each leg and departure of the next
+        return [nxt._dep_sec - prev._arr_sec for prev, nxt in pairwise(self.legs)]
 
-            arrival = time_to_seconds(self.legs[i].arrival_time)
-            next_departure = time_to_seconds(self.legs[i + 1].departure_time)
-            wait_times.append(next_departure - arrival)
-
-        return wait_times
+    @property
+    def delay_minutes(self) -> int:
+        """Magnitude of the total delay in whole minutes (early or late)."""
+        return abs(self.total_delay_seconds) // 60
 
     def get_delay_summary(self) -> str:
         """
@@ -235,7 +321,7 @@ class Journey:
         if self.total_delay_seconds == 0:
             return "On time"
 
-        delay_mins = abs(self.total_delay_seconds) // 60
+        delay_mins = self.delay_minutes
         if self.total_delay_seconds > 0:
             return f"{delay_mins} min delay"
         else:
@@ -251,8 +337,7 @@ class Journey:
         Returns:
             True if total delay exceeds threshold
         """
-        delay_mins = abs(self.total_delay_seconds) // 60
-        return delay_mins >= threshold_minutes
+        return self.delay_minutes >= threshold_minutes
 
     def format_summary(self) -> str:
         """
@@ -261,22 +346,38 @@ class Journey:
         Returns:
             Multi-line string with journey details
         """
-        lines = []
-        lines.append(f"Journey: {self.origin_stop_name} → {self.destination_stop_name}")
+        # Without realtime data anywhere, the per-leg realtime checks can be skipped
+        realtime = self.has_realtime_data or any(leg.has_realtime_data for leg in self.legs)
+        return self._format_summary(realtime)
+
+    def _format_summary(self, realtime: bool) -> str:
+        """
+        Format the summary, checking legs for realtime times only if asked.
+
+        Args:
+            realtime: Whether the journey or any of its legs has realtime data
 
+        Returns:
+            Multi-line string with journey details
+        """
         # Show scheduled and actual times if realtime data available
         if self.has_realtime_data and self.actual_departure_time:
-            lines.append(f"Departure: {self.departure_time} → {self.actual_departure_time}")
+            departure = f"{self.departure_time} → {self.actual_departure_time}"
         else:
-            lines.append(f"Departure: {self.departure_time}")
+            departure = self.departure_time
 
         if self.has_realtime_data and self.actual_arrival_time:
-            lines.append(f"Arrival: {self.arrival_time} → {self.actual_arrival_time}")
+            arrival = f"{self.arrival_time} → {self.actual_arrival_time}"
         else:
-            lines.append(f"Arrival: {self.arrival_time}")
+            arrival = self.arrival_time
 
-        lines.append(f"Duration: {self.format_duration()}")
-        lines.append(f"Transfers: {self.num_transfers}")
+        lines = [
+            f"Journey: {self.origin_stop_name} → {self.destination_stop_name}",
+            f"Departure: {departure}",
+            f"Arrival: {arrival}",
+            f"Duration: {self.format_duration()}",
+            f"Transfers: {self.num_transfers}",
+        ]
 
         # Add realtime status
         if self.has_realtime_data:
@@ -286,42 +387,14 @@ class Journey:
 
         lines.append("")
 
-        for i, leg in enumerate(self.legs, 1):
-            lines.append(f"Leg {i}:")
-            lines.append(f"  {leg.from_stop_name} → {leg.to_stop_name}")
-            lines.append(f"  Mode: {leg.get_mode_name()}")
-
-            # Show realtime times if available
-            if leg.has_realtime_data:
-                if leg.actual_departure_time and leg.actual_arrival_time:
-                    lines.append(f"  Depart: {leg.departure_time} → {leg.actual_departure_time}  "
-                               f"Arrive: {leg.arrival_time} → {leg.actual_arrival_time}")
-                    if leg.departure_delay_seconds != 0:
-                        delay_mins = abs(leg.departure_delay_seconds) // 60
-                        status = "delay" if leg.departure_delay_seconds > 0 else "early"
-                        lines.append(f"  ⚠️  {delay_mins} min {status}")
-                else:
-                    lines.append(f"  Depart: {leg.departure_time}  Arrive: {leg.arrival_time}")
-            else:
-                lines.append(f"  Depart: {leg.departure_time}  Arrive: {leg.arrival_time}")
-
-            lines.append(f"  Duration: {leg.format_duration()}")
-            if leg.route_name:
-                lines.append(f"  Route: {leg.route_name}")
-            if leg.platform_name:
-                lines.append(f"  Platform: {leg.platform_name}")
-            if leg.is_cancelled:
-                lines.append(f"  ❌ CANCELLED")
-            if not leg.is_transfer:
-                lines.append(f"  Stops: {leg.num_stops}")
-
-            # Add transfer wait time if not last leg
-            if i < len(self.legs):
-                wait_times = self.get_transfer_wait_times()
-                if wait_times:
-                    wait_mins = wait_times[i - 1] // 60
-                    lines.append(f"  Transfer wait: {wait_mins}m")
+        # Computed once rather than for every leg; one entry per transfer
+        wait_times = self.get_transfer_wait_times()
+        leg_times = _realtime_leg_times if realtime else _scheduled_leg_times
 
+        num_legs = len(self.legs)
+        for i, leg in enumerate(self.legs, 1):
+            wait_seconds = wait_times[i - 1] if i < num_legs else None
+            lines.append(_format_leg(i, leg, leg_times(leg), wait_seconds))
             lines.append("")
 
         return "\n".join(lines)
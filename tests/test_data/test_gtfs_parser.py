@@ -148,6 +148,16 @@ class TestLoadStopTimes:
         assert first_st.departure_time == "08:00:00"
         assert isinstance(first_st, StopTime)
 
+    def test_load_stop_times_ids_interned(self, gtfs_dir):
+        """Test that repeated IDs share a single string object."""
+        parser = GTFSParser(str(gtfs_dir))
+        parser.load_trips()
+        parser.load_stop_times()
+
+        t1_times = parser.stop_times["T1"]
+        assert all(st.trip_id is t1_times[0].trip_id for st in t1_times)
+        assert t1_times[0].trip_id is parser.trips["T1"].trip_id
+
 
 class TestLoadAgencies:
     """Test loading agency.txt."""
@@ -21,6 +21,22 @@ class TestStopIndexInit:
         assert index.parser is parser
         assert len(index.stops) == 3
 
+    def test_init_builds_all_lookups_in_stop_order(self):
+        """Test that every lookup structure follows parser stop order."""
+        parser = GTFSParser.__new__(GTFSParser)
+        parser.stops = {
+            "2": Stop("2", "Central", -37.81, 144.96),
+            "1": Stop("1", "Alpha Road", -37.82, 144.97),
+            "3": Stop("3", "CENTRAL", -37.83, 144.98),
+        }
+
+        index = StopIndex(parser)
+
+        assert [stop.stop_id for stop in index._stops_list] == ["2", "1", "3"]
+        assert index._normalized_names == ["central", "alpha road", "central"]
+        # Duplicate names resolve to the first stop listed
+        assert index.find_stop_exact("central").stop_id == "2"
+
 
 class TestFindStopExact:
     """Test exact stop name matching."""
@@ -134,6 +150,40 @@ class TestFindStopFuzzy:
         assert matches == []
 
 
+class TestFindStopPrefix:
+    """Test prefix stop name matching."""
+
+    @pytest.fixture
+    def stop_index(self, gtfs_dir):
+        """Create a StopIndex with test data."""
+        parser = GTFSParser(str(gtfs_dir))
+        parser.load_stops()
+        return StopIndex(parser)
+
+    def test_find_prefix_matches_in_name_order(self, stop_index):
+        """Test that all stops sharing the prefix are returned, sorted by name."""
+        stops = stop_index.find_stop_prefix("test st")
+
+        assert [stop.stop_id for stop in stops] == ["1001", "1002"]
+
+    def test_find_prefix_ignores_case_and_punctuation(self, stop_index):
+        """Test that the prefix is normalized like fuzzy queries."""
+        stops = stop_index.find_stop_prefix("FUZZY-test")
+
+        assert [stop.stop_id for stop in stops] == ["1003"]
+
+    def test_find_prefix_limit(self, stop_index):
+        """Test that results are capped at limit."""
+        stops = stop_index.find_stop_prefix("Test", limit=1)
+
+        assert [stop.stop_id for stop in stops] == ["1001"]
+
+    def test_find_prefix_no_match(self, stop_index):
+        """Test that a prefix of no name, or an empty prefix, finds nothing."""
+        assert stop_index.find_stop_prefix("Station") == []
+        assert stop_index.find_stop_prefix("  ") == []
+
+
 class TestFindStop:
     """Test combined find_stop method."""
 
@@ -159,6 +209,21 @@ class TestFindStop:
         assert stop is not None
         # Should find Test Station A via fuzzy matching
 
+    def test_find_unique_prefix(self, stop_index):
+        """Test that a prefix of only one stop name finds that stop."""
+        stop = stop_index.find_stop("fuzzy")
+
+        assert stop is not None
+        assert stop.stop_id == "1003"
+
+    def test_find_ambiguous_prefix_uses_fuzzy(self, stop_index, mocker):
+        """Test that a prefix shared by several stops falls back to fuzzy matching."""
+        fuzzy = mocker.spy(stop_index, 'find_stop_fuzzy')
+
+        stop_index.find_stop("Test Station")
+
+        assert fuzzy.call_count == 1
+
     def test_find_no_fuzzy(self, stop_index):
         """Test with fuzzy=False only does exact matching."""
         stop = stop_index.find_stop("Station A", fuzzy=False)
@@ -171,6 +236,17 @@ class TestFindStop:
 
         assert stop is None
 
+    def test_find_fuzzy_result_is_memoized(self, stop_index):
+        """Test that repeated fuzzy lookups reuse the first result."""
+        first = stop_index.find_stop("Station A")
+        again = stop_index.find_stop("Station A")
+        missing = stop_index.find_stop("Completely Different Station XYZ")
+        missing_again = stop_index.find_stop("Completely Different Station XYZ")
+
+        assert again is first
+        assert missing is None and missing_again is None
+        assert stop_index._best_fuzzy_match.cache_info().hits == 2
+
 
 class TestFindStopsByIds:
     """Test finding multiple stops by IDs."""
@@ -198,6 +274,12 @@ class TestFindStopsByIds:
         assert len(stops) == 2
         assert all(stop.stop_id in ["1001", "1002"] for stop in stops)
 
+    def test_find_preserves_request_order(self, stop_index):
+        """Test that stops come back in the order the IDs were given."""
+        stops = stop_index.find_stops_by_ids(["1003", "9999", "1001", "1003"])
+
+        assert [stop.stop_id for stop in stops] == ["1003", "1001", "1003"]
+
     def test_find_empty_list(self, stop_index):
         """Test finding stops with empty list."""
         stops = stop_index.find_stops_by_ids([])
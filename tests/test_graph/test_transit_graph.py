@@ -1,10 +1,13 @@
 """Tests for TransitGraph class."""
 
+import gc
+import numpy as np
 import pytest
 from pathlib import Path
 
-from src.graph.transit_graph import TransitGraph, Connection
+from src.graph.transit_graph import TransitGraph, Connection, StopCoordinates
 from src.data.gtfs_parser import GTFSParser
+from src.data.models import StopTime
 
 
 @pytest.fixture
@@ -94,6 +97,67 @@ class TestBuildFromParser:
         result = graph.build_from_parser(parser)
         assert result is graph
 
+    def test_build_restores_gc_state(self, parser):
+        """Test that the collector is paused only for the duration of a build."""
+        assert gc.isenabled()
+        TransitGraph(parser)
+        assert gc.isenabled()
+
+        gc.disable()
+        try:
+            TransitGraph(parser)
+            assert not gc.isenabled()
+        finally:
+            gc.enable()
+
+
+class TestTripTimeParsing:
+    """Tests for parsing trip stop times in bulk during the build."""
+
+    @staticmethod
+    def _graph_for(stop_times):
+        parser = GTFSParser.__new__(GTFSParser)
+        parser.stops = {}
+        parser.routes = {}
+        parser.trips = {}
+        parser.transfers = []
+        parser.stop_times = {"T1": stop_times}
+
+        graph = TransitGraph()
+        graph.parser = parser
+        graph._add_trip_connections()
+        return graph
+
+    def test_build_with_unpadded_times(self):
+        """Test that trips with unpadded times get correct travel times."""
+        graph = self._graph_for([
+            StopTime("T1", "1001", 1, "7:58:00", "7:59:30"),
+            StopTime("T1", "1002", 2, "08:04:00", "08:05:00"),
+        ])
+
+        conn = graph.connections[0]
+        assert conn.departure_sec == 7 * 3600 + 59 * 60 + 30
+        assert conn.travel_time_seconds == 270
+
+    def test_build_across_midnight(self):
+        """Test that trips running past 24:00:00 get positive travel times."""
+        graph = self._graph_for([
+            StopTime("T1", "1001", 1, "23:50:00", "23:55:00"),
+            StopTime("T1", "1002", 2, "24:15:00", "24:16:00"),
+            StopTime("T1", "1003", 3, "24:30:00", "24:30:00"),
+        ])
+
+        assert [conn.travel_time_seconds for conn in graph.connections] == [1200, 840]
+        assert graph.connections[1].departure_sec == 24 * 3600 + 16 * 60
+
+    def test_build_with_malformed_time_raises_error(self):
+        """Test that malformed GTFS times are still rejected."""
+        with pytest.raises(ValueError):
+            self._graph_for([
+                StopTime("T1", "1001", 1, "08:00:00", "08:00:00"),
+                StopTime("T1", "1002", 2, "08:0a:00", "08:06:00"),
+            ])
+
 
 class TestConnection:
     """Tests for Connection dataclass."""
@@ -130,6 +194,43 @@ class TestConnection:
         assert isinstance(conn.travel_time_seconds, int)
         assert conn.travel_time_seconds == 600
 
+    def test_connection_is_slotted(self):
+        """Test that connections carry no per-instance __dict__."""
+        conn = Connection(
+            from_stop_id="1001",
+            to_stop_id="1002",
+            trip_id="T1",
+            departure_time="08:00:00",
+            arrival_time="08:10:00",
+            travel_time_seconds=600,
+            route_id="R1",
+            route_type="2"
+        )
+
+        assert not hasattr(conn, "__dict__")
+        assert conn.route_type == 2
+        assert conn.get_mode_name() == "Regional Train"
+
+    def test_connection_times_in_seconds(self):
+        """Test that departure/arrival seconds are derived from the strings."""
+        conn = Connection(
+            from_stop_id="1001",
+            to_stop_id="1002",
+            trip_id="T1",
+            departure_time="24:55:00",
+            arrival_time="25:05:00",
+            travel_time_seconds=600,
+            route_id="R1"
+        )
+
+        assert conn.departure_sec == 24 * 3600 + 55 * 60
+        assert conn.arrival_sec == 25 * 3600 + 5 * 60
+
+    def test_graph_connections_have_seconds(self, graph):
+        """Test that built connections carry consistent int times."""
+        for conn in graph.connections:
+            assert conn.arrival_sec - conn.departure_sec == conn.travel_time_seconds
+
 
 class TestGetNeighbors:
     """Tests for get_neighbors method."""
@@ -230,6 +331,14 @@ class TestGetConnectionsFrom:
         connections = graph.get_connections_from("9999")
         assert connections == []
 
+    def test_iter_connections_from_matches_list(self, graph):
+        """Test that the iterator yields the same connections lazily."""
+        iterator = graph.iter_connections_from("1001")
+
+        assert not isinstance(iterator, list)
+        assert list(iterator) == graph.get_connections_from("1001")
+        assert list(graph.iter_connections_from("9999")) == []
+
 
 class TestGetConnectionsBetween:
     """Tests for get_connections_between method."""
@@ -251,6 +360,17 @@ class TestGetConnectionsBetween:
         connections = graph.get_connections_between("1001", "1003")
         assert connections == []
 
+    def test_index_preserves_order_and_follows_appends(self, graph):
+        """Test that indexed lookups match a scan, including after appends."""
+        expected = [c for c in graph.connections
+                    if c.from_stop_id == "1001" and c.to_stop_id == "1002"]
+        assert graph.get_connections_between("1001", "1002") == expected
+
+        extra = Connection("1001", "1002", "T9", "10:00:00", "10:05:00", 300, "R1")
+        graph.connections.append(extra)
+        assert graph.get_connections_between("1001", "1002") == expected + [extra]
+        assert graph.get_connections_from("1001")[-1] is extra
+
 
 class TestGetStats:
     """Tests for get_stats method."""
@@ -268,6 +388,22 @@ class TestGetStats:
         assert stats['num_connections'] > 0
         assert stats['avg_degree'] >= 0
 
+    def test_get_stats_tracks_graph_changes(self, graph):
+        """Test that cached stats follow later edges and connections."""
+        stats = graph.get_stats()
+        assert stats['avg_degree'] == (
+            sum(d for _, d in graph.graph.degree()) / graph.graph.number_of_nodes()
+        )
+
+        stats['num_stops'] = -1
+        graph._add_transfer_edge("1003", "1001", 60, 2)
+        graph.connections.append(graph.connections[0])
+        updated = graph.get_stats()
+
+        assert updated['num_stops'] == graph.graph.number_of_nodes()
+        assert updated['num_connections'] == graph.graph.number_of_edges()
+        assert updated['num_total_connections'] == len(graph.connections)
+
     def test_get_stats_empty_graph(self):
         """Test getting stats for empty graph."""
         graph = TransitGraph()
@@ -323,6 +459,16 @@ class TestCalculateTravelTime:
         travel_time = graph._calculate_travel_time("08:00:00", "08:00:45")
         assert travel_time == 45  # 45 seconds
 
+    def test_calculate_unpadded_hours(self, graph):
+        """Test that single-digit hours, which GTFS permits, are accepted."""
+        assert graph._calculate_travel_time("7:55:00", "08:05:00") == 600
+
+    @pytest.mark.parametrize("bad", ["08:00", "08:0a:00", "08-00-00", "1::0:0:0"])
+    def test_calculate_malformed_time_raises_error(self, graph, bad):
+        """Test that malformed times are rejected rather than misparsed."""
+        with pytest.raises(ValueError):
+            graph._calculate_travel_time(bad, "09:00:00")
+
 
 class TestEdgeUpdating:
     """Tests for edge updating with minimum travel time."""
@@ -334,8 +480,10 @@ class TestEdgeUpdating:
 
         # Add multiple connections between same stops with different times
         # Note: Graph already has edge from build, so we're updating
-        graph._add_or_update_edge("1001", "1002", 400, "R1", "T2")  # Faster
-        graph._add_or_update_edge("1001", "1002", 800, "R1", "T3")  # Slower
+        graph._add_connection_edges([
+            Connection("1001", "1002", "T2", "08:00:00", "08:06:40", 400, "R1"),  # Faster
+            Connection("1001", "1002", "T3", "08:00:00", "08:13:20", 800, "R1"),  # Slower
+        ])
 
         # Should keep minimum time (comparing with existing 120 from transfer)
         travel_time = graph.get_travel_time("1001", "1002")
@@ -347,11 +495,43 @@ class TestEdgeUpdating:
         graph.build_from_parser(parser)
 
         # Add connections from different routes
-        graph._add_or_update_edge("1001", "1002", 600, "R1", "T1")
-        graph._add_or_update_edge("1001", "1002", 600, "R2", "T2")
+        graph._add_connection_edges([
+            Connection("1001", "1002", "T1", "08:00:00", "08:10:00", 600, "R1"),
+            Connection("1001", "1002", "T2", "09:00:00", "09:10:00", 600, "R2"),
+        ])
 
         routes = graph.get_routes_between("1001", "1002")
-        assert "R1" in routes or "R2" in routes  # At least one route stored
+        assert routes == {"R1", "R2"}
+
+    def test_edge_update_in_place(self):
+        """Test that repeated updates mutate the existing edge attributes."""
+        graph = TransitGraph()
+        graph._add_connection_edges([
+            Connection("1001", "1002", "T1", "08:00:00", "08:10:00", 600, "R1")
+        ])
+        graph._add_connection_edges([
+            Connection("1001", "1002", "T2", "09:00:00", "09:05:00", 300, "R2")
+        ])
+
+        data = graph.graph["1001"]["1002"]
+        assert data['weight'] == 300
+        assert data['min_travel_time'] == 300
+        assert data['routes'] == {"R1", "R2"}
+        assert data['trips'] == {"T1", "T2"}
+
+    def test_connection_edges_deduplicated(self):
+        """Test that connections on the same stop pair collapse into one edge."""
+        graph = TransitGraph()
+        graph._add_connection_edges([
+            Connection("1001", "1002", "T1", "08:00:00", "08:10:00", 600, "R1"),
+            Connection("1001", "1002", "T2", "09:00:00", "09:05:00", 300, "R2"),
+            Connection("1002", "1003", "T1", "08:10:00", "08:20:00", 600, "R1"),
+        ])
+
+        assert graph.graph.number_of_edges() == 2
+        assert graph.get_travel_time("1001", "1002") == 300
+        assert graph.get_routes_between("1001", "1002") == {"R1", "R2"}
+        assert graph.graph["1001"]["1002"]["trips"] == {"T1", "T2"}
 
 
 class TestTransferEdges:
@@ -377,3 +557,215 @@ class TestTransferEdges:
         # This test verifies the method completes successfully
         # Actual transfer assertions depend on test fixture content
         assert isinstance(graph.graph.number_of_edges(), int)
+
+    def test_transfer_merges_into_trip_edge(self, graph):
+        """Test that the fixture transfer keeps the trip edge's routes and trips."""
+        data = graph.graph["1001"]["1002"]
+
+        assert not data.get('is_transfer')
+        assert data['is_transfer_also']
+        assert data['transfer_time'] == 120
+        assert data['weight'] == 120
+        assert data['routes'] == {"R1"}
+        assert "T1" in data['trips']
+
+    def test_slower_transfer_does_not_override_trip_time(self):
+        """Test that a slow transfer keeps the faster trip travel time."""
+        graph = TransitGraph()
+        graph._add_connection_edges([
+            Connection("1001", "1002", "T1", "08:00:00", "08:05:00", 300, "R1")
+        ])
+        graph._add_transfer_edge("1001", "1002", 600, "2")
+
+        assert graph.get_travel_time("1001", "1002") == 300
+        assert graph.graph["1001"]["1002"]['transfer_time'] == 600
+        assert graph.graph.number_of_edges() == 1
+
+    def test_transfer_without_trip_edge_is_walking_transfer(self):
+        """Test that a transfer between unconnected stops adds a transfer edge."""
+        graph = TransitGraph()
+        graph._add_transfer_edge("1001", "1003", 180, "2")
+
+        data = graph.graph["1001"]["1003"]
+        assert data['is_transfer']
+        assert 'is_transfer_also' not in data
+        assert data['weight'] == 180
+
+
+class TestAdjacency:
+    """Tests for the CSR adjacency view."""
+
+    def test_adjacency_matches_graph(self, graph):
+        """Test that every CSR row lists the stop's successors and weights."""
+        csr = graph.adjacency()
+
+        assert csr.stop_ids == list(graph.graph.nodes)
+        assert len(csr.neighbors) == graph.graph.number_of_edges()
+        for stop_id in csr.stop_ids:
+            neighbors, travel_times = csr.edges_from(csr.stop_idx[stop_id])
+            assert list(neighbors) == sorted(neighbors)
+            assert {csr.stop_ids[j]: int(t) for j, t in zip(neighbors, travel_times)} == {
+                v: graph.get_travel_time(stop_id, v) for v in graph.get_neighbors(stop_id)
+            }
+
+    def test_edge_travel_time(self, graph):
+        """Test single-edge lookups by binary search."""
+        csr = graph.adjacency()
+        a, b, c = (csr.stop_idx[s] for s in ("1001", "1002", "1003"))
+
+        assert csr.edge_travel_time(a, b) == graph.get_travel_time("1001", "1002")
+        assert csr.edge_travel_time(a, c) is None
+
+    def test_adjacency_rebuilt_after_update(self):
+        """Test that the cached view is refreshed when an edge changes."""
+        graph = TransitGraph()
+        graph._add_connection_edges([
+            Connection("1001", "1002", "T1", "08:00:00", "08:10:00", 600, "R1")
+        ])
+        csr = graph.adjacency()
+        assert graph.adjacency() is csr
+
+        graph._add_connection_edges([
+            Connection("1001", "1002", "T2", "09:00:00", "09:05:00", 300, "R2")
+        ])
+        updated = graph.adjacency()
+        assert updated is not csr
+        assert updated.edge_travel_time(updated.stop_idx["1001"], updated.stop_idx["1002"]) == 300
+
+
+class TestConnectionCodes:
+    """Tests for the int-coded connection columns."""
+
+    def test_codes_decode_to_connections(self, graph):
+        """Test that every column decodes back to its connection's values."""
+        codes = graph.connection_codes()
+
+        assert codes.from_stop.dtype == np.int32
+        assert codes.stop_ids[:graph.graph.number_of_nodes()] == list(graph.graph.nodes)
+        for i, conn in enumerate(graph.connections):
+            assert codes.stop_ids[codes.from_stop[i]] == conn.from_stop_id
+            assert codes.stop_ids[codes.to_stop[i]] == conn.to_stop_id
+            assert codes.trip_ids[codes.trip[i]] == conn.trip_id
+            assert codes.route_ids[codes.route[i]] == conn.route_id
+            assert codes.departure_sec[i] == conn.departure_sec
+            assert codes.arrival_sec[i] == conn.arrival_sec
+
+    def test_codes_cached_until_connections_change(self, graph):
+        """Test that codes are reused and rebuilt after an append."""
+        codes = graph.connection_codes()
+        assert graph.connection_codes() is codes
+
+        graph.connections.append(
+            Connection("1003", "1001", "T9", "10:00:00", "10:05:00", 300, "R9")
+        )
+        updated = graph.connection_codes()
+        assert updated is not codes
+        assert updated.route_ids[updated.route[-1]] == "R9"
+
+
+class TestStopCoordinates:
+    """Tests for the stop coordinate columns."""
+
+    def test_columns_follow_node_order(self, graph):
+        """Test that lat/lon columns match get_stop_info for every stop."""
+        coords = graph.stop_coordinates()
+
+        assert isinstance(coords, StopCoordinates)
+        assert coords.stop_ids == list(graph.graph.nodes)
+        assert coords.lat.dtype == np.float64
+        for stop_id, i in coords.stop_idx.items():
+            info = graph.get_stop_info(stop_id)
+            assert coords.lat[i] == info['lat']
+            assert coords.lon[i] == info['lon']
+
+    def test_cached_until_graph_changes(self, graph):
+        """Test that the columns are reused and rebuilt after edits."""
+        coords = graph.stop_coordinates()
+        assert graph.stop_coordinates() is coords
+
+        graph._add_connection_edges([
+            Connection("1003", "9000", "T9", "10:00:00", "10:01:00", 60, "R9")
+        ])
+        updated = graph.stop_coordinates()
+
+        assert updated is not coords
+        assert np.isnan(updated.lat[updated.stop_idx["9000"]])
+
+    def test_empty_graph(self):
+        """Test that an empty graph gives empty columns."""
+        coords = TransitGraph().stop_coordinates()
+
+        assert coords.stop_ids == []
+        assert coords.lat.shape == coords.lon.shape == (0,)
+
+
+class TestSnapshot:
+    """Tests for saving and loading graph snapshots."""
+
+    def test_save_and_load_roundtrip(self, graph, tmp_path):
+        """Test that a loaded snapshot matches the original graph."""
+        path = tmp_path / "graph.npz"
+        graph.save(path)
+
+        loaded = TransitGraph.load(path)
+
+        assert loaded.connections == graph.connections
+        assert loaded.get_stats() == graph.get_stats()
+        assert loaded.get_stop_info("1001") == graph.get_stop_info("1001")
+        assert loaded.get_travel_time("1001", "1002") == 120
+        assert loaded.get_travel_time("1002", "1003") == 600
+        assert loaded.get_routes_between("1002", "1003") == graph.get_routes_between("1002", "1003")
+
+    def test_save_and_load_roundtrip_transfers(self, graph, tmp_path):
+        """Test that merged and standalone transfers both survive a snapshot."""
+        graph._add_transfer_edge("1001", "1003", 180, "2")
+        path = tmp_path / "graph.npz"
+        graph.save(path)
+
+        loaded = TransitGraph.load(path)
+
+        assert loaded.graph["1001"]["1002"] == graph.graph["1001"]["1002"]
+        assert loaded.graph["1001"]["1002"]['is_transfer_also']
+        assert loaded.graph["1001"]["1003"] == graph.graph["1001"]["1003"]
+        assert loaded.graph["1001"]["1003"]['is_transfer']
+
+    def test_load_with_matching_parser_uses_snapshot(self, parser, tmp_path):
+        """Test that a fresh snapshot is loaded rather than rebuilt."""
+        path = tmp_path / "graph.npz"
+        TransitGraph(parser).save(path)
+        mtime = path.stat().st_mtime_ns
+
+        loaded = TransitGraph.load(path, parser)
+
+        assert loaded.parser is parser
+        assert path.stat().st_mtime_ns == mtime
+        assert loaded.has_connection("1001", "1002")
+
+    def test_load_stale_snapshot_rebuilds(self, gtfs_dir, tmp_path):
+        """Test that changed GTFS files invalidate the snapshot."""
+        feed_dir = tmp_path / "gtfs"
+        feed_dir.mkdir()
+        for file_path in gtfs_dir.glob("*.txt"):
+            (feed_dir / file_path.name).write_bytes(file_path.read_bytes())
+
+        path = tmp_path / "graph.npz"
+        parser = GTFSParser(str(feed_dir)).load_all()
+        TransitGraph(parser).save(path)
+
+        # Drop the transfer so a rebuilt graph differs from the snapshot
+        (feed_dir / "transfers.txt").write_text("from_stop_id,to_stop_id,transfer_type,min_transfer_time\n")
+        parser = GTFSParser(str(feed_dir)).load_all()
+
+        loaded = TransitGraph.load(path, parser)
+
+        assert loaded.get_travel_time("1001", "1002") == 600
+        assert TransitGraph.load(path).get_travel_time("1001", "1002") == 600
+
+    def test_load_creates_missing_snapshot(self, parser, tmp_path):
+        """Test that loading a missing snapshot builds and saves it."""
+        path = tmp_path / "graph.npz"
+
+        graph = TransitGraph.load(path, parser)
+
+        assert path.exists()
+        assert len(graph.connections) == 4
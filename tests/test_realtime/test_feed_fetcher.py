@@ -9,12 +9,60 @@ Tests cover:
 - API authentication
 """
 
+import io
 import pytest
 import requests
+import urllib3
 from google.transit import gtfs_realtime_pb2
 from src.realtime.feed_fetcher import GTFSRealtimeFetcher
 
 
+def _build_mock_feed():
+    """Build a GTFS Realtime feed with one trip update entity."""
+    feed = gtfs_realtime_pb2.FeedMessage()
+    feed.header.gtfs_realtime_version = "2.0"
+    feed.header.timestamp = 1234567890
+
+    # Add a test entity
+    entity = feed.entity.add()
+    entity.id = "test-entity-1"
+    trip_update = entity.trip_update
+    trip_update.trip.trip_id = "test-trip-123"
+    trip_update.trip.route_id = "test-route"
+
+    return feed
+
+
+def _build_empty_feed():
+    """Build a GTFS Realtime feed with only a header."""
+    feed = gtfs_realtime_pb2.FeedMessage()
+    feed.header.gtfs_realtime_version = "2.0"
+    return feed
+
+
+# Serialized once per module; tests only ever need the wire bytes
+_MOCK_FEED_BYTES = _build_mock_feed().SerializeToString()
+_EMPTY_FEED_BYTES = _build_empty_feed().SerializeToString()
+
+
+@pytest.fixture(scope="module")
+def fetcher():
+    """Create a fetcher instance shared by this module's tests."""
+    return GTFSRealtimeFetcher(api_key="test-api-key")
+
+
+@pytest.fixture(scope="module")
+def mock_feed_bytes():
+    """Serialized feed with one trip update entity."""
+    return _MOCK_FEED_BYTES
+
+
+@pytest.fixture(scope="module")
+def empty_feed_bytes():
+    """Serialized feed with only a header."""
+    return _EMPTY_FEED_BYTES
+
+
 class TestGTFSRealtimeFetcherInit:
     """Test GTFSRealtimeFetcher initialization."""
 
@@ -43,31 +91,10 @@ class TestGTFSRealtimeFetcherInit:
 class TestFetchFeed:
     """Test feed fetching functionality."""
 
-    @pytest.fixture
-    def fetcher(self):
-        """Create a fetcher instance for testing."""
-        return GTFSRealtimeFetcher(api_key="test-api-key")
-
-    @pytest.fixture
-    def mock_feed(self):
-        """Create a mock GTFS Realtime feed."""
-        feed = gtfs_realtime_pb2.FeedMessage()
-        feed.header.gtfs_realtime_version = "2.0"
-        feed.header.timestamp = 1234567890
-
-        # Add a test entity
-        entity = feed.entity.add()
-        entity.id = "test-entity-1"
-        trip_update = entity.trip_update
-        trip_update.trip.trip_id = "test-trip-123"
-        trip_update.trip.route_id = "test-route"
-
-        return feed
-
-    def test_fetch_feed_success(self, fetcher, mock_feed, requests_mock):
+    def test_fetch_feed_success(self, fetcher, mock_feed_bytes, requests_mock):
         """Test successful feed fetch."""
         url = "https://test.example.com/feed"
-        requests_mock.get(url, content=mock_feed.SerializeToString())
+        requests_mock.get(url, content=mock_feed_bytes)
 
         result = fetcher.fetch_feed(url)
 
@@ -76,15 +103,63 @@ class TestFetchFeed:
         assert len(result.entity) == 1
         assert result.entity[0].id == "test-entity-1"
 
-    def test_fetch_feed_with_correct_headers(self, fetcher, mock_feed, requests_mock):
+    def test_fetch_feed_streamed_body(self, fetcher, mock_feed_bytes, requests_mock):
+        """Test parsing a body that is read from a stream, not preloaded."""
+        url = "https://test.example.com/feed"
+        requests_mock.get(url, body=io.BytesIO(mock_feed_bytes))
+
+        result = fetcher.fetch_feed(url)
+
+        assert result.SerializeToString() == mock_feed_bytes
+
+    def test_fetch_feed_truncated_stream(self, fetcher, mock_feed_bytes, requests_mock):
+        """Test that a connection dropped mid-body raises a RequestException."""
+        class TruncatedBody(io.RawIOBase):
+            """Returns the first bytes of the feed, then fails like a dropped connection."""
+
+            def __init__(self):
+                super().__init__()
+                self.sent = False
+
+            def readable(self):
+                return True
+
+            def readinto(self, buffer):
+                if self.sent:
+                    raise urllib3.exceptions.ProtocolError("Connection broken: IncompleteRead")
+                self.sent = True
+                buffer[:10] = mock_feed_bytes[:10]
+                return 10
+
+        url = "https://test.example.com/feed"
+        body = TruncatedBody()
+        requests_mock.get(url, body=body)
+
+        with pytest.raises(requests.exceptions.RequestException):
+            fetcher.fetch_feed(url)
+        assert body.closed
+
+    def test_fetch_feed_with_correct_headers(self, fetcher, mock_feed_bytes, requests_mock):
         """Test that fetch sends correct authentication headers."""
         url = "https://test.example.com/feed"
-        adapter = requests_mock.get(url, content=mock_feed.SerializeToString())
+        adapter = requests_mock.get(url, content=mock_feed_bytes)
 
         fetcher.fetch_feed(url)
 
         assert adapter.last_request.headers['KeyID'] == "test-api-key"
 
+    def test_fetch_feed_reuses_session(self, fetcher, mock_feed_bytes, requests_mock):
+        """Test that repeated fetches go through one pooled session."""
+        url = "https://test.example.com/feed"
+        adapter = requests_mock.get(url, content=mock_feed_bytes)
+        session = fetcher._session
+
+        fetcher.fetch_feed(url)
+        fetcher.fetch_feed(url)
+
+        assert fetcher._session is session
+        assert adapter.call_count == 2
+
     def test_fetch_feed_http_error(self, fetcher, requests_mock):
         """Test handling of HTTP errors."""
         url = "https://test.example.com/feed"
@@ -93,6 +168,17 @@ class TestFetchFeed:
         with pytest.raises(requests.exceptions.HTTPError):
             fetcher.fetch_feed(url)
 
+    def test_fetch_feed_http_error_logs_body(self, fetcher, requests_mock, caplog):
+        """Test that a streamed error body is still logged after the response closes."""
+        url = "https://test.example.com/feed"
+        requests_mock.get(url, status_code=500, body=io.BytesIO(b"Internal failure details"))
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            fetcher.fetch_feed(url)
+
+        assert "Status code: 500" in caplog.text
+        assert "Response: Internal failure details" in caplog.text
+
     def test_fetch_feed_timeout(self, fetcher, requests_mock):
         """Test handling of timeout errors."""
         url = "https://test.example.com/feed"
@@ -117,6 +203,14 @@ class TestFetchFeed:
         with pytest.raises(ValueError, match="Invalid protobuf data"):
             fetcher.fetch_feed(url)
 
+    def test_fetch_feed_truncated_protobuf(self, fetcher, mock_feed_bytes, requests_mock):
+        """Test that a feed cut off mid-message is reported as invalid."""
+        url = "https://test.example.com/feed"
+        requests_mock.get(url, content=mock_feed_bytes[:-3])
+
+        with pytest.raises(ValueError, match="Invalid protobuf data"):
+            fetcher.fetch_feed(url)
+
     def test_fetch_feed_empty_response(self, fetcher, requests_mock):
         """Test handling of empty response - creates empty valid feed."""
         url = "https://test.example.com/feed"
@@ -128,116 +222,106 @@ class TestFetchFeed:
         assert len(result.entity) == 0
 
 
-class TestFetchTripUpdates:
-    """Test trip updates fetching."""
+class TestConditionalFetch:
+    """Test ETag / Last-Modified revalidation of unchanged feeds."""
+
+    URL = "https://test.example.com/feed"
 
     @pytest.fixture
     def fetcher(self):
-        """Create a fetcher instance for testing."""
+        """Create a fresh fetcher so cached feeds don't leak between tests."""
         return GTFSRealtimeFetcher(api_key="test-api-key")
 
-    @pytest.fixture
-    def mock_feed(self):
-        """Create a mock feed."""
-        feed = gtfs_realtime_pb2.FeedMessage()
-        feed.header.gtfs_realtime_version = "2.0"
-        return feed
+    def test_not_modified_returns_cached_feed(self, fetcher, mock_feed_bytes, requests_mock):
+        """Test that a 304 reply reuses the previously downloaded feed."""
+        requests_mock.get(self.URL, content=mock_feed_bytes, headers={'ETag': '"v1"'})
+        first = fetcher.fetch_feed(self.URL)
 
-    def test_fetch_trip_updates_metro(self, fetcher, mock_feed, requests_mock):
-        """Test fetching metro trip updates."""
-        expected_url = GTFSRealtimeFetcher.FEED_URLS['metro']['trip_updates']
-        requests_mock.get(expected_url, content=mock_feed.SerializeToString())
+        adapter = requests_mock.get(self.URL, status_code=304)
+        second = fetcher.fetch_feed(self.URL)
 
-        result = fetcher.fetch_trip_updates('metro')
+        assert second == first
+        assert second.SerializeToString() == mock_feed_bytes
+        assert adapter.last_request.headers['If-None-Match'] == '"v1"'
+        assert adapter.last_request.headers['KeyID'] == "test-api-key"
 
-        assert isinstance(result, gtfs_realtime_pb2.FeedMessage)
-        assert requests_mock.last_request.url == expected_url
+        # The validator is kept even though the 304 reply didn't repeat it
+        fetcher.fetch_feed(self.URL)
+        assert adapter.last_request.headers['If-None-Match'] == '"v1"'
 
-    def test_fetch_trip_updates_vline(self, fetcher, mock_feed, requests_mock):
-        """Test fetching V/Line trip updates."""
-        expected_url = GTFSRealtimeFetcher.FEED_URLS['vline']['trip_updates']
-        requests_mock.get(expected_url, content=mock_feed.SerializeToString())
+    def test_not_modified_feed_is_not_shared(self, fetcher, mock_feed_bytes, requests_mock):
+        """Test that modifying a returned feed doesn't affect later fetches."""
+        requests_mock.get(self.URL, content=mock_feed_bytes, headers={'ETag': '"v1"'})
+        first = fetcher.fetch_feed(self.URL)
+        first.entity.add(id="injected")
 
-        result = fetcher.fetch_trip_updates('vline')
+        requests_mock.get(self.URL, status_code=304)
+        second = fetcher.fetch_feed(self.URL)
+        second.ClearField('entity')
 
-        assert isinstance(result, gtfs_realtime_pb2.FeedMessage)
-        assert requests_mock.last_request.url == expected_url
+        assert fetcher.fetch_feed(self.URL).SerializeToString() == mock_feed_bytes
 
-    def test_fetch_trip_updates_invalid_mode(self, fetcher):
-        """Test error on invalid transport mode."""
-        with pytest.raises(ValueError, match="Unknown mode: invalid"):
-            fetcher.fetch_trip_updates('invalid')
+    def test_not_modified_without_cache_raises_error(self, fetcher, requests_mock):
+        """Test that an unrequested 304 reply isn't parsed as an empty feed."""
+        requests_mock.get(self.URL, status_code=304)
 
+        with pytest.raises(requests.exceptions.HTTPError, match="304"):
+            fetcher.fetch_feed(self.URL)
 
-class TestFetchVehiclePositions:
-    """Test vehicle positions fetching."""
+    def test_changed_feed_replaces_cache(self, fetcher, mock_feed_bytes,
+                                         empty_feed_bytes, requests_mock):
+        """Test that a fresh 200 reply is parsed and its validator stored."""
+        modified = "Wed, 21 Oct 2026 07:28:00 GMT"
+        requests_mock.get(self.URL, content=mock_feed_bytes, headers={'ETag': '"v1"'})
+        fetcher.fetch_feed(self.URL)
 
-    @pytest.fixture
-    def fetcher(self):
-        """Create a fetcher instance for testing."""
-        return GTFSRealtimeFetcher(api_key="test-api-key")
+        requests_mock.get(self.URL, content=empty_feed_bytes, headers={'Last-Modified': modified})
+        second = fetcher.fetch_feed(self.URL)
+        assert len(second.entity) == 0
 
-    @pytest.fixture
-    def mock_feed(self):
-        """Create a mock feed."""
-        feed = gtfs_realtime_pb2.FeedMessage()
-        feed.header.gtfs_realtime_version = "2.0"
-        return feed
+        adapter = requests_mock.get(self.URL, status_code=304)
+        assert fetcher.fetch_feed(self.URL) == second
+        assert adapter.last_request.headers['If-Modified-Since'] == modified
+        assert 'If-None-Match' not in adapter.last_request.headers
 
-    def test_fetch_vehicle_positions_metro(self, fetcher, mock_feed, requests_mock):
-        """Test fetching metro vehicle positions."""
-        expected_url = GTFSRealtimeFetcher.FEED_URLS['metro']['vehicle_positions']
-        requests_mock.get(expected_url, content=mock_feed.SerializeToString())
+    def test_untagged_feed_is_not_conditional(self, fetcher, mock_feed_bytes, requests_mock):
+        """Test that feeds without validators are always fetched in full."""
+        adapter = requests_mock.get(self.URL, content=mock_feed_bytes)
 
-        result = fetcher.fetch_vehicle_positions('metro')
+        fetcher.fetch_feed(self.URL)
+        fetcher.fetch_feed(self.URL)
 
-        assert isinstance(result, gtfs_realtime_pb2.FeedMessage)
-        assert requests_mock.last_request.url == expected_url
-
-    def test_fetch_vehicle_positions_invalid_mode(self, fetcher):
-        """Test error on invalid transport mode."""
-        with pytest.raises(ValueError, match="Unknown mode"):
-            fetcher.fetch_vehicle_positions('bus')
+        assert 'If-None-Match' not in adapter.last_request.headers
+        assert fetcher._feed_cache == {}
 
 
-class TestFetchServiceAlerts:
-    """Test service alerts fetching."""
+FEED_TYPES = ("trip_updates", "vehicle_positions", "service_alerts")
 
-    @pytest.fixture
-    def fetcher(self):
-        """Create a fetcher instance for testing."""
-        return GTFSRealtimeFetcher(api_key="test-api-key")
 
-    @pytest.fixture
-    def mock_feed(self):
-        """Create a mock feed."""
-        feed = gtfs_realtime_pb2.FeedMessage()
-        feed.header.gtfs_realtime_version = "2.0"
-        return feed
+class TestFetchByMode:
+    """Test the per-mode trip update, vehicle position and alert fetchers."""
 
-    def test_fetch_service_alerts_metro(self, fetcher, mock_feed, requests_mock):
-        """Test fetching metro service alerts."""
-        expected_url = GTFSRealtimeFetcher.FEED_URLS['metro']['service_alerts']
-        requests_mock.get(expected_url, content=mock_feed.SerializeToString())
+    @pytest.mark.parametrize("mode", ["metro", "vline"])
+    @pytest.mark.parametrize("feed_type", FEED_TYPES)
+    def test_fetch_uses_mode_url(self, fetcher, empty_feed_bytes, requests_mock, mode, feed_type):
+        """Test that each fetcher requests the configured URL for its mode."""
+        expected_url = GTFSRealtimeFetcher.FEED_URLS[mode][feed_type]
+        requests_mock.get(expected_url, content=empty_feed_bytes)
 
-        result = fetcher.fetch_service_alerts('metro')
+        result = getattr(fetcher, f"fetch_{feed_type}")(mode)
 
         assert isinstance(result, gtfs_realtime_pb2.FeedMessage)
         assert requests_mock.last_request.url == expected_url
 
-    def test_fetch_service_alerts_vline(self, fetcher, mock_feed, requests_mock):
-        """Test fetching V/Line service alerts."""
-        expected_url = GTFSRealtimeFetcher.FEED_URLS['vline']['service_alerts']
-        requests_mock.get(expected_url, content=mock_feed.SerializeToString())
-
-        result = fetcher.fetch_service_alerts('vline')
-
-        assert isinstance(result, gtfs_realtime_pb2.FeedMessage)
-
-    def test_fetch_service_alerts_invalid_mode(self, fetcher):
+    @pytest.mark.parametrize("feed_type, mode", [
+        ("trip_updates", "invalid"),
+        ("vehicle_positions", "bus"),
+        ("service_alerts", "tram"),
+    ])
+    def test_fetch_invalid_mode(self, fetcher, feed_type, mode):
         """Test error on invalid transport mode."""
-        with pytest.raises(ValueError, match="Unknown mode"):
-            fetcher.fetch_service_alerts('tram')
+        with pytest.raises(ValueError, match=f"Unknown mode: {mode}"):
+            getattr(fetcher, f"fetch_{feed_type}")(mode)
 
 
 class TestFeedURLs:
@@ -265,3 +349,15 @@ class TestFeedURLs:
                 assert 'api.opendata.transport.vic.gov.au' in url
                 assert mode in url or 'metro' in url or 'vline' in url
                 assert feed_type.replace('_', '-') in url
+
+    def test_flat_urls_match_feed_urls(self):
+        """Test that the flat lookup table mirrors FEED_URLS exactly."""
+        urls = GTFSRealtimeFetcher.FEED_URLS
+        flat = GTFSRealtimeFetcher._FLAT_URLS
+
+        assert flat == {
+            (mode, feed_type): url
+            for mode, feeds in urls.items()
+            for feed_type, url in feeds.items()
+        }
+        assert len(flat) == 6
@@ -6,7 +6,7 @@ to scheduled journeys.
 """
 
 import pytest
-from unittest.mock import Mock, MagicMock
+from unittest.mock import Mock
 from google.transit import gtfs_realtime_pb2
 
 from src.realtime.integration import (
@@ -40,6 +40,13 @@ class TestStopUpdate:
         assert update.arrival_delay_seconds == 0
         assert update.platform_name is None
 
+    def test_stop_update_is_immutable(self):
+        """Test stop updates are slotted and frozen."""
+        update = StopUpdate(stop_id="STOP1", stop_sequence=1)
+        assert not hasattr(update, "__dict__")
+        with pytest.raises(AttributeError):
+            update.departure_delay_seconds = 60
+
 
 class TestTripUpdateInfo:
     """Test TripUpdateInfo dataclass."""
@@ -69,6 +76,14 @@ class TestTripUpdateInfo:
         assert len(info.stop_updates) == 2
         assert info.stop_updates["STOP1"].departure_delay_seconds == 120
 
+    def test_trip_update_info_is_slotted(self):
+        """Test trip update info has no per-instance __dict__ but stays mutable."""
+        info = TripUpdateInfo(trip_id="TRIP1", route_id="ROUTE1")
+        assert not hasattr(info, "__dict__")
+
+        info.alerts.append("Buses replace trains")
+        assert info.alerts == ["Buses replace trains"]
+
 
 class TestRealtimeIntegratorInit:
     """Test RealtimeIntegrator initialization."""
@@ -88,8 +103,19 @@ class TestRealtimeIntegratorInit:
 class TestApplyDelaysToLeg:
     """Test applying delays to individual journey legs."""
 
-    def test_apply_positive_delay(self):
-        """Test applying positive delay (late arrival)."""
+    @pytest.mark.parametrize(
+        "departure_delay, arrival_delay, expected_departure, expected_arrival",
+        [
+            (300, 420, "14:05:00", "14:37:00"),     # late
+            (-120, -180, "13:58:00", "14:27:00"),   # early
+            (0, 0, "14:00:00", "14:30:00"),         # on time
+            (3600, 3600, "15:00:00", "15:30:00"),   # over an hour late
+            (300, None, "14:05:00", "14:30:00"),    # no data for STOP2
+        ]
+    )
+    def test_apply_delays(self, departure_delay, arrival_delay,
+                          expected_departure, expected_arrival):
+        """Test that stop delays shift the leg's actual times."""
         leg = Leg(
             from_stop_id="STOP1",
             from_stop_name="Stop 1",
@@ -101,81 +127,56 @@ class TestApplyDelaysToLeg:
             route_id="ROUTE1"
         )
 
-        trip_info = TripUpdateInfo(
-            trip_id="TRIP1",
-            route_id="ROUTE1",
-            stop_updates={
-                "STOP1": StopUpdate("STOP1", 1, departure_delay_seconds=300),  # 5 min late
-                "STOP2": StopUpdate("STOP2", 2, arrival_delay_seconds=420)      # 7 min late
-            }
-        )
+        stop_updates = {
+            "STOP1": StopUpdate("STOP1", 1, departure_delay_seconds=departure_delay)
+        }
+        if arrival_delay is not None:
+            stop_updates["STOP2"] = StopUpdate("STOP2", 2, arrival_delay_seconds=arrival_delay)
+        trip_info = TripUpdateInfo(trip_id="TRIP1", route_id="ROUTE1", stop_updates=stop_updates)
 
-        integrator = RealtimeIntegrator(fetcher=Mock())
+        integrator = RealtimeIntegrator()
         integrator._apply_delays_to_leg(leg, trip_info)
 
         assert leg.has_realtime_data
         assert leg.scheduled_departure_time == "14:00:00"
-        assert leg.actual_departure_time == "14:05:00"  # 14:00 + 5 min
         assert leg.scheduled_arrival_time == "14:30:00"
-        assert leg.actual_arrival_time == "14:37:00"  # 14:30 + 7 min
-        assert leg.departure_delay_seconds == 300
-        assert leg.arrival_delay_seconds == 420
-
-    def test_apply_negative_delay(self):
-        """Test applying negative delay (early arrival)."""
+        assert leg.actual_departure_time == expected_departure
+        assert leg.actual_arrival_time == expected_arrival
+        assert leg.departure_delay_seconds == departure_delay
+        assert leg.arrival_delay_seconds == (arrival_delay or 0)
+
+    @pytest.mark.parametrize(
+        "departure, delay, expected_time, expected_sec",
+        [
+            ("24:10:00", 60, "00:11:00", 87060),     # GTFS time past midnight
+            ("23:59:30", 60, "00:00:30", 86430),     # delay rolls over midnight
+            ("24:00:30", -60, "23:59:30", 86370),    # early rolls back before it
+        ]
+    )
+    def test_apply_delays_around_midnight(self, departure, delay, expected_time, expected_sec):
+        """Test that displayed times wrap at midnight while the seconds don't."""
         leg = Leg(
             from_stop_id="STOP1",
             from_stop_name="Stop 1",
             to_stop_id="STOP2",
             to_stop_name="Stop 2",
-            departure_time="14:00:00",
-            arrival_time="14:30:00",
+            departure_time=departure,
+            arrival_time="24:30:00",
             trip_id="TRIP1",
             route_id="ROUTE1"
         )
-
         trip_info = TripUpdateInfo(
             trip_id="TRIP1",
             route_id="ROUTE1",
-            stop_updates={
-                "STOP1": StopUpdate("STOP1", 1, departure_delay_seconds=-120),  # 2 min early
-                "STOP2": StopUpdate("STOP2", 2, arrival_delay_seconds=-180)     # 3 min early
-            }
+            stop_updates={"STOP1": StopUpdate("STOP1", 1, departure_delay_seconds=delay)}
         )
 
-        integrator = RealtimeIntegrator(fetcher=Mock())
-        integrator._apply_delays_to_leg(leg, trip_info)
-
-        assert leg.actual_departure_time == "13:58:00"  # 14:00 - 2 min
-        assert leg.actual_arrival_time == "14:27:00"  # 14:30 - 3 min
-
-    def test_apply_zero_delay(self):
-        """Test applying zero delay (on time)."""
-        leg = Leg(
-            from_stop_id="STOP1",
-            from_stop_name="Stop 1",
-            to_stop_id="STOP2",
-            to_stop_name="Stop 2",
-            departure_time="14:00:00",
-            arrival_time="14:30:00",
-            trip_id="TRIP1",
-            route_id="ROUTE1"
-        )
-
-        trip_info = TripUpdateInfo(
-            trip_id="TRIP1",
-            route_id="ROUTE1",
-            stop_updates={
-                "STOP1": StopUpdate("STOP1", 1, departure_delay_seconds=0),
-                "STOP2": StopUpdate("STOP2", 2, arrival_delay_seconds=0)
-            }
-        )
-
-        integrator = RealtimeIntegrator(fetcher=Mock())
+        integrator = RealtimeIntegrator()
         integrator._apply_delays_to_leg(leg, trip_info)
 
-        assert leg.actual_departure_time == "14:00:00"
-        assert leg.actual_arrival_time == "14:30:00"
+        assert leg.scheduled_departure_time == departure
+        assert leg.actual_departure_time == expected_time
+        assert leg._actual_departure_sec == expected_sec
 
     def test_cancelled_trip(self):
         """Test cancelled trip."""
@@ -196,7 +197,7 @@ class TestApplyDelaysToLeg:
             is_cancelled=True
         )
 
-        integrator = RealtimeIntegrator(fetcher=Mock())
+        integrator = RealtimeIntegrator()
         integrator._apply_delays_to_leg(leg, trip_info)
 
         assert leg.is_cancelled
@@ -223,7 +224,7 @@ class TestApplyDelaysToLeg:
             }
         )
 
-        integrator = RealtimeIntegrator(fetcher=Mock())
+        integrator = RealtimeIntegrator()
         integrator._apply_delays_to_leg(leg, trip_info)
 
         # No changes should be made
@@ -272,7 +273,7 @@ class TestTransferValidation:
             legs=[leg1, leg2]
         )
 
-        integrator = RealtimeIntegrator(fetcher=Mock())
+        integrator = RealtimeIntegrator()
         is_valid, reason = integrator._validate_transfers(journey, min_transfer_time_seconds=120)
 
         assert is_valid
@@ -316,13 +317,111 @@ class TestTransferValidation:
             legs=[leg1, leg2]
         )
 
-        integrator = RealtimeIntegrator(fetcher=Mock())
+        integrator = RealtimeIntegrator()
         is_valid, reason = integrator._validate_transfers(journey, min_transfer_time_seconds=120)
 
         assert not is_valid
         assert "Stop B" in reason
         assert "no longer feasible" in reason
 
+    def test_transfer_across_midnight(self):
+        """Test delayed arrival past midnight is compared against GTFS 24:xx times."""
+        leg1 = Leg(
+            from_stop_id="A",
+            from_stop_name="Stop A",
+            to_stop_id="B",
+            to_stop_name="Stop B",
+            departure_time="23:30:00",
+            arrival_time="23:55:00",
+            trip_id="TRIP1",
+            route_id="ROUTE1"
+        )
+
+        leg2 = Leg(
+            from_stop_id="B",
+            from_stop_name="Stop B",
+            to_stop_id="C",
+            to_stop_name="Stop C",
+            departure_time="24:10:00",
+            arrival_time="24:40:00",
+            trip_id="TRIP2",
+            route_id="ROUTE2"
+        )
+
+        trip_info = TripUpdateInfo(
+            trip_id="TRIP1",
+            route_id="ROUTE1",
+            stop_updates={"B": StopUpdate("B", 2, arrival_delay_seconds=600)}  # 10 min late
+        )
+
+        journey = Journey(
+            origin_stop_id="A",
+            origin_stop_name="Stop A",
+            destination_stop_id="C",
+            destination_stop_name="Stop C",
+            departure_time="23:30:00",
+            arrival_time="24:40:00",
+            legs=[leg1, leg2]
+        )
+
+        integrator = RealtimeIntegrator()
+        integrator._apply_delays_to_leg(leg1, trip_info)
+        assert leg1.actual_arrival_time == "00:05:00"
+
+        is_valid, reason = integrator._validate_transfers(journey, min_transfer_time_seconds=120)
+
+        assert is_valid
+        assert reason is None
+
+    @pytest.mark.parametrize("arrival, actual_arrival, departure, actual_departure, expected", [
+        # 14 min late arrival string wraps to 00:09, 1 min before a 24:10 departure
+        ("23:55:00", "00:09:00", "24:10:00", None, False),
+        # Departure string wraps to 00:10, 5 min after an on-time 24:05 arrival
+        ("24:05:00", None, "24:10:00", "00:10:00", True),
+    ])
+    def test_transfer_across_midnight_from_time_strings(
+        self, arrival, actual_arrival, departure, actual_departure, expected
+    ):
+        """Test wrapped realtime strings are compared on the scheduled times' day."""
+        leg1 = Leg(
+            from_stop_id="A",
+            from_stop_name="Stop A",
+            to_stop_id="B",
+            to_stop_name="Stop B",
+            departure_time="23:30:00",
+            arrival_time=arrival,
+            trip_id="TRIP1",
+            route_id="ROUTE1",
+            actual_arrival_time=actual_arrival
+        )
+
+        leg2 = Leg(
+            from_stop_id="B",
+            from_stop_name="Stop B",
+            to_stop_id="C",
+            to_stop_name="Stop C",
+            departure_time=departure,
+            arrival_time="24:40:00",
+            trip_id="TRIP2",
+            route_id="ROUTE2",
+            actual_departure_time=actual_departure
+        )
+
+        journey = Journey(
+            origin_stop_id="A",
+            origin_stop_name="Stop A",
+            destination_stop_id="C",
+            destination_stop_name="Stop C",
+            departure_time="23:30:00",
+            arrival_time="24:40:00",
+            legs=[leg1, leg2]
+        )
+
+        integrator = RealtimeIntegrator()
+        is_valid, _ = integrator._validate_transfers(journey, min_transfer_time_seconds=120)
+
+        assert is_valid is expected
+
     def test_no_transfers(self):
         """Test journey with no transfers."""
         leg = Leg(
@@ -346,7 +445,7 @@ class TestTransferValidation:
             legs=[leg]
         )
 
-        integrator = RealtimeIntegrator(fetcher=Mock())
+        integrator = RealtimeIntegrator()
         is_valid, reason = integrator._validate_transfers(journey, min_transfer_time_seconds=120)
 
         assert is_valid
@@ -426,6 +525,82 @@ class TestApplyRealtimeToJourney:
         assert "cancelled" in journey.invalidity_reason.lower()
 
 
+class TestApplyRealtimeToJourneys:
+    """Test batch realtime integration across several journeys."""
+
+    @staticmethod
+    def _journey(trip_id):
+        leg = Leg(
+            from_stop_id="A",
+            from_stop_name="Stop A",
+            to_stop_id="B",
+            to_stop_name="Stop B",
+            departure_time="14:00:00",
+            arrival_time="14:30:00",
+            trip_id=trip_id,
+            route_id="ROUTE1"
+        )
+        return Journey(
+            origin_stop_id="A",
+            origin_stop_name="Stop A",
+            destination_stop_id="B",
+            destination_stop_name="Stop B",
+            departure_time="14:00:00",
+            arrival_time="14:30:00",
+            legs=[leg]
+        )
+
+    def test_fetches_feed_once(self):
+        """Test that one feed fetch is shared by all journeys."""
+        feed = gtfs_realtime_pb2.FeedMessage()
+        for trip_id in ("TRIP1", "TRIP3"):
+            entity = feed.entity.add()
+            entity.id = trip_id
+            entity.trip_update.trip.trip_id = trip_id
+            stu = entity.trip_update.stop_time_update.add()
+            stu.stop_id = "A"
+            stu.departure.delay = 300
+
+        mock_fetcher = Mock()
+        mock_fetcher.fetch_trip_updates.return_value = feed
+
+        journeys = [self._journey("TRIP1"), self._journey("TRIP2")]
+        integrator = RealtimeIntegrator(fetcher=mock_fetcher)
+        result = integrator.apply_realtime_to_journeys(journeys)
+
+        assert result is journeys
+        mock_fetcher.fetch_trip_updates.assert_called_once_with(mode='vline')
+        assert journeys[0].has_realtime_data
+        assert journeys[0].actual_departure_time == "14:05:00"
+        assert journeys[0].total_delay_seconds == 300
+        assert not journeys[1].has_realtime_data
+
+    def test_fetch_failure_returns_journeys_unchanged(self):
+        """Test graceful fallback when the feed cannot be fetched."""
+        mock_fetcher = Mock()
+        mock_fetcher.fetch_trip_updates.side_effect = Exception("API Error")
+
+        journeys = [self._journey("TRIP1")]
+        integrator = RealtimeIntegrator(fetcher=mock_fetcher)
+        result = integrator.apply_realtime_to_journeys(journeys)
+
+        assert result is journeys
+        assert not journeys[0].has_realtime_data
+
+    def test_parse_filters_to_wanted_trips(self):
+        """Test that trips outside the wanted set are skipped."""
+        feed = gtfs_realtime_pb2.FeedMessage()
+        for trip_id in ("TRIP1", "TRIP2"):
+            entity = feed.entity.add()
+            entity.id = trip_id
+            entity.trip_update.trip.trip_id = trip_id
+
+        integrator = RealtimeIntegrator()
+        result = integrator._parse_trip_updates(feed, {"TRIP2"})
+
+        assert list(result) == ["TRIP2"]
+
+
 class TestParseTripUpdates:
     """Test parsing GTFS Realtime feed."""
 
@@ -433,7 +608,7 @@ class TestParseTripUpdates:
         """Test parsing feed with no entities."""
         feed = gtfs_realtime_pb2.FeedMessage()
 
-        integrator = RealtimeIntegrator(fetcher=Mock())
+        integrator = RealtimeIntegrator()
         result = integrator._parse_trip_updates(feed)
 
         assert len(result) == 0
@@ -455,7 +630,7 @@ class TestParseTripUpdates:
         stu.stop_sequence = 1
         stu.departure.delay = 300  # 5 min delay
 
-        integrator = RealtimeIntegrator(fetcher=Mock())
+        integrator = RealtimeIntegrator()
         result = integrator._parse_trip_updates(feed)
 
         assert len(result) == 1
@@ -466,62 +641,46 @@ class TestParseTripUpdates:
         assert len(result["TRIP1"].stop_updates) == 1
         assert result["TRIP1"].stop_updates["STOP1"].departure_delay_seconds == 300
 
+    def test_parse_unset_fields_use_defaults(self):
+        """Test that absent optional fields parse as zero delays and no route."""
+        feed = gtfs_realtime_pb2.FeedMessage()
 
-class TestEdgeCases:
-    """Test edge cases and error handling."""
-
-    def test_large_delay(self):
-        """Test very large delay (over 1 hour)."""
-        leg = Leg(
-            from_stop_id="STOP1",
-            from_stop_name="Stop 1",
-            to_stop_id="STOP2",
-            to_stop_name="Stop 2",
-            departure_time="14:00:00",
-            arrival_time="14:30:00",
-            trip_id="TRIP1",
-            route_id="ROUTE1"
+        entity = feed.entity.add()
+        entity.id = "entity1"
+        entity.trip_update.trip.trip_id = "TRIP1"
+        entity.trip_update.trip.schedule_relationship = (
+            gtfs_realtime_pb2.TripDescriptor.CANCELED
         )
+        entity.trip_update.stop_time_update.add().stop_id = "STOP1"
 
-        trip_info = TripUpdateInfo(
-            trip_id="TRIP1",
-            route_id="ROUTE1",
-            stop_updates={
-                "STOP1": StopUpdate("STOP1", 1, departure_delay_seconds=3600),  # 60 min
-                "STOP2": StopUpdate("STOP2", 2, arrival_delay_seconds=3600)
-            }
-        )
+        # Entities without a trip update are skipped
+        feed.entity.add().id = "alert1"
 
-        integrator = RealtimeIntegrator(fetcher=Mock())
-        integrator._apply_delays_to_leg(leg, trip_info)
+        integrator = RealtimeIntegrator()
+        result = integrator._parse_trip_updates(feed)
 
-        assert leg.actual_departure_time == "15:00:00"  # 14:00 + 60 min
-        assert leg.actual_arrival_time == "15:30:00"  # 14:30 + 60 min
+        assert list(result) == ["TRIP1"]
+        assert result["TRIP1"].route_id == ""
+        assert result["TRIP1"].is_cancelled
+        assert result["TRIP1"].stop_updates["STOP1"] == StopUpdate("STOP1", 0)
 
-    def test_partial_realtime_data(self):
-        """Test leg with realtime data for only one stop."""
-        leg = Leg(
-            from_stop_id="STOP1",
-            from_stop_name="Stop 1",
-            to_stop_id="STOP2",
-            to_stop_name="Stop 2",
-            departure_time="14:00:00",
-            arrival_time="14:30:00",
-            trip_id="TRIP1",
-            route_id="ROUTE1"
-        )
+    def test_parse_skips_vehicle_and_alert_entities(self):
+        """Test that interleaved vehicle and alert entities are ignored."""
+        feed = gtfs_realtime_pb2.FeedMessage()
 
-        trip_info = TripUpdateInfo(
-            trip_id="TRIP1",
-            route_id="ROUTE1",
-            stop_updates={
-                "STOP1": StopUpdate("STOP1", 1, departure_delay_seconds=300)
-                # No data for STOP2
-            }
-        )
+        vehicle = feed.entity.add()
+        vehicle.id = "vehicle1"
+        vehicle.vehicle.trip.trip_id = "TRIP1"
 
-        integrator = RealtimeIntegrator(fetcher=Mock())
-        integrator._apply_delays_to_leg(leg, trip_info)
+        trip = feed.entity.add()
+        trip.id = "trip2"
+        trip.trip_update.trip.trip_id = "TRIP2"
+
+        alert = feed.entity.add()
+        alert.id = "alert1"
+        alert.alert.informed_entity.add().trip.trip_id = "TRIP3"
+
+        integrator = RealtimeIntegrator()
+        result = integrator._parse_trip_updates(feed)
 
-        assert leg.actual_departure_time == "14:05:00"
-        assert leg.actual_arrival_time == "14:30:00"  # No delay, use scheduled
+        assert list(result) == ["TRIP2"]
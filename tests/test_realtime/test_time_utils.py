@@ -2,14 +2,18 @@
 Tests for realtime time utility functions.
 """
 
+import numpy as np
 import pytest
 from src.realtime.time_utils import (
     unix_to_hhmmss,
     hhmmss_to_seconds,
+    hhmmss_to_seconds_batch,
     seconds_to_hhmmss,
     add_delay_to_time,
     format_delay,
-    time_diff_seconds
+    time_diff_seconds,
+    _parse_records_loop,
+    _parse_records_numpy
 )
 
 
@@ -40,6 +44,42 @@ class TestHHMMSSToSeconds:
         with pytest.raises(ValueError):
             hhmmss_to_seconds("invalid")
 
+    def test_non_digit_fields_raise_error(self):
+        """Test that HH:MM:SS-shaped strings with non-digits are rejected."""
+        with pytest.raises(ValueError):
+            hhmmss_to_seconds("ab:cd:ef")
+
+        with pytest.raises(ValueError):
+            hhmmss_to_seconds("1a:00:00")
+
+    @pytest.mark.parametrize("bad", ["-1:00:00", " 8:00:00", "8:0_0:00", "8:00:", "٨:00:00"])
+    def test_unpadded_fields_must_be_ascii_digits(self, bad):
+        """Test that the general parser rejects what int() would let through."""
+        with pytest.raises(ValueError, match="Invalid time format"):
+            hhmmss_to_seconds(bad)
+
+    def test_past_midnight(self):
+        """Test GTFS times beyond 24:00:00."""
+        assert hhmmss_to_seconds("25:10:00") == 25 * 3600 + 10 * 60
+
+    def test_unpadded_hour(self):
+        """Test single-digit hours, which some feeds use."""
+        assert hhmmss_to_seconds("8:05:00") == 8 * 3600 + 5 * 60
+
+    def test_repeated_times_hit_cache(self):
+        """Test that repeated parses are served from the shared cache."""
+        hhmmss_to_seconds("17:42:13")
+        hits = hhmmss_to_seconds.cache_info().hits
+
+        assert hhmmss_to_seconds("17:42:13") == 17 * 3600 + 42 * 60 + 13
+        assert hhmmss_to_seconds.cache_info().hits == hits + 1
+
+    def test_invalid_times_are_not_cached(self):
+        """Test that errors are raised on every call, not memoized away."""
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                hhmmss_to_seconds("17:42")
+
 
 class TestSecondsToHHMMSS:
     """Test seconds to HH:MM:SS conversion."""
@@ -61,6 +101,13 @@ class TestSecondsToHHMMSS:
         # 25 hours = 1:00 AM next day
         assert seconds_to_hhmmss(25 * 3600) == "01:00:00"
 
+    def test_matches_format_spec_over_a_day(self):
+        """Test every minute boundary and negative values format correctly."""
+        for seconds in range(-3600, 2 * 24 * 3600, 59):
+            wrapped = seconds % (24 * 3600)
+            expected = f"{wrapped // 3600:02d}:{wrapped // 60 % 60:02d}:{wrapped % 60:02d}"
+            assert seconds_to_hhmmss(seconds) == expected
+
 
 class TestRoundTripConversion:
     """Test that conversions are reversible."""
@@ -147,6 +194,43 @@ class TestFormatDelay:
         assert format_delay(5400) == "90 min delay"
 
 
+class TestBatchParsing:
+    """Test vectorized HH:MM:SS parsing."""
+
+    def test_matches_scalar(self):
+        """Test batch parsing agrees with hhmmss_to_seconds."""
+        times = ["00:00:00", "08:05:09", "14:30:00", "23:59:59", "25:30:00", "8:05:00"]
+        result = hhmmss_to_seconds_batch(times)
+        assert result.tolist() == [hhmmss_to_seconds(t) for t in times]
+
+    def test_empty_batch(self):
+        """Test that empty input gives empty output."""
+        assert hhmmss_to_seconds_batch([]).tolist() == []
+
+    @pytest.mark.parametrize("bad", ["14:3a:00", "14-30-00", "1430", "14:30", "é1:00:00"])
+    def test_invalid_format_raises_error(self, bad):
+        """Test that any malformed time rejects the whole batch."""
+        with pytest.raises(ValueError):
+            hhmmss_to_seconds_batch(["08:00:00", bad])
+
+    def test_unpadded_times_fall_back_to_scalar_parser(self):
+        """Test that unpadded times mixed with padded ones parse correctly."""
+        assert hhmmss_to_seconds_batch(["08:00:00", "8:05:00", "25:00:00"]).tolist() == [
+            28800, 29100, 90000
+        ]
+
+    def test_compiled_loop_and_numpy_agree(self):
+        """Test that the numba record loop and the NumPy fallback agree."""
+        times = ["00:00:00", "08:05:09", "23:59:59", "24:15:30", "99:59:59",
+                 "ab:00:00", "12-00-00", "1:00:00 "]
+        buf = np.array(times, dtype='S8').view(np.uint8).reshape(-1, 8)
+        loop = _parse_records_loop(buf).tolist()
+
+        assert loop == _parse_records_numpy(buf).tolist()
+        assert loop[:5] == [hhmmss_to_seconds(t) for t in times[:5]]
+        assert loop[5:] == [-1, -1, -1]
+
+
 class TestTimeDiffSeconds:
     """Test time difference calculation."""
 
@@ -191,6 +275,17 @@ class TestUnixToHHMMSS:
         # Should not raise error
         hhmmss_to_seconds(result)
 
+    def test_known_timestamps(self):
+        """Test exact results for known timestamps."""
+        assert unix_to_hhmmss(1705201234) == "14:00:34"
+        assert unix_to_hhmmss(1705201234, timezone_offset=10) == "13:00:34"
+        assert unix_to_hhmmss(0) == "11:00:00"
+
+    def test_wraps_past_midnight(self):
+        """Test that the offset wraps into the next day."""
+        # 23:30 UTC + 11h = 10:30 local
+        assert unix_to_hhmmss(23 * 3600 + 30 * 60) == "10:30:00"
+
 
 class TestEdgeCases:
     """Test edge cases and error handling."""
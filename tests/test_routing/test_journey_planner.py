@@ -1,11 +1,17 @@
 """Tests for JourneyPlanner class."""
 
+import random
+
 import pytest
 from pathlib import Path
 
-from src.routing.journey_planner import JourneyPlanner
+import numpy as np
+
+from src.routing.journey_planner import (
+    JourneyPlanner, _scan_connections, _scan_from_stops, _scan_by_transfers
+)
 from src.data.gtfs_parser import GTFSParser
-from src.graph.transit_graph import TransitGraph
+from src.graph.transit_graph import TransitGraph, Connection
 
 
 @pytest.fixture
@@ -245,6 +251,132 @@ class TestFindMultipleJourneys:
         assert journeys == []
 
 
+class TestMultiCriteriaJourneys:
+    """Tests for find_multiple_journeys' arrival/transfer trade-offs."""
+
+    @pytest.fixture
+    def tradeoff_planner(self, planner):
+        """Planner with a slow direct trip and a faster one-transfer option."""
+        def conn(frm, to, trip, dep, arr):
+            return Connection(frm, to, trip, dep, arr, 0, "R1")
+
+        planner.graph.connections = [
+            conn("1001", "1003", "DIRECT", "08:00:00", "09:00:00"),
+            conn("1001", "1002", "FAST1", "08:00:00", "08:10:00"),
+            conn("1002", "1003", "FAST2", "08:15:00", "08:30:00"),
+        ]
+        return planner
+
+    def test_returns_pareto_options(self, tradeoff_planner):
+        """Test that both the fastest and the fewest-transfer journeys are found."""
+        journeys = tradeoff_planner.find_multiple_journeys("1001", "1003", "07:30:00")
+
+        assert [(j.arrival_time, j.num_transfers) for j in journeys] == [
+            ("08:30:00", 1),
+            ("09:00:00", 0),
+        ]
+        assert [leg.trip_id for leg in journeys[0].legs] == ["FAST1", "FAST2"]
+
+    def test_keeps_direct_trip_departing_after_faster_arrival(self, planner):
+        """Test that a later direct trip is still found once a transfer journey arrived."""
+        planner.graph.connections = [
+            Connection("1001", "1002", "FAST1", "08:00:00", "08:10:00", 0, "R1"),
+            Connection("1002", "1003", "FAST2", "08:15:00", "08:30:00", 0, "R1"),
+            Connection("1001", "1003", "DIRECT", "08:40:00", "09:00:00", 0, "R1"),
+        ]
+
+        journeys = planner.find_multiple_journeys("1001", "1003", "07:30:00")
+
+        assert [(j.arrival_time, j.num_transfers) for j in journeys] == [
+            ("08:30:00", 1),
+            ("09:00:00", 0),
+        ]
+
+    def test_respects_max_transfers(self, tradeoff_planner):
+        """Test that options with too many transfers are dropped."""
+        journeys = tradeoff_planner.find_multiple_journeys(
+            "1001", "1003", "07:30:00", max_transfers=0
+        )
+
+        assert [j.num_transfers for j in journeys] == [0]
+
+    def test_respects_max_results(self, tradeoff_planner):
+        """Test that results are truncated to the earliest arrivals."""
+        journeys = tradeoff_planner.find_multiple_journeys(
+            "1001", "1003", "07:30:00", max_results=1
+        )
+
+        assert len(journeys) == 1
+        assert journeys[0].arrival_time == "08:30:00"
+
+    def test_matches_round_based_search(self):
+        """Test per-leg-count arrivals against a simple round-by-round search."""
+        n_stops, n_trips, max_legs = 8, 10, 3
+        for seed in range(20):
+            rng = random.Random(seed)
+            rows = []
+            for trip in range(n_trips):
+                stops = rng.sample(range(n_stops), rng.randint(2, 5))
+                time = rng.randrange(0, 3600, 60)
+                for frm, to in zip(stops, stops[1:]):
+                    arrival = time + rng.randrange(60, 600, 60)
+                    rows.append((time, arrival, frm, to, trip))
+                    time = arrival + rng.choice([0, 60])
+            rows.sort(key=lambda r: r[0])
+            dep, arr, frm, to, trip = [list(c) for c in zip(*rows)]
+            origin = seed % n_stops
+
+            earliest, _, _, _ = _scan_by_transfers(
+                dep, arr, frm, to, trip, n_stops, n_trips, origin, 0, max_legs, 0, -1
+            )
+
+            # Round k may ride any single trip boarded from a round k-1 arrival
+            expected = [2**31 - 1] * n_stops
+            expected[origin] = 0
+            for k in range(1, max_legs + 1):
+                previous = list(expected)
+                for t in range(n_trips):
+                    boarded = False
+                    for d, a, f, s, tr in rows:
+                        if tr != t:
+                            continue
+                        boarded = boarded or previous[f] <= d
+                        if boarded:
+                            expected[s] = min(expected[s], a)
+                assert earliest[k] == expected
+
+class TestFindJourneysFrom:
+    """Tests for find_journeys_from method."""
+
+    def test_matches_find_journey(self, planner):
+        """Test that each destination gets the same journey as a single query."""
+        journeys = planner.find_journeys_from("1001", "07:30:00")
+
+        assert "1002" in journeys
+        for stop_id, journey in journeys.items():
+            assert journey == planner.find_journey("1001", stop_id, "07:30:00")
+
+    def test_excludes_origin(self, planner):
+        """Test that the origin is not a destination of its own results."""
+        assert "1001" not in planner.find_journeys_from("1001", "07:30:00")
+
+    def test_selected_destinations(self, planner):
+        """Test that only the requested destinations are returned."""
+        journeys = planner.find_journeys_from("1001", "07:30:00", ["1002", "1001"])
+        assert list(journeys) == ["1002"]
+
+    def test_after_last_departure(self, planner):
+        """Test that nothing is reachable after the last departure."""
+        assert planner.find_journeys_from("1001", "23:59:00") == {}
+
+    def test_invalid_stops(self, planner):
+        """Test that unknown origins and destinations raise ValueError."""
+        with pytest.raises(ValueError, match="Origin stop"):
+            planner.find_journeys_from("9999", "08:00:00")
+        with pytest.raises(ValueError, match="Destination stop"):
+            planner.find_journeys_from("1001", "08:00:00", ["9999"])
+
+
 class TestConnectionScan:
     """Tests for Connection Scan Algorithm implementation."""
 
@@ -290,6 +422,29 @@ class TestConnectionScan:
         # Just verify it doesn't crash
         assert journey is None or isinstance(journey.legs, list)
 
+    @pytest.mark.parametrize("use_stop_search", [True, False])
+    def test_csa_finds_slower_journey_within_max_transfers(self, planner, mocker,
+                                                           use_stop_search):
+        """Test that a slower route within the cap beats a faster one over it."""
+        mocker.patch.object(planner, '_use_stop_search', return_value=use_stop_search)
+        planner.graph.connections = [
+            Connection("1001", "1002", "FAST1", "08:00:00", "08:10:00", 0, "R1"),
+            Connection("1001", "1002", "DIRECT", "08:05:00", "08:15:00", 0, "R1"),
+            Connection("1002", "1003", "FAST2", "08:12:00", "08:20:00", 0, "R1"),
+            Connection("1002", "1003", "DIRECT", "08:20:00", "08:30:00", 0, "R1"),
+        ]
+
+        fastest = planner.find_journey("1001", "1003", "07:30:00")
+        direct = planner.find_journey("1001", "1003", "07:30:00", max_transfers=0)
+        from_origin = planner.find_journeys_from("1001", "07:30:00", max_transfers=0)
+
+        assert fastest.arrival_time == "08:20:00"
+        assert fastest.num_transfers == 1
+        assert direct is not None
+        assert direct.arrival_time == "08:30:00"
+        assert [leg.trip_id for leg in direct.legs] == ["DIRECT"]
+        assert from_origin["1003"] == direct
+
 
 class TestCreateLeg:
     """Tests for _create_leg method."""
@@ -315,7 +470,7 @@ class TestCreateLeg:
         """Test creating a leg from multiple consecutive connections."""
         # Get connections for trip T1
         connections = [c for c in graph.connections if c.trip_id == "T1"]
-        connections.sort(key=lambda c: planner._time_to_seconds(c.departure_time))
+        connections.sort(key=lambda c: c.departure_sec)
 
         if len(connections) >= 2:
             # Use first two connections
@@ -326,3 +481,320 @@ class TestCreateLeg:
             assert leg.departure_time == connections[0].departure_time
             assert leg.arrival_time == connections[1].arrival_time
             assert leg.num_stops == 3  # Three stops total
+
+
+class TestJourneyCache:
+    """Tests for caching of journey results."""
+
+    def test_repeated_query_skips_scan(self, planner, mocker):
+        """Test that an identical query is answered from the cache."""
+        scan = mocker.spy(planner, '_connection_scan')
+
+        first = planner.find_journey("1001", "1003", "07:30:00")
+        second = planner.find_journey("1001", "1003", "07:30:00")
+
+        assert scan.call_count == 1
+        assert first == second
+
+    def test_cached_journey_is_a_copy(self, planner):
+        """Test that mutating a returned journey doesn't affect the cache."""
+        first = planner.find_journey("1001", "1003", "07:30:00")
+        first.legs[0].departure_delay_seconds = 300
+        first.has_realtime_data = True
+
+        second = planner.find_journey("1001", "1003", "07:30:00")
+
+        assert second is not first
+        assert second.legs[0].departure_delay_seconds == 0
+        assert not second.has_realtime_data
+
+    def test_cache_holds_connection_paths(self, planner, mocker):
+        """Test that the cache keeps the path, not a Journey that needs copying."""
+        build = mocker.spy(planner, '_build_journey')
+
+        first = planner.find_journey("1001", "1003", "07:30:00")
+        second = planner.find_journey("1001", "1003", "07:30:00")
+
+        (path,) = planner._journey_cache.values()
+        assert isinstance(path, tuple)
+        assert all(conn in planner.graph.connections for conn in path)
+        assert build.call_count == 2
+        assert second.legs[0] is not first.legs[0]
+
+    def test_no_route_is_cached(self, planner, mocker):
+        """Test that a query without a result is also cached."""
+        scan = mocker.spy(planner, '_connection_scan')
+
+        assert planner.find_journey("1001", "1002", "10:00:00") is None
+        assert planner.find_journey("1001", "1002", "10:00:00") is None
+        assert scan.call_count == 1
+
+    def test_invalidate_cache(self, planner, mocker):
+        """Test that invalidate_cache forces a new scan."""
+        scan = mocker.spy(planner, '_connection_scan')
+
+        planner.find_journey("1001", "1003", "07:30:00")
+        planner.invalidate_cache()
+        planner.find_journey("1001", "1003", "07:30:00")
+
+        assert scan.call_count == 2
+
+
+class TestConnectionTimes:
+    """Tests for precomputed connection time arrays."""
+
+    def test_connection_times_match_strings(self, planner):
+        """Test that cached seconds match the connection time strings."""
+        connections = planner._get_sorted_connections()
+        assert len(connections) == len(planner.graph.connections)
+        for conn, dep, arr in zip(connections, planner._conn_dep, planner._conn_arr):
+            assert dep == planner._time_to_seconds(conn.departure_time)
+            assert arr == planner._time_to_seconds(conn.arrival_time)
+
+    def test_connections_sorted_by_departure(self, planner):
+        """Test that cached connections are in departure order."""
+        planner._get_sorted_connections()
+        assert list(planner._conn_dep) == sorted(planner._conn_dep)
+
+    def test_sorted_connections_cached(self, planner):
+        """Test that the sorted list is reused across calls."""
+        first = planner._get_sorted_connections()
+        assert planner._get_sorted_connections() is first
+
+    def test_sorted_connections_rebuilt_when_graph_changes(self, planner):
+        """Test that replacing graph connections invalidates the cache."""
+        first = planner._get_sorted_connections()
+        planner.graph.connections = list(planner.graph.connections[:1])
+        second = planner._get_sorted_connections()
+        assert second is not first
+        assert len(second) == 1
+
+    def test_connection_stop_indices(self, planner):
+        """Test that int columns map back to the connection stops and trips."""
+        connections = planner._get_sorted_connections()
+        for i, conn in enumerate(connections):
+            assert planner._stop_ids[planner._conn_from[i]] == conn.from_stop_id
+            assert planner._stop_ids[planner._conn_to[i]] == conn.to_stop_id
+            assert planner._trip_ids[planner._conn_trip[i]] == conn.trip_id
+
+
+class TestScanBuffers:
+    """Tests for reuse of per-stop scan arrays."""
+
+    def test_buffers_reused_and_reset(self, planner):
+        """Test that buffers are reused and reset between queries."""
+        earliest, in_trip, enter_idx, transfers = planner._scan_buffers(5)
+        earliest[0] = 100
+        enter_idx[1] = 7
+        transfers[2] = 3
+
+        again = planner._scan_buffers(5)
+
+        assert again[0] is earliest
+        assert earliest.tolist() == [2**31 - 1] * 5
+        assert in_trip.tolist() == [-1] * 5
+        assert enter_idx.tolist() == [-1] * 5
+        assert transfers.tolist() == [0] * 5
+
+    def test_buffers_resized(self, planner):
+        """Test that a different stop count gets new buffers."""
+        first = planner._scan_buffers(5)
+        second = planner._scan_buffers(8)
+
+        assert second[0] is not first[0]
+        assert len(second[0]) == 8
+
+class TestScanConnections:
+    """Tests for the array-based CSA loop."""
+
+    # Stops 0 -> 1 -> 2 on trip 0, then 2 -> 0 on trip 1
+    COLUMNS = ([100, 200, 300], [150, 250, 350], [0, 1, 2], [1, 2, 0], [0, 0, 1])
+
+    def test_scan_with_lists(self):
+        """Test scanning plain Python lists."""
+        earliest = [2**31 - 1] * 3
+        in_trip = [-1] * 3
+        enter_idx = [-1] * 3
+        earliest[0] = 100
+
+        _scan_connections(*self.COLUMNS, earliest, in_trip, enter_idx, [0] * 3, 3, 0, -1)
+
+        assert earliest == [100, 150, 250]
+        assert enter_idx == [-1, 0, 1]
+        assert in_trip == [-1, 0, 0]
+
+    def test_scan_with_numpy_arrays(self):
+        """Test that NumPy arrays give the same result as lists."""
+        columns = [np.array(c, dtype=np.int32) for c in self.COLUMNS]
+        earliest = np.full(3, 2**31 - 1, dtype=np.int32)
+        in_trip = np.full(3, -1, dtype=np.int32)
+        enter_idx = np.full(3, -1, dtype=np.int32)
+        earliest[0] = 100
+
+        _scan_connections(*columns, earliest, in_trip, enter_idx,
+                          np.zeros(3, dtype=np.int32), 3, 0, -1)
+
+        assert earliest.tolist() == [100, 150, 250]
+        assert enter_idx.tolist() == [-1, 0, 1]
+
+    def test_scan_stops_after_target_reached(self):
+        """Test that the scan stops once the target can't be improved."""
+        earliest = [2**31 - 1] * 3
+        in_trip = [-1] * 3
+        enter_idx = [-1] * 3
+        earliest[0] = 100
+
+        _scan_connections(*self.COLUMNS, earliest, in_trip, enter_idx, [0] * 3, 3, 0, 1)
+
+        # Reaching stop 1 at 150 ends the scan before the 200 departure
+        assert earliest == [100, 150, 2**31 - 1]
+        assert enter_idx == [-1, 0, -1]
+
+    def test_scan_from_start_index(self):
+        """Test that connections before the start index are ignored."""
+        earliest = [2**31 - 1] * 3
+        in_trip = [-1] * 3
+        enter_idx = [-1] * 3
+        earliest[1] = 200
+
+        _scan_connections(*self.COLUMNS, earliest, in_trip, enter_idx, [0] * 3, 3, 1, -1)
+
+        assert earliest == [350, 200, 250]
+        assert enter_idx == [2, -1, 1]
+
+    # Stops 0 -> 1 on trip 0, then 1 -> 2 on trip 1 (one transfer)
+    TRANSFER_COLUMNS = ([100, 200], [150, 250], [0, 1], [1, 2], [0, 1])
+
+    def test_scan_counts_transfers(self):
+        """Test that changing trips is counted as a transfer."""
+        earliest = [2**31 - 1, 2**31 - 1, 2**31 - 1]
+        transfers = [0] * 3
+        earliest[0] = 100
+
+        _scan_connections(*self.TRANSFER_COLUMNS, earliest, [-1] * 3, [-1] * 3,
+                          transfers, 3, 0, -1)
+
+        assert earliest == [100, 150, 250]
+        assert transfers == [0, 0, 1]
+
+    def test_scan_enforces_max_transfers(self):
+        """Test that connections beyond max_transfers are not taken."""
+        earliest = [2**31 - 1] * 3
+        earliest[0] = 100
+
+        _scan_connections(*self.TRANSFER_COLUMNS, earliest, [-1] * 3, [-1] * 3,
+                          [0] * 3, 0, 0, -1)
+
+        assert earliest == [100, 150, 2**31 - 1]
+
+
+class TestScanFromStops:
+    """Tests for the per-stop outgoing-connection search."""
+
+    @staticmethod
+    def _random_timetable(seed, n_stops=12, n_conns=150):
+        """Build random departure-sorted connection columns."""
+        rng = random.Random(seed)
+        rows = []
+        for _ in range(n_conns):
+            frm, to = rng.sample(range(n_stops), 2)
+            dep = rng.randrange(0, 3600, 30)
+            rows.append((dep, dep + rng.randrange(60, 900, 30), frm, to, rng.randrange(20)))
+        rows.sort(key=lambda r: r[0])
+        return [list(col) for col in zip(*rows)]
+
+    @staticmethod
+    def _out_index(dep, frm, n_stops):
+        """Group connection indices by from-stop, keeping departure order."""
+        out_conns = [[] for _ in range(n_stops)]
+        out_deps = [[] for _ in range(n_stops)]
+        for i, f in enumerate(frm):
+            out_conns[f].append(i)
+            out_deps[f].append(dep[i])
+        return out_conns, out_deps
+
+    def test_matches_full_scan(self):
+        """Test that earliest arrivals equal those of the full CSA scan."""
+        n_stops = 12
+        for seed in range(20):
+            dep, arr, frm, to, trip = self._random_timetable(seed, n_stops)
+            out_conns, out_deps = self._out_index(dep, frm, n_stops)
+            origin = seed % n_stops
+
+            expected = [2**31 - 1] * n_stops
+            expected[origin] = 600
+            _scan_connections(dep, arr, frm, to, trip, expected, [-1] * n_stops,
+                              [-1] * n_stops, [0] * n_stops, 99, 0, -1)
+
+            earliest = [2**31 - 1] * n_stops
+            earliest[origin] = 600
+            enter_idx = [-1] * n_stops
+            _scan_from_stops(out_conns, out_deps, arr, to, trip, earliest, [-1] * n_stops,
+                             enter_idx, [0] * n_stops, 99, origin, -1)
+
+            assert earliest == expected
+            for stop, i in enumerate(enter_idx):
+                if i >= 0:
+                    assert to[i] == stop and arr[i] == earliest[stop]
+
+    def test_planner_methods_agree(self, planner, mocker):
+        """Test that the planner finds the same journeys with either search."""
+        queries = [(o, d, t) for o in ("1001", "1002", "1003")
+                   for d in ("1001", "1002", "1003") if o != d
+                   for t in ("07:00:00", "08:05:00", "08:30:00", "09:05:00")]
+
+        def run(use_stop_search):
+            mocker.patch.object(planner, '_use_stop_search', return_value=use_stop_search)
+            planner.invalidate_cache()
+            results = []
+            for query in queries:
+                journey = planner.find_journey(*query)
+                results.append(journey and (journey.departure_time, journey.arrival_time))
+            return results
+
+        assert run(True) == run(False)
+
+    def test_enforces_max_transfers(self):
+        """Test that the per-stop search also respects max_transfers."""
+        dep, arr, frm, to, trip = [100, 200], [150, 250], [0, 1], [1, 2], [0, 1]
+        out_conns, out_deps = self._out_index(dep, frm, 3)
+
+        for max_transfers, expected in ((0, 2**31 - 1), (1, 250)):
+            earliest = [2**31 - 1] * 3
+            earliest[0] = 100
+            _scan_from_stops(out_conns, out_deps, arr, to, trip, earliest, [-1] * 3,
+                             [-1] * 3, [0] * 3, max_transfers, 0, -1)
+            assert earliest[2] == expected
+
+
+class TestCreateLegBounds:
+    """Tests for _create_leg with index bounds."""
+
+    def test_create_leg_from_index_range(self, planner, graph):
+        """Test that a sub-range of a path becomes a leg without slicing."""
+        connections = [c for c in graph.connections if c.trip_id == "T1"]
+        connections.sort(key=lambda c: c.departure_sec)
+
+        leg = planner._create_leg(connections, 1, 1)
+
+        assert leg.from_stop_id == connections[1].from_stop_id
+        assert leg.to_stop_id == connections[1].to_stop_id
+        assert leg.num_stops == 2
+
+    def test_create_leg_unknown_stop_uses_id(self, planner):
+        """Test that stops missing from the parser fall back to their IDs."""
+        conn = Connection(
+            from_stop_id="1001",
+            to_stop_id="X99",
+            trip_id="T9",
+            departure_time="08:00:00",
+            arrival_time="08:05:00",
+            travel_time_seconds=300,
+            route_id="NO_SUCH_ROUTE"
+        )
+
+        leg = planner._create_leg([conn])
+
+        assert leg.from_stop_name == "Test Station A"
+        assert leg.to_stop_name == "X99"
+        assert leg.route_name is None
@@ -1,7 +1,11 @@
 """Tests for routing data models."""
 
+import numpy as np
 import pytest
-from src.routing.models import Leg, Journey
+from src.routing.models import (
+    Leg, Journey, _format_minutes,
+    EmptyJourneyError, DiscontinuousJourneyError
+)
 
 
 class TestLeg:
@@ -102,6 +106,40 @@ class TestLeg:
 
         assert leg.format_duration() == "2h"
 
+    def test_leg_times_in_seconds(self):
+        """Test that scheduled times are exposed as seconds past midnight."""
+        leg = Leg(
+            from_stop_id="1001",
+            from_stop_name="Stop A",
+            to_stop_id="1002",
+            to_stop_name="Stop B",
+            departure_time="23:55:00",
+            arrival_time="24:10:30",
+            trip_id="T1",
+            route_id="R1"
+        )
+
+        assert leg.departure_sec == 23 * 3600 + 55 * 60
+        assert leg.arrival_sec == 24 * 3600 + 10 * 60 + 30
+
+    def test_leg_format_duration_is_memoized(self):
+        """Test that formatting a repeated duration is served from the cache."""
+        leg = Leg(
+            from_stop_id="1001",
+            from_stop_name="Stop A",
+            to_stop_id="1002",
+            to_stop_name="Stop B",
+            departure_time="08:00:00",
+            arrival_time="08:37:00",
+            trip_id="T1",
+            route_id="R1"
+        )
+
+        leg.format_duration()
+        hits = _format_minutes.cache_info().hits
+        assert leg.format_duration() == "37m"
+        assert _format_minutes.cache_info().hits == hits + 1
+
     def test_leg_num_stops_conversion(self):
         """Test that num_stops is converted to int."""
         leg = Leg(
@@ -119,6 +157,71 @@ class TestLeg:
         assert isinstance(leg.num_stops, int)
         assert leg.num_stops == 5
 
+    def test_leg_route_type_conversion(self):
+        """Test that non-int route_type values are converted to plain int."""
+        leg = Leg(
+            from_stop_id="1001",
+            from_stop_name="Stop A",
+            to_stop_id="1002",
+            to_stop_name="Stop B",
+            departure_time="08:00:00",
+            arrival_time="08:10:00",
+            trip_id="T1",
+            route_id="R1",
+            route_type=np.int64(3),
+            num_stops=np.int32(2)
+        )
+
+        assert type(leg.route_type) is int
+        assert type(leg.num_stops) is int
+        assert leg.get_mode_name() == "Bus"
+
+    def test_leg_has_no_instance_dict(self):
+        """Test that Leg uses slots rather than a per-instance __dict__."""
+        leg = Leg(
+            from_stop_id="1001",
+            from_stop_name="Stop A",
+            to_stop_id="1002",
+            to_stop_name="Stop B",
+            departure_time="08:00:00",
+            arrival_time="08:10:00",
+            trip_id="T1",
+            route_id="R1"
+        )
+
+        assert not hasattr(leg, "__dict__")
+        with pytest.raises(AttributeError):
+            leg.unknown_field = 1
+
+    def test_leg_duration_past_midnight(self):
+        """Test duration of a leg crossing GTFS midnight (24:00+)."""
+        leg = Leg(
+            from_stop_id="1001",
+            from_stop_name="Stop A",
+            to_stop_id="1002",
+            to_stop_name="Stop B",
+            departure_time="23:50:00",
+            arrival_time="24:20:00",
+            trip_id="T1",
+            route_id="R1"
+        )
+
+        assert leg.duration_seconds == 1800
+
+    def test_leg_invalid_time_raises_error(self):
+        """Test that malformed times are rejected at construction."""
+        with pytest.raises(ValueError):
+            Leg(
+                from_stop_id="1001",
+                from_stop_name="Stop A",
+                to_stop_id="1002",
+                to_stop_name="Stop B",
+                departure_time="08:00",
+                arrival_time="08:10:00",
+                trip_id="T1",
+                route_id="R1"
+            )
+
 
 class TestJourney:
     """Tests for Journey dataclass."""
@@ -190,7 +293,7 @@ class TestJourney:
 
     def test_journey_empty_legs_raises_error(self):
         """Test that journey with no legs raises error."""
-        with pytest.raises(ValueError, match="must have at least one leg"):
+        with pytest.raises(EmptyJourneyError, match="must have at least one leg"):
             Journey(
                 origin_stop_id="1001",
                 origin_stop_name="Stop A",
@@ -201,6 +304,39 @@ class TestJourney:
                 legs=[]
             )
 
+    def test_journey_errors_are_value_errors(self):
+        """Test that callers catching ValueError still catch journey errors."""
+        assert issubclass(EmptyJourneyError, ValueError)
+        assert issubclass(DiscontinuousJourneyError, ValueError)
+
+    def test_journey_is_slotted_and_mutable(self):
+        """Test that Journey has no __dict__ but realtime fields stay writable."""
+        leg = Leg(
+            from_stop_id="1001",
+            from_stop_name="Stop A",
+            to_stop_id="1002",
+            to_stop_name="Stop B",
+            departure_time="08:00:00",
+            arrival_time="08:10:00",
+            trip_id="T1",
+            route_id="R1"
+        )
+
+        journey = Journey(
+            origin_stop_id="1001",
+            origin_stop_name="Stop A",
+            destination_stop_id="1002",
+            destination_stop_name="Stop B",
+            departure_time="08:00:00",
+            arrival_time="08:10:00",
+            legs=[leg]
+        )
+
+        assert not hasattr(journey, "__dict__")
+        leg.departure_delay_seconds = 120
+        journey.total_delay_seconds = 120
+        assert journey.total_delay_seconds == 120
+
     def test_journey_discontinuous_legs_raises_error(self):
         """Test that discontinuous legs raise error."""
         leg1 = Leg(
@@ -226,7 +362,7 @@ class TestJourney:
             route_id="R2"
         )
 
-        with pytest.raises(ValueError, match="Discontinuous journey"):
+        with pytest.raises(DiscontinuousJourneyError, match="Discontinuous journey"):
             Journey(
                 origin_stop_id="1001",
                 origin_stop_name="Stop A",
@@ -407,3 +543,105 @@ class TestJourney:
         assert "08:10:00" in summary
         assert "Transfers: 0" in summary
         assert "Test Route" in summary
+
+    def test_journey_format_summary_zero_second_transfer(self):
+        """Test that an immediate connection still shows its transfer wait."""
+        legs = [
+            Leg(
+                from_stop_id=from_stop,
+                from_stop_name=f"Stop {from_stop}",
+                to_stop_id=to_stop,
+                to_stop_name=f"Stop {to_stop}",
+                departure_time=departure,
+                arrival_time=arrival,
+                trip_id=trip_id,
+                route_id="R1"
+            )
+            for from_stop, to_stop, departure, arrival, trip_id in [
+                ("1001", "1002", "08:00:00", "08:10:00", "T1"),
+                ("1002", "1003", "08:10:00", "08:20:00", "T2"),
+            ]
+        ]
+        journey = Journey(
+            origin_stop_id="1001",
+            origin_stop_name="Stop 1001",
+            destination_stop_id="1003",
+            destination_stop_name="Stop 1003",
+            departure_time="08:00:00",
+            arrival_time="08:20:00",
+            legs=legs
+        )
+
+        for summary in (journey.format_summary(), journey._format_summary(realtime=True)):
+            assert summary.count("Transfer wait:") == 1
+            assert "  Transfer wait: 0m" in summary
+
+
+class TestJourneyDelays:
+    """Tests for Journey delay helpers."""
+
+    @staticmethod
+    def _journey():
+        leg = Leg(
+            from_stop_id="1001",
+            from_stop_name="Stop A",
+            to_stop_id="1002",
+            to_stop_name="Stop B",
+            departure_time="08:00:00",
+            arrival_time="08:10:00",
+            trip_id="T1",
+            route_id="R1"
+        )
+        return Journey(
+            origin_stop_id="1001",
+            origin_stop_name="Stop A",
+            destination_stop_id="1002",
+            destination_stop_name="Stop B",
+            departure_time="08:00:00",
+            arrival_time="08:10:00",
+            legs=[leg],
+            has_realtime_data=True
+        )
+
+    def test_delay_summary(self):
+        """Test delay summary wording for late, early and on-time journeys."""
+        journey = self._journey()
+        assert journey.get_delay_summary() == "On time"
+
+        journey.total_delay_seconds = 330
+        assert journey.delay_minutes == 5
+        assert journey.get_delay_summary() == "5 min delay"
+
+        journey.total_delay_seconds = -120
+        assert journey.delay_minutes == 2
+        assert journey.get_delay_summary() == "2 min early"
+
+    def test_has_significant_delays_follows_updates(self):
+        """Test that the threshold check sees later delay updates."""
+        journey = self._journey()
+        journey.total_delay_seconds = 240
+        assert journey.has_significant_delays() is False
+
+        journey.total_delay_seconds = -360
+        assert journey.has_significant_delays() is True
+        assert journey.has_significant_delays(threshold_minutes=10) is False
+
+    def test_format_summary_scheduled_and_realtime(self):
+        """Test that summaries only show realtime details when present."""
+        journey = self._journey()
+        journey.has_realtime_data = False
+        scheduled = journey.format_summary()
+        assert "Status:" not in scheduled
+        assert "  Depart: 08:00:00  Arrive: 08:10:00" in scheduled
+        assert journey._format_summary(realtime=True) == scheduled
+
+        # Realtime data on a leg is shown even if the journey flag is unset
+        leg = journey.legs[0]
+        leg.has_realtime_data = True
+        leg.departure_delay_seconds = 180
+        leg.actual_departure_time = "08:03:00"
+        leg.actual_arrival_time = "08:13:00"
+        summary = journey.format_summary()
+        assert "Depart: 08:00:00 → 08:03:00  Arrive: 08:10:00 → 08:13:00" in summary
+        assert "3 min delay" in summary
+        assert "Status:" not in summary
@@ -328,6 +328,66 @@ class TestJourneyMultiModal:
 
         assert journey.is_multi_modal() is True
 
+    def test_journey_get_modes_used_returns_fresh_list(self):
+        """Test that mutating a returned modes list does not affect later calls."""
+        leg = Leg(
+            from_stop_id="1001",
+            from_stop_name="Stop A",
+            to_stop_id="1002",
+            to_stop_name="Stop B",
+            departure_time="08:00:00",
+            arrival_time="08:10:00",
+            trip_id="T1",
+            route_id="R1",
+            route_type=3
+        )
+
+        journey = Journey(
+            origin_stop_id="1001",
+            origin_stop_name="Stop A",
+            destination_stop_id="1002",
+            destination_stop_name="Stop B",
+            departure_time="08:00:00",
+            arrival_time="08:10:00",
+            legs=[leg]
+        )
+
+        modes = journey.get_modes_used()
+        modes.append("Ferry")
+
+        assert journey.get_modes_used() == ["Bus"]
+        assert journey.is_multi_modal() is False
+
+    def test_journey_get_modes_used_keeps_first_seen_order(self):
+        """Test that repeated modes are listed once, in order of first use."""
+        stops = ["1001", "1002", "1003", "1004"]
+        legs = [
+            Leg(
+                from_stop_id=stops[i],
+                from_stop_name=f"Stop {i}",
+                to_stop_id=stops[i + 1],
+                to_stop_name=f"Stop {i + 1}",
+                departure_time=f"08:{i * 10:02d}:00",
+                arrival_time=f"08:{i * 10 + 5:02d}:00",
+                trip_id=f"T{i}",
+                route_id=f"R{i}",
+                route_type=route_type
+            )
+            for i, route_type in enumerate([0, 3, 900])
+        ]
+
+        journey = Journey(
+            origin_stop_id="1001",
+            origin_stop_name="Stop 0",
+            destination_stop_id="1004",
+            destination_stop_name="Stop 3",
+            departure_time="08:00:00",
+            arrival_time="08:25:00",
+            legs=legs
+        )
+
+        assert journey.get_modes_used() == ["Tram", "Bus"]
+
     def test_journey_format_summary_shows_mode(self):
         """Test that journey summary includes mode information."""
         leg = Leg(